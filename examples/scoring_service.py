@@ -0,0 +1,16 @@
+import asyncio
+from niaarmts import Dataset
+from niaarmts.service import RuleScorer, ScoringService
+
+# Load the dataset once; it stays in memory while the service runs
+dataset = Dataset()
+dataset.load_data_from_csv('datasets/september24.csv', timestamp_col='timestamp')
+
+service = ScoringService(RuleScorer(dataset.get_all_transactions()), port=8765)
+
+# Score rules with, e.g.:
+# curl -X POST localhost:8765/score -d '{"rules": [{"antecedent": [{"feature": "temperature", "type": "Numerical",
+#   "border1": 22.3, "border2": 24.8, "category": "EMPTY"}], "consequent": [], "start": "2024-09-18 13:18:07",
+#   "end": "2024-09-20 13:18:07", "delta": "48h"}]}'
+# curl localhost:8765/stats
+asyncio.run(service.serve_forever())
@@ -1,9 +1,25 @@
+import heapq
 import numpy as np
 import pandas as pd
 import json
 from niapy.problems import Problem
 from niaarmts.rule import build_rule
-from niaarmts.metrics import calculate_support, calculate_confidence, calculate_inclusion_metric, calculate_amplitude_metric, calculate_timestamp_metric, calculate_fitness
+from niaarmts.dataset import DatasetStatistics, WindowIndex
+from niaarmts.archive import RuleArchive
+from niaarmts.archive_index import ArchiveIndex
+from niaarmts.matcher import RuleMatcher
+from niaarmts.compaction import compact_archive
+from niaarmts.reweight import rank_archive, weight_matrix
+from niaarmts.bitmap import count_bits
+from niaarmts.mask_cache import ConditionMaskCache
+from niaarmts.window_stats import WindowStatsCache
+from niaarmts.kernels import RuleKernel
+from niaarmts.archive_io import write_rules_jsonl, write_rules_npz
+from niaarmts.metrics import calculate_inclusion_metric, calculate_timestamp_metric, calculate_fitness, calculate_conditions_mask, estimate_support_confidence, filter_window, _amplitude
+
+# Counters of a mining run, saved with the run state (see NiaARMTS.get_run_state)
+RUN_STATE_COUNTERS = ('evaluations', 'pruned_evaluations', 'approximate_evaluations', 'rescored_evaluations', 'coarse_evaluations',
+                      'promoted_evaluations', 'compacted_rules')
 
 class NiaARMTS(Problem):
     def __init__(
@@ -18,7 +34,29 @@ class NiaARMTS(Problem):
         beta,
         gamma,
         delta,
-        epsilon
+        epsilon,
+        pruning=False,
+        prune_threshold=0.0,
+        prune_top_k=None,
+        archive_backend='list',
+        interval_range=False,
+        window_index=None,
+        bitmap_index=None,
+        approximate=False,
+        sample_size=1000,
+        n_strata=10,
+        sample_seed=None,
+        fidelity_schedule=None,
+        fidelity_threshold=None,
+        kernel=None,
+        statistics=None,
+        antecedent_features=None,
+        consequent_features=None,
+        compact_every=None,
+        compaction=None,
+        mask_cache=None,
+        window_stats=None,
+        weight_profiles=None
     ):
         """
         Initialize instance of NiaARMTS.
@@ -35,12 +73,77 @@ class NiaARMTS(Problem):
             gamma (float): Weight for inclusion in fitness function.
             delta (float): Weight for amplitude in fitness function.
             epsilon (float): Weight for timestamp metric in fitness function.
+            pruning (bool): Skip the expensive metrics of rules whose fitness upper bound cannot beat the
+                pruning threshold. Pruned evaluations return a lower bound of the fitness (the skipped
+                metrics count as 0) and the rule is not archived.
+            prune_threshold (float): Fitness a rule has to beat to be evaluated completely.
+            prune_top_k (int): Raise the pruning threshold to the fitness of the K-th best archived rule
+                once the archive holds K rules (1 prunes against the best rule found so far).
+            archive_backend (str): 'list' stores archived rules as dictionaries, 'structured' stores them
+                in NumPy structured arrays (see :class:`niaarmts.archive.RuleArchive`).
+            interval_range (bool): Mine rules over ranges of intervals (two solution components) instead
+                of single intervals. The dimension must be computed with
+                `Dataset.calculate_problem_dimension(interval_range=True)`.
+            window_index (WindowIndex): Row offset index of the time column (see
+                :meth:`Dataset.get_window_index`). By default it is built from the transactions when
+                their time column is sorted; otherwise windows are selected by filtering.
+            bitmap_index (BitmapIndex): Bitmap index of the transactions (see :meth:`Dataset.get_bitmap_index`).
+                Support and confidence are then counted on packed bitsets of the window rows. Requires a
+                window index.
+            approximate (bool): Estimate support and confidence of windows with more than `sample_size`
+                rows from a stratified sample (see :func:`niaarmts.metrics.estimate_support_confidence`).
+                Requires pruning: rules that could enter the archive, i.e. with matching sampled rows and
+                an optimistic fitness (upper confidence bounds) above the pruning threshold, are re-scored
+                exactly, so archived metrics are always exact. The archive can still differ from exact
+                mode: a rule whose sample has no match or whose optimistic fitness does not beat the
+                threshold is not archived, although its exact fitness might. Sampling pays off with a
+                selective threshold (`prune_top_k` or a positive `prune_threshold`).
+            sample_size (int): Number of sampled rows per approximate evaluation.
+            n_strata (int): Number of strata (time slices of the window) of the sample.
+            sample_seed (int): Seed of the sampling random generator.
+            fidelity_schedule (list[tuple[int, int]]): Pairs (evaluations, stride). Once the problem has
+                been evaluated the given number of times, windows are evaluated on every stride-th row of
+                the transactions, e.g. `[(0, 16), (2000, 4), (10000, 1)]`. Rules are archived only from
+                full fidelity (stride 1) evaluations.
+            fidelity_threshold (float): Coarse evaluations reaching this fitness are repeated at full
+                fidelity, so promising rules are archived early in the run.
+            kernel (str or RuleKernel): Count support and confidence and compute amplitude with a fused
+                kernel (see :class:`niaarmts.kernels.RuleKernel`): 'numba', 'numpy', 'auto' or a kernel
+                built over the transactions. Requires a window index.
+            statistics (DatasetStatistics): Statistics snapshot of the transactions (see
+                :meth:`Dataset.get_statistics`). By default it is computed from the transactions once.
+            antecedent_features (list[str]): Optional whitelist of features allowed in antecedents; conditions
+                on other features are dropped from the antecedent (see :func:`niaarmts.reduction.reduce_features`).
+            consequent_features (list[str]): Optional whitelist of features allowed in consequents.
+            compact_every (int): Compact the archive (see :meth:`compact_archive`) after every this many
+                evaluations. By default the archive is only compacted on request.
+            compaction (dict): Keyword arguments of :meth:`compact_archive` for the periodic compaction.
+            mask_cache (ConditionMaskCache or bool): Cache of packed condition masks over all rows (see
+                :class:`niaarmts.mask_cache.ConditionMaskCache`); True creates one with the default size.
+                Support and confidence are then counted on slices of the cached masks. Requires a window index.
+            window_stats (WindowStatsCache or bool): Cache of per-window statistics (see
+                :class:`niaarmts.window_stats.WindowStatsCache`); True creates one with the default size.
+                Rule decoding and the amplitude metric then read the feature bounds and category
+                frequencies of a window from the cache. Requires a window index.
+            weight_profiles (dict): Weight profiles (see :func:`niaarmts.reweight.weight_matrix`) under which
+                the archive is ranked besides the mining weights alpha, ..., epsilon; see
+                :meth:`get_profile_rankings`. The raw metrics of a rule are computed once for all profiles:
+                a metric is computed if the mining weights or any profile weight it, and a rule is archived
+                if its fitness under the mining weights or under any profile is positive. The search itself
+                and the archive compaction still use the fitness under the mining weights.
 
         Raises:
             KeyError: Timestamp column is required when interval is set to false.
+            ValueError: Pruning is combined with weight profiles, or approximation is used without pruning.
         """
         if interval == 'false' and 'timestamp' not in transactions:
             raise KeyError('Timestamp column is required when interval is set to false.')
+        if pruning and weight_profiles:
+            # Pruned rules are bounded under the mining weights only and could rank high under another profile
+            raise ValueError('Pruning cannot be combined with weight profiles.')
+        if approximate and not pruning:
+            # Without a threshold every rule with sampled matches would be re-scored exactly
+            raise ValueError('Approximate evaluation requires pruning.')
 
         self.dim = dimension
         self.features = features
@@ -51,9 +154,83 @@ class NiaARMTS(Problem):
         self.gamma = gamma
         self.delta = delta
         self.epsilon = epsilon
+        self.pruning = pruning
+        self.prune_threshold = prune_threshold
+        self.prune_top_k = prune_top_k
+        self.interval_range = interval_range
+        self.antecedent_features = set(antecedent_features) if antecedent_features is not None else None
+        self.consequent_features = set(consequent_features) if consequent_features is not None else None
+        if compact_every is not None and compact_every < 1:
+            raise ValueError("Compaction period must be positive.")
+        self.compact_every = compact_every
+        self.compaction = dict(compaction or {})
+        self.compacted_rules = 0
+        self.weight_profiles = weight_profiles
+        # Weights of the profiles (rows) for admitting rules to the archive
+        self._profile_weights = weight_matrix(weight_profiles)[1] if weight_profiles else None
+        # Optional metrics are computed if the mining weights or any profile weight them
+        self._compute_inclusion = gamma > 0.0
+        self._compute_amplitude = delta > 0.0
+        if self._profile_weights is not None:
+            self._compute_inclusion = self._compute_inclusion or bool((self._profile_weights[:, 2] > 0).any())
+            self._compute_amplitude = self._compute_amplitude or bool((self._profile_weights[:, 3] > 0).any())
+        self.statistics = statistics if statistics is not None else DatasetStatistics.from_dataframe(transactions)
+        self.window_index = window_index if window_index is not None else WindowIndex.from_dataframe(transactions, interval == 'true')
+
+        if bitmap_index is not None and (self.window_index is None or bitmap_index.n_rows != len(transactions)):
+            raise ValueError('Bitmap index requires a window index and must be built over the same transactions.')
+        self.bitmap_index = bitmap_index
+
+        if mask_cache is True:
+            mask_cache = ConditionMaskCache(transactions)
+        if mask_cache is not None and mask_cache is not False and (self.window_index is None or mask_cache.n_rows != len(transactions)):
+            raise ValueError('Mask cache requires a window index and must be built over the same transactions.')
+        self.mask_cache = mask_cache or None
+        if window_stats is True and self.window_index is not None:
+            window_stats = WindowStatsCache(transactions, self.window_index)
+        if window_stats is not None and window_stats is not False and (self.window_index is None or window_stats.n_rows != len(transactions)):
+            raise ValueError('Window statistics require a window index and must be built over the same transactions.')
+        self.window_stats = window_stats or None
+
+        # Packed bitsets of the window rows are evaluated with the mask cache or the bitmap index
+        self._bit_matcher = self.mask_cache if self.mask_cache is not None else self.bitmap_index
+
+        if isinstance(kernel, str):
+            kernel = RuleKernel(transactions, features, backend=kernel)
+        if kernel is not None and (self.window_index is None or kernel.n_rows != len(transactions)):
+            raise ValueError('Kernel requires a window index and must be built over the same transactions.')
+        self.kernel = kernel
+
+        self.approximate = approximate
+        self.sample_size = sample_size
+        self.n_strata = n_strata
+        self.sample_rng = np.random.default_rng(sample_seed)
+
+        self.fidelity_schedule = sorted(fidelity_schedule or [(0, 1)])
+        if any(stride < 1 for _, stride in self.fidelity_schedule):
+            raise ValueError('Fidelity strides must be positive.')
+        self.fidelity_threshold = fidelity_threshold
+        # Coarse views of the transactions (every stride-th row) and their window indexes
+        self._views = {}
+
+        # Evaluation counters
+        self.evaluations = 0
+        self.pruned_evaluations = 0
+        self.approximate_evaluations = 0
+        self.rescored_evaluations = 0
+        self.coarse_evaluations = 0
+        self.promoted_evaluations = 0
+
+        if archive_backend not in ('list', 'structured'):
+            raise ValueError("Archive backend must be 'list' or 'structured'.")
+        self.archive_backend = archive_backend
 
         # Archive for storing all unique rules with fitness > 0.0
-        self.rule_archive = []
+        self.rule_archive = self._new_archive([])
+        # String representations of archived rules for constant time duplicate checks
+        self._archive_keys = set()
+        # Min-heap of the best prune_top_k archived fitness values
+        self._top_fitness = []
 
         # Store the best fitness value
         self.best_fitness = -np.inf
@@ -61,11 +238,45 @@ class NiaARMTS(Problem):
 
     # NiaPy evaluation function
     def _evaluate(self, solution):
+        stride = self.fidelity()
+        self.evaluations += 1
+
+        if stride > 1:
+            self.coarse_evaluations += 1
+            fitness = self.evaluate_solution(solution, stride)
+            if self.fidelity_threshold is None or fitness < self.fidelity_threshold:
+                return fitness
+            self.promoted_evaluations += 1
+
+        fitness = self.evaluate_solution(solution)
+        if self.compact_every and self.evaluations % self.compact_every == 0:
+            self.compact_archive(**self.compaction)
+        return fitness
+
+    def evaluate_solution(self, solution, stride=1):
+        """
+        Evaluate a solution on the transactions or on a coarse view of them.
+
+        Args:
+            solution (np.ndarray): The solution vector.
+            stride (int): Evaluate windows on every stride-th row; rules are archived only with stride 1.
+
+        Returns:
+            float: The fitness of the rule encoded by the solution.
+        """
+
         # get cut point
         cut_point_val = solution[-1]
         solution = np.delete(solution, -1)
 
-        if self.interval == 'true':
+        if self.interval == 'true' and self.interval_range:
+            upper = solution[-1]
+            solution = np.delete(solution, -1)
+            lower = solution[-1]
+            solution = np.delete(solution, -1)
+            start, end = sorted((self.map_to_interval(lower), self.map_to_interval(upper)))
+
+        elif self.interval == 'true':
             interval = solution[-1]
             solution = np.delete(solution, -1)
             curr_interval = self.map_to_interval(interval)
@@ -86,57 +297,205 @@ class NiaARMTS(Problem):
             start = self.transactions['timestamp'].iloc[min_interval]
             end = self.transactions['timestamp'].iloc[max_interval]
 
+        # Transactions inside the time bounds
+        window = self.get_window(start, end, stride)
+        rows = self.window_index.rows(start, end) if self._bit_matcher is not None and stride == 1 else None
+        window_stats = None
+        if self.window_stats is not None and stride == 1:
+            window_stats = self.window_stats.get(*(rows or self.window_index.rows(start, end)))
+
         # Step 1: Build the rules using the solution and features
-        rule = build_rule(solution, self.features, is_time_series=(self.interval == "false"), start=start, end=end, transactions=self.transactions)
+        rule = build_rule(solution, self.features, is_time_series=(self.interval == "false"), start=start, end=end, transactions=self.transactions, window=window, window_stats=window_stats)
 
         # Step 2: Split the rule into antecedents and consequents based on the cut point
         cut = self.cut_point(cut_point_val, len(rule))
         antecedent = rule[:cut]  # From the start to the 'cut' index (not inclusive)
         consequent = rule[cut:]  # From 'cut' index (inclusive) to the end of the array
 
+        # Drop conditions on features that are not allowed on their side of the rule
+        if self.antecedent_features is not None or self.consequent_features is not None:
+            if self.antecedent_features is not None:
+                antecedent = [condition for condition in antecedent if condition['feature'] in self.antecedent_features]
+            if self.consequent_features is not None:
+                consequent = [condition for condition in consequent if condition['feature'] in self.consequent_features]
+            rule = antecedent + consequent
+
         # Step 3: Calculate support, confidence, and other arbitrary metrics for the rules
         if len(antecedent) > 0 and len(consequent) > 0:
-            # Calculate support and confidence always
-
-            if self.interval != "true":
-                support = calculate_support(self.transactions, antecedent, consequent, start, end)
-                confidence = calculate_confidence(self.transactions, antecedent, consequent, start, end)
-
-            else:
-                support = calculate_support(self.transactions, antecedent, consequent, start, end, use_interval=True)
-                confidence = calculate_confidence(self.transactions, antecedent, consequent, start, end, use_interval=True)
+            use_interval = self.interval == "true"
 
+            # Metrics that depend only on the rule and its time bounds are computed first
             inclusion = 0.0
-            if self.gamma > 0.0:
+            if self._compute_inclusion:
                 inclusion = calculate_inclusion_metric(self.features, antecedent, consequent)
 
-            amplitude = 0.0
-            if self.delta > 0.0:
-                if self.interval != "true":
-                    amplitude = calculate_amplitude_metric(self.transactions, self.features, antecedent, consequent, start, end, use_interval=False)
-                else:
-                    amplitude = calculate_amplitude_metric(self.transactions, self.features, antecedent, consequent, start, end, use_interval=True)
-
             # Timestamp metric (TSM): relative length of the selected segment
-            tsm = 0.0
-            if self.interval != "true":
-                tsm = calculate_timestamp_metric(self.transactions, start, end, use_interval=False)
+            tsm = calculate_timestamp_metric(self.transactions, start, end, use_interval=use_interval, statistics=self.statistics)
+
+            threshold = self.pruning_threshold() if self.pruning else None
+            if threshold is not None and self.fitness_upper_bound(1.0, inclusion, tsm) <= threshold:
+                self.pruned_evaluations += 1
+                return calculate_fitness(0.0, 0.0, inclusion, 0.0, tsm, self.alpha, self.beta, self.gamma, self.delta, self.epsilon)
+
+            if self.approximate and len(window) > self.sample_size:
+                fitness = self.approximate_fitness(window, antecedent, consequent, inclusion, tsm, threshold)
+                if fitness is not None:
+                    return fitness
+                self.rescored_evaluations += 1
+
+            # Calculate support and confidence always
+            kernel_result = None
+            if self.kernel is not None and stride == 1:
+                kernel_result = self.kernel.evaluate(antecedent, consequent, *self.window_index.rows(start, end))
+                antecedent_count = kernel_result['antecedent_count']
+            else:
+                antecedent_mask = self.match_conditions(window, antecedent, rows=rows)
+                antecedent_count = self.count_matches(antecedent_mask, rows)
+
+            if threshold is not None and (antecedent_count == 0 or self.fitness_upper_bound(antecedent_count / len(window), inclusion, tsm) <= threshold):
+                self.pruned_evaluations += 1
+                return calculate_fitness(0.0, 0.0, inclusion, 0.0, tsm, self.alpha, self.beta, self.gamma, self.delta, self.epsilon)
+
+            if kernel_result is not None:
+                rule_count = kernel_result['rule_count']
             else:
-                tsm = calculate_timestamp_metric(self.transactions, start, end, use_interval=True)
+                rule_count = self.count_matches(self.match_conditions(window, consequent, antecedent_mask, rows), rows) if antecedent_count > 0 else 0
+            support = rule_count / len(window) if len(window) > 0 else 0.0
+            confidence = rule_count / antecedent_count if antecedent_count > 0 else 0.0
 
+            amplitude = 0.0
+            if self._compute_amplitude:
+                amplitude = kernel_result['amplitude'] if kernel_result is not None else _amplitude(window, antecedent + consequent, window_stats)
 
             # Step 4: Calculate the fitness of the rules using weights for support, confidence, inclusion, amplitude and tsm
             fitness = calculate_fitness(support, confidence, inclusion, amplitude, tsm, self.alpha, self.beta, self.gamma, self.delta, self.epsilon)
+            if stride > 1:
+                return fitness
+            self.best_fitness = max(self.best_fitness, fitness)
 
-            # Step 5: Store the rule if it has fitness > 0 and it's unique
+            # Step 5: Store the rule if it has fitness > 0 (under the mining weights or any profile) and it's unique
             # Additional step: check also if support and conf > 0
-            if fitness > 0 and support > 0 and confidence > 0:
+            admitted = fitness > 0 or (self._profile_weights is not None and self.profile_fitness(support, confidence, inclusion, amplitude, tsm).max() > 0)
+            if admitted and support > 0 and confidence > 0 and (threshold is None or fitness > threshold):
                 self.add_rule_to_archive(rule, antecedent, consequent, fitness, start, end, support, confidence, inclusion, amplitude, tsm)
 
             return fitness
         else:
             return 0.0
 
+    def get_window(self, start, end, stride=1):
+        """
+        Select the transactions inside the time bounds of a rule (both inclusive).
+
+        With a window index the rows form a contiguous block and are sliced directly, otherwise the
+        time column is filtered.
+
+        Args:
+            start (timestamp or int): The start timestamp or interval.
+            end (timestamp or int): The end timestamp or interval.
+            stride (int): Select from every stride-th row of the transactions only.
+
+        Returns:
+            pd.DataFrame: The transactions inside the bounds.
+        """
+        transactions, window_index = self.get_view(stride)
+        if window_index is not None:
+            lo, hi = window_index.rows(start, end)
+            return transactions.iloc[lo:hi]
+        return filter_window(transactions, start, end, self.interval == 'true')
+
+    def get_view(self, stride=1):
+        """
+        Return the transactions (every stride-th row) and their window index, built once per stride.
+        """
+        if stride == 1:
+            return self.transactions, self.window_index
+        if stride not in self._views:
+            view = self.transactions.iloc[::stride]
+            self._views[stride] = (view, WindowIndex.from_dataframe(view, self.interval == 'true'))
+        return self._views[stride]
+
+    def fidelity(self):
+        """
+        Return the stride of the current evaluations according to the fidelity schedule.
+        """
+        stride = 1
+        for evaluations, scheduled in self.fidelity_schedule:
+            if self.evaluations < evaluations:
+                break
+            stride = scheduled
+        return stride
+
+    def approximate_fitness(self, window, antecedent, consequent, inclusion, tsm, threshold):
+        """
+        Estimate the fitness of a rule from a stratified sample of its window.
+
+        Args:
+            window (pd.DataFrame): The transactions inside the time bounds of the rule.
+            antecedent (list): The antecedent part of the rule.
+            consequent (list): The consequent part of the rule.
+            inclusion (float): Inclusion metric of the rule.
+            tsm (float): Timestamp metric of the rule.
+            threshold (float): Pruning threshold.
+
+        Returns:
+            float: The estimated fitness, or None if the rule could enter the archive and has to be
+            evaluated exactly.
+        """
+        self.approximate_evaluations += 1
+        estimate = estimate_support_confidence(window, antecedent, consequent, self.sample_size, self.n_strata, rng=self.sample_rng)
+
+        optimistic = calculate_fitness(estimate['support_ci'][1], estimate['confidence_ci'][1], inclusion, 1.0, tsm, self.alpha, self.beta, self.gamma, self.delta, self.epsilon)
+        if estimate['rule_count'] > 0 and optimistic > threshold:
+            return None
+
+        amplitude = 0.0
+        if self._compute_amplitude:
+            amplitude = _amplitude(window.iloc[estimate['rows']], antecedent + consequent)
+        return calculate_fitness(estimate['support'], estimate['confidence'], inclusion, amplitude, tsm, self.alpha, self.beta, self.gamma, self.delta, self.epsilon)
+
+    def match_conditions(self, window, conditions, mask=None, rows=None):
+        """
+        Evaluate a conjunction of rule conditions on the transactions of a window.
+
+        Args:
+            window (pd.DataFrame): The transactions inside the time bounds of the rule (see :meth:`get_window`).
+            conditions (list): A list of dictionaries defining the conditions.
+            mask (np.ndarray): Optional result of a previous call to start from.
+            rows (tuple): Rows (lo, hi) of the window; the mask cache or the bitmap index is used when they are given.
+
+        Returns:
+            np.ndarray: A boolean mask over the window, or a packed bitset of the window rows when the
+            mask cache or the bitmap index is used. Count the matches with :meth:`count_matches`.
+        """
+        if rows is not None:
+            return self._bit_matcher.conditions_bits(conditions, rows[0], rows[1], mask)
+        return calculate_conditions_mask(window, conditions, mask)
+
+    def count_matches(self, mask, rows=None):
+        """
+        Count the transactions selected by the result of :meth:`match_conditions` (called with the same rows).
+        """
+        if rows is not None:
+            return count_bits(mask)
+        return int(mask.sum())
+
+    def pruning_threshold(self):
+        """
+        Return the fitness a rule has to beat to be evaluated completely when pruning is enabled.
+        """
+        threshold = self.prune_threshold
+        if self.prune_top_k and len(self._top_fitness) >= self.prune_top_k:
+            threshold = max(threshold, self._top_fitness[0])
+        return threshold
+
+    def fitness_upper_bound(self, support_bound, inclusion, tsm):
+        """
+        Upper bound of the fitness of a rule whose inclusion and TSM are known, assuming the best
+        possible confidence and amplitude (1.0) and support at most `support_bound`.
+        """
+        return calculate_fitness(support_bound, 1.0, inclusion, 1.0, tsm, self.alpha, self.beta, self.gamma, self.delta, self.epsilon)
+
     def add_rule_to_archive(self, full_rule, antecedent, consequent, fitness, start, end, support, confidence, inclusion, amplitude, tsm):
         """
         Add the rule to the archive if its fitness is greater than zero and it's not already present.
@@ -156,7 +515,8 @@ class NiaARMTS(Problem):
         """
         rule_repr = self.rule_representation(full_rule)
         # Check if the rule is already in the archive (by its string representation)
-        if rule_repr not in [self.rule_representation(r['full_rule']) for r in self.rule_archive]:
+        if rule_repr not in self._archive_keys:
+            self._archive_keys.add(rule_repr)
             # Add the rule, its antecedent, consequent, fitness, support, confidence, inclusion, amplitude, tsm and timestamps to the archive
             self.rule_archive.append({
                 'full_rule': full_rule,
@@ -172,7 +532,71 @@ class NiaARMTS(Problem):
                 'end': end
             })
 
-    def rule_representation(self, rule):
+            if self.prune_top_k:
+                if len(self._top_fitness) < self.prune_top_k:
+                    heapq.heappush(self._top_fitness, fitness)
+                elif fitness > self._top_fitness[0]:
+                    heapq.heapreplace(self._top_fitness, fitness)
+
+    def _new_archive(self, rules):
+        if self.archive_backend == 'structured':
+            if isinstance(rules, RuleArchive):
+                return rules
+            return RuleArchive.from_rules(self.features, rules, interval=(self.interval == 'true'))
+        return list(rules)
+
+    def get_run_state(self):
+        """
+        Mutable state of a mining run: everything a resumed run needs to continue exactly like an
+        uninterrupted one (see :func:`niaarmts.checkpoint.save_checkpoint`). Caches and indexes derived
+        from the transactions are not part of it.
+
+        Returns:
+            dict: The archive, the keys of the duplicate check (including those of compacted rules), the
+            pruning heap, the best fitness, the state of the sampling generator and the counters of
+            :data:`RUN_STATE_COUNTERS`.
+        """
+        return {
+            'archive': self.rule_archive,
+            'archive_keys': set(self._archive_keys),
+            'top_fitness': list(self._top_fitness),
+            'best_fitness': self.best_fitness,
+            'sample_rng': self.sample_rng.bit_generator.state,
+            'counters': {name: getattr(self, name) for name in RUN_STATE_COUNTERS}
+        }
+
+    def set_run_state(self, state):
+        """
+        Restore the state returned by :meth:`get_run_state`. Archived rules are restored as they are,
+        without re-evaluation.
+
+        Args:
+            state (dict): The saved run state.
+        """
+        self.rule_archive = self._new_archive(state['archive'])
+        self._archive_keys = set(state['archive_keys'])
+        self._top_fitness = list(state['top_fitness'])
+        self.best_fitness = state['best_fitness']
+        self.sample_rng.bit_generator.state = state['sample_rng']
+        for name, value in state['counters'].items():
+            setattr(self, name, value)
+
+    def set_rule_archive(self, archive):
+        """
+        Replace the archive with previously archived rules (e.g. from a checkpoint) without re-evaluating them.
+
+        Args:
+            archive (list[dict]): Archive entries as returned by :meth:`get_rule_archive`.
+        """
+        self.rule_archive = self._new_archive(archive)
+        self._archive_keys = {self.rule_representation(entry['full_rule']) for entry in self.rule_archive}
+        self._top_fitness = []
+        if self.prune_top_k:
+            self._top_fitness = heapq.nlargest(self.prune_top_k, [entry['fitness'] for entry in self.rule_archive])
+            heapq.heapify(self._top_fitness)
+
+    @staticmethod
+    def rule_representation(rule):
         """
         Generate a string representation of a rule for easier comparison and to avoid duplicates.
         Args:
@@ -200,8 +624,7 @@ class NiaARMTS(Problem):
         return cut
 
     def map_to_interval(self, val):
-        min_interval = self.transactions['interval'].min()
-        max_interval = self.transactions['interval'].max()
+        min_interval, max_interval = self.statistics.get_time_bounds(use_interval=True)
 
         if not 0.0 <= val <= 1.0:
             raise ValueError("The random solution must be between 0 and 1.")
@@ -225,9 +648,87 @@ class NiaARMTS(Problem):
         Return the archive of all valid rules (those with fitness > 0), sorted by fitness in descending order.
         """
         # Sort the archive by fitness in descending order
-        self.rule_archive.sort(key=lambda x: x['fitness'], reverse=True)
+        if isinstance(self.rule_archive, RuleArchive):
+            self.rule_archive.sort_by('fitness', descending=True)
+        else:
+            self.rule_archive.sort(key=lambda x: x['fitness'], reverse=True)
         return self.rule_archive
 
+    def compact_archive(self, tolerance=0.0, border_tolerance=0.0, window_tolerance=None):
+        """
+        Remove near-duplicate and subsumed rules from the archive (see :func:`niaarmts.compaction.compact_archive`).
+
+        Removed rules stay in the duplicate check, so they are not archived again. Representatives are
+        chosen by the fitness under the mining weights, also when weight profiles are given.
+
+        Args:
+            tolerance (float): Maximum difference of support, confidence and fitness for subsumption.
+            border_tolerance (float): Maximum difference of matching borders, as a fraction of the feature range.
+            window_tolerance (int or pd.Timedelta): Maximum difference of the window bounds (None ignores windows).
+
+        Returns:
+            int: Number of removed rules.
+        """
+        result = compact_archive(self.rule_archive, self.features, tolerance, border_tolerance, window_tolerance)
+        self.rule_archive = result['rules']
+        if self.prune_top_k:
+            self._top_fitness = heapq.nlargest(self.prune_top_k, [entry['fitness'] for entry in self.rule_archive])
+            heapq.heapify(self._top_fitness)
+        self.compacted_rules += len(result['removed'])
+        return len(result['removed'])
+
+    def get_archive_index(self):
+        """
+        Build a queryable index (interval tree over the windows, inverted indexes by feature, side and
+        category) over the current rule archive.
+
+        Returns:
+            ArchiveIndex: The index; it does not follow later changes of the archive.
+        """
+        return ArchiveIndex(self.rule_archive)
+
+    def get_rule_matcher(self):
+        """
+        Compile the current rule archive for matching batches of incoming rows (see
+        :class:`niaarmts.matcher.RuleMatcher`).
+
+        Returns:
+            RuleMatcher: The compiled rules; it does not follow later changes of the archive.
+        """
+        return RuleMatcher(self.rule_archive)
+
+    def profile_fitness(self, support, confidence, inclusion, amplitude, tsm):
+        """
+        Fitness of one rule under every weight profile given to the constructor.
+
+        Returns:
+            np.ndarray: The fitness per profile (see :func:`niaarmts.reweight.reweight_fitness`).
+        """
+        metrics = np.array([support, confidence, inclusion, amplitude, tsm], dtype=np.float64)
+        weights = self._profile_weights
+        return (weights * metrics).sum(axis=1) / (weights > 0).sum(axis=1)
+
+    def get_profile_rankings(self, profiles=None, top_k=None):
+        """
+        Rank the archived rules under several weight profiles from their stored metrics, without mining again.
+
+        Args:
+            profiles (dict or list): Weight profiles (see :func:`niaarmts.reweight.weight_matrix`). Defaults
+                to the profiles given to the constructor.
+            top_k (int): Keep only the best rules of every profile.
+
+        Returns:
+            dict: Per profile name, copies of the archive entries in descending order of their fitness under
+            the profile, with 'fitness' set to that fitness (see :func:`niaarmts.reweight.rank_archive`).
+
+        Raises:
+            ValueError: No weight profiles are given.
+        """
+        profiles = profiles if profiles is not None else self.weight_profiles
+        if not profiles:
+            raise ValueError('No weight profiles given.')
+        return rank_archive(self.rule_archive, profiles, top_k)
+
     def save_rules_to_csv(self, file_path):
         """
         Save the archived rules to a CSV file, sorted by fitness (descending).
@@ -322,3 +823,27 @@ class NiaARMTS(Problem):
         with open(file_path, 'w') as f:
             json.dump(archive_dict, f, indent=4)
         print(f"Rules saved to {file_path}.")
+
+    def save_rules_to_jsonl(self, file_path, compress=None):
+        """
+        Stream the archived rules to a JSON Lines file (one rule per line), sorted by fitness (descending).
+        Rules can be read back with :func:`niaarmts.archive_io.read_rules_jsonl`.
+
+        Args:
+            file_path (str): The path to save the file.
+            compress (str): 'gzip' to compress the file. By default, files ending with '.gz' are compressed.
+        """
+        write_rules_jsonl(self.get_rule_archive(), file_path, compress)
+        print(f"Rules saved to {file_path}.")
+
+    def save_rules_to_npz(self, file_path, compressed=True):
+        """
+        Save the archived rules in a columnar binary NumPy (.npz) file, sorted by fitness (descending).
+        Rules can be read back with :func:`niaarmts.archive_io.read_rules_npz`.
+
+        Args:
+            file_path (str): The path to save the file.
+            compressed (bool): Compress the arrays.
+        """
+        write_rules_npz(self.get_rule_archive(), file_path, compressed)
+        print(f"Rules saved to {file_path}.")
@@ -1,11 +1,29 @@
-from niaarmts.dataset import Dataset
+from niaarmts.dataset import Dataset, DatasetStatistics, WindowIndex
 from niaarmts.feature import Feature
 from niaarmts.rule import build_rule
 from niaarmts.NiaARMTS import NiaARMTS
-from niaarmts.metrics import calculate_support, calculate_confidence, calculate_inclusion_metric, calculate_amplitude_metric, calculate_fitness, calculate_coverage_metric, calculate_timestamp_metric
+from niaarmts.metrics import calculate_support, calculate_confidence, calculate_inclusion_metric, calculate_amplitude_metric, calculate_fitness, calculate_coverage_metric, calculate_timestamp_metric, score_rules
 from niaarmts.explainability import explain_rule
 from niaarmts.rule_stability import calculate_stability_score, plot_rule_stability, create_latex_table
+from niaarmts.synthetic import SyntheticGenerator
+from niaarmts.portfolio import run_portfolio, merge_archives
+from niaarmts.islands import run_islands
+from niaarmts.archive import RuleArchive
+from niaarmts.archive_index import ArchiveIndex
+from niaarmts.matcher import RuleMatcher
+from niaarmts.compaction import compact_archive
+from niaarmts.reweight import reweight_fitness, rank_archive
+from niaarmts.backtest import backtest, rolling_origin
+from niaarmts.entities import mine_entities
+from niaarmts.bitmap import BitmapIndex
+from niaarmts.mask_cache import ConditionMaskCache
+from niaarmts.window_stats import WindowStatsCache
+from niaarmts.kernels import RuleKernel
+from niaarmts.reduction import reduce_features
+from niaarmts.service import RuleScorer, ScoringService
+from niaarmts.archive_io import read_rules_jsonl, read_rules_npz, write_rules_jsonl, write_rules_npz
+from niaarmts.checkpoint import save_checkpoint, load_checkpoint, restore_checkpoint, run_with_checkpoints
 
-__all__ = ["Dataset", "Feature", "build_rule", "NiaARMTS", "calculate_support", "calculate_confidence", "calculate_inclusion_metric", "calculate_amplitude_metric", "calculate_fitness", "NarmViz", 'calculate_coverage_metric', 'calculate_timestamp_metric', 'explain_rule', 'calculate_stability_score', 'plot_rule_stability', 'create_latex_table']
+__all__ = ["Dataset", "DatasetStatistics", "WindowIndex", "Feature", "build_rule", "NiaARMTS", "calculate_support", "calculate_confidence", "calculate_inclusion_metric", "calculate_amplitude_metric", "calculate_fitness", "NarmViz", 'calculate_coverage_metric', 'calculate_timestamp_metric', 'score_rules', 'explain_rule', 'calculate_stability_score', 'plot_rule_stability', 'create_latex_table', 'SyntheticGenerator', 'run_portfolio', 'merge_archives', 'run_islands', 'save_checkpoint', 'load_checkpoint', 'restore_checkpoint', 'run_with_checkpoints', 'read_rules_jsonl', 'read_rules_npz', 'write_rules_jsonl', 'write_rules_npz', 'RuleArchive', 'BitmapIndex', 'RuleKernel', 'reduce_features', 'RuleScorer', 'ScoringService', 'ArchiveIndex', 'RuleMatcher', 'compact_archive', 'reweight_fitness', 'rank_archive', 'backtest', 'rolling_origin', 'mine_entities', 'ConditionMaskCache', 'WindowStatsCache']
 
 __version__ = "0.2.6"
@@ -0,0 +1,281 @@
+import numpy as np
+import pandas as pd
+
+METRICS = ['fitness', 'support', 'confidence', 'inclusion', 'amplitude', 'tsm']
+
+TYPES = ['Numerical', 'Categorical', 'Unknown']
+
+RULE_DTYPE = np.dtype([
+    ('fitness', 'f8'),
+    ('support', 'f8'),
+    ('confidence', 'f8'),
+    ('inclusion', 'f8'),
+    ('amplitude', 'f8'),
+    ('tsm', 'f8'),
+    ('start', 'i8'),
+    ('end', 'i8'),
+    ('offset', 'i8'),
+    ('length', 'i2'),
+    ('cut', 'i2')
+])
+
+CONDITION_DTYPE = np.dtype([
+    ('feature', 'i2'),
+    ('type', 'i1'),
+    ('category', 'i4'),
+    ('border1', 'f8'),
+    ('border2', 'f8')
+])
+
+
+class RuleArchive:
+    def __init__(self, features, interval=False, capacity=1024):
+        """
+        Rule archive stored in preallocated NumPy structured arrays.
+
+        Every rule takes one record of :data:`RULE_DTYPE` (metrics, int64 window bounds, cut index and
+        the position and number of its conditions) and one record of :data:`CONDITION_DTYPE` per condition (feature
+        id, type, category code and borders). Features and categories are encoded by their position in
+        the feature metadata; categories missing from the metadata are appended to the vocabulary of
+        their feature. The archive behaves like the list of dictionaries used by
+        :class:`niaarmts.NiaARMTS`: iterating or indexing it produces the usual archive entries.
+
+        Args:
+            features (dict): A dictionary of feature metadata (see :meth:`Dataset.get_all_features_with_metadata`).
+            interval (bool): Window bounds are interval ids instead of timestamps.
+            capacity (int): Initial number of preallocated rules.
+
+        Raises:
+            ValueError: There are more features than the int16 feature ids can encode.
+        """
+        if len(features) > np.iinfo(CONDITION_DTYPE['feature']).max:
+            raise ValueError(f"The archive supports at most {np.iinfo(CONDITION_DTYPE['feature']).max} features.")
+        self.features = list(features.keys())
+        self.feature_ids = {name: i for i, name in enumerate(self.features)}
+        self.categories = [list(meta['categories']) if meta['categories'] is not None else [] for meta in features.values()]
+        self.category_codes = [{category: i for i, category in enumerate(categories)} for categories in self.categories]
+        self.interval = interval
+
+        self.rules = np.zeros(max(capacity, 1), dtype=RULE_DTYPE)
+        self.conditions = np.zeros(max(capacity, 1) * 4, dtype=CONDITION_DTYPE)
+        self.n_rules = 0
+        self.n_conditions = 0
+
+    @classmethod
+    def from_rules(cls, features, rules, interval=False):
+        """
+        Build an archive from archive entries (dictionaries).
+
+        Args:
+            features (dict): A dictionary of feature metadata.
+            rules (iterable[dict]): Archive entries.
+            interval (bool): Window bounds are interval ids instead of timestamps.
+
+        Returns:
+            RuleArchive: The archive.
+        """
+        rules = list(rules)
+        archive = cls(features, interval=interval, capacity=len(rules))
+        for entry in rules:
+            archive.append(entry)
+        return archive
+
+    def _reserve(self, n_rules, n_conditions):
+        if n_rules > len(self.rules):
+            grown = np.zeros(max(n_rules, 2 * len(self.rules)), dtype=RULE_DTYPE)
+            grown[:self.n_rules] = self.rules[:self.n_rules]
+            self.rules = grown
+        if n_conditions > len(self.conditions):
+            grown = np.zeros(max(n_conditions, 2 * len(self.conditions)), dtype=CONDITION_DTYPE)
+            grown[:self.n_conditions] = self.conditions[:self.n_conditions]
+            self.conditions = grown
+
+    def _encode_bound(self, value):
+        return int(value) if self.interval else pd.Timestamp(value).value
+
+    def _decode_bound(self, value):
+        return int(value) if self.interval else pd.Timestamp(int(value))
+
+    def _category_code(self, feature, condition):
+        codes = self.category_codes[feature]
+        category = condition['category']
+        if category not in codes:
+            # Categories missing from the feature metadata extend the vocabulary of the feature
+            codes[category] = len(self.categories[feature])
+            self.categories[feature].append(category)
+        return codes[category]
+
+    def append(self, entry):
+        """
+        Append an archive entry.
+
+        Args:
+            entry (dict): Archive entry with 'antecedent', 'consequent', the metrics and 'start' and 'end'.
+
+        Raises:
+            ValueError: The rule has more conditions than the int16 rule length can encode.
+        """
+        conditions = entry['antecedent'] + entry['consequent']
+        if len(conditions) > np.iinfo(RULE_DTYPE['length']).max:
+            raise ValueError(f"A rule can have at most {np.iinfo(RULE_DTYPE['length']).max} conditions.")
+        self._reserve(self.n_rules + 1, self.n_conditions + len(conditions))
+
+        for i, condition in enumerate(conditions):
+            feature = self.feature_ids[condition['feature']]
+            record = self.conditions[self.n_conditions + i]
+            record['feature'] = feature
+            record['type'] = TYPES.index(condition['type'])
+            record['category'] = self._category_code(feature, condition) if condition['type'] == 'Categorical' else -1
+            record['border1'] = condition['border1']
+            record['border2'] = condition['border2']
+
+        record = self.rules[self.n_rules]
+        for metric in METRICS:
+            record[metric] = entry[metric]
+        record['start'] = self._encode_bound(entry['start'])
+        record['end'] = self._encode_bound(entry['end'])
+        record['offset'] = self.n_conditions
+        record['length'] = len(conditions)
+        record['cut'] = len(entry['antecedent'])
+
+        self.n_rules += 1
+        self.n_conditions += len(conditions)
+
+    def _entry(self, i):
+        record = self.rules[i]
+        offset = int(record['offset'])
+        conditions = []
+        for condition in self.conditions[offset:offset + int(record['length'])].tolist():
+            feature, type_code, category, border1, border2 = condition
+            conditions.append({
+                'feature': self.features[feature],
+                'type': TYPES[type_code],
+                'border1': border1,
+                'border2': border2,
+                'category': self.categories[feature][category] if category >= 0 else 'EMPTY'
+            })
+
+        cut = int(record['cut'])
+        entry = {
+            'full_rule': conditions,
+            'antecedent': conditions[:cut],
+            'consequent': conditions[cut:]
+        }
+        for metric in METRICS:
+            entry[metric] = float(record[metric])
+        entry['start'] = self._decode_bound(record['start'])
+        entry['end'] = self._decode_bound(record['end'])
+        return entry
+
+    def __len__(self):
+        return self.n_rules
+
+    def __iter__(self):
+        for i in range(self.n_rules):
+            yield self._entry(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(self.n_rules))]
+        if index < 0:
+            index += self.n_rules
+        if not 0 <= index < self.n_rules:
+            raise IndexError("Rule index out of range.")
+        return self._entry(index)
+
+    def to_dicts(self):
+        """
+        Return the archive as a list of archive entries (dictionaries).
+        """
+        return list(self)
+
+    @property
+    def records(self):
+        """
+        Structured array of the archived rules (a view, without the preallocated free space).
+        """
+        return self.rules[:self.n_rules]
+
+    @property
+    def nbytes(self):
+        """
+        Number of bytes used by the archived rules and their conditions.
+        """
+        return self.n_rules * RULE_DTYPE.itemsize + self.n_conditions * CONDITION_DTYPE.itemsize
+
+    def sort_by(self, field='fitness', descending=True):
+        """
+        Sort the archive by a rule field. The sort is stable, so rules with equal values keep their order.
+
+        Args:
+            field (str): Field of :data:`RULE_DTYPE`, e.g. 'fitness' or 'support'.
+            descending (bool): Sort in descending order.
+        """
+        values = self.records[field]
+        order = np.argsort(-values if descending else values, kind='stable')
+        self.rules[:self.n_rules] = self.records[order]
+
+    def sort(self, key=None, reverse=False):
+        """
+        List-compatible sort. Without a key, rules are sorted by fitness.
+
+        Args:
+            key (callable): Function computing the sort key from an archive entry.
+            reverse (bool): Sort in descending order.
+        """
+        if key is None:
+            self.sort_by('fitness', descending=reverse)
+            return
+        keys = [key(entry) for entry in self]
+        order = sorted(range(self.n_rules), key=lambda i: keys[i], reverse=reverse)
+        self.rules[:self.n_rules] = self.records[order]
+
+    def feature_mask(self, feature, side=None):
+        """
+        Vectorized test which rules contain a condition on the given feature.
+
+        Args:
+            feature (str): Feature name.
+            side (str): Restrict the test to the 'antecedent' or the 'consequent'.
+
+        Returns:
+            np.ndarray: Boolean mask over the archived rules.
+        """
+        records = self.records
+        lengths = records['length'].astype(np.int64)
+        rule_of_condition = np.repeat(np.arange(self.n_rules), lengths)
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = records['offset'][rule_of_condition] + within
+
+        hits = self.conditions['feature'][positions] == self.feature_ids[feature]
+        if side == 'antecedent':
+            hits &= within < records['cut'][rule_of_condition]
+        elif side == 'consequent':
+            hits &= within >= records['cut'][rule_of_condition]
+
+        mask = np.zeros(self.n_rules, dtype=bool)
+        mask[rule_of_condition[hits]] = True
+        return mask
+
+    def filter(self, mask):
+        """
+        Select rules with a boolean mask or index array.
+
+        Args:
+            mask (np.ndarray): Boolean mask over the archived rules or indices of the selected rules.
+
+        Returns:
+            RuleArchive: A new, compacted archive with the selected rules.
+        """
+        selected = self.records[mask]
+        archive = RuleArchive.__new__(RuleArchive)
+        archive.__dict__.update({key: value for key, value in self.__dict__.items() if key not in ('rules', 'conditions')})
+
+        lengths = selected['length'].astype(np.int64)
+        starts = np.repeat(selected['offset'] - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        archive.conditions = self.conditions[np.arange(lengths.sum()) + starts]
+        archive.rules = selected.copy()
+        archive.rules['offset'] = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        archive.n_rules = len(selected)
+        archive.n_conditions = int(lengths.sum())
+        return archive
@@ -0,0 +1,196 @@
+import numbers
+import numpy as np
+import pandas as pd
+
+SIDES = ('antecedent', 'consequent')
+
+INT64_MIN = np.iinfo(np.int64).min
+INT64_MAX = np.iinfo(np.int64).max
+
+
+class ArchiveIndex:
+    def __init__(self, archive):
+        """
+        Queryable index over archived rules: an interval tree over the rule windows and inverted indexes
+        by feature, side and category.
+
+        Rules get ids in descending order of fitness (ties keep their archive order), so every posting
+        list is sorted by fitness, a fitness threshold is a prefix of the ids and the top k rules of any
+        combined filter are the k smallest ids of the intersection. The interval tree is a static
+        augmented tree over the rules sorted by window start; every node keeps the minimum and maximum
+        window end of its rules, so an overlap query visits O(log n) nodes per reported range of rules.
+
+        Args:
+            archive (list[dict] or RuleArchive): Archive entries (see :meth:`NiaARMTS.get_rule_archive`).
+        """
+        entries = list(archive)
+        self.interval = getattr(archive, 'interval', None)
+        if self.interval is None:
+            self.interval = bool(entries) and isinstance(entries[0]['start'], (numbers.Integral, np.integer))
+
+        fitness = np.array([entry['fitness'] for entry in entries], dtype=np.float64)
+        self.positions = np.argsort(-fitness, kind='stable')
+        self.entries = [entries[i] for i in self.positions]
+        self.fitness = fitness[self.positions]
+        self.n_rules = len(self.entries)
+
+        self.starts = self._encode_bounds([entry['start'] for entry in self.entries])
+        self.ends = self._encode_bounds([entry['end'] for entry in self.entries])
+        self._build_tree()
+
+        # Posting lists: (feature, side) and (feature, side, category), side None for either side
+        postings = {}
+        for rule_id, entry in enumerate(self.entries):
+            keys = set()
+            for side in SIDES:
+                for condition in entry[side]:
+                    for key_side in (side, None):
+                        keys.add((condition['feature'], key_side))
+                        if condition['type'] == 'Categorical':
+                            keys.add((condition['feature'], key_side, condition['category']))
+            for key in keys:
+                postings.setdefault(key, []).append(rule_id)
+        self.postings = {key: np.array(ids, dtype=np.int64) for key, ids in postings.items()}
+
+    def _encode_bound(self, value):
+        return int(value) if self.interval else pd.Timestamp(value).value
+
+    def _encode_bounds(self, values):
+        if self.interval or not values:
+            return np.array(values, dtype=np.int64)
+        return pd.DatetimeIndex(values).asi8.astype(np.int64)
+
+    def _build_tree(self):
+        self.order = np.argsort(self.starts, kind='stable')
+        self.sorted_starts = self.starts[self.order]
+        sorted_ends = self.ends[self.order]
+
+        # Implicit complete binary tree: node k has children 2k and 2k + 1, leaves start at `size`
+        self.size = 1
+        while self.size < max(self.n_rules, 1):
+            self.size *= 2
+        self.max_end = np.full(2 * self.size, INT64_MIN, dtype=np.int64)
+        self.min_end = np.full(2 * self.size, INT64_MAX, dtype=np.int64)
+        self.max_end[self.size:self.size + self.n_rules] = sorted_ends
+        self.min_end[self.size:self.size + self.n_rules] = sorted_ends
+        level = self.size
+        while level > 1:
+            parents = np.arange(level // 2, level)
+            self.max_end[parents] = np.maximum(self.max_end[2 * parents], self.max_end[2 * parents + 1])
+            self.min_end[parents] = np.minimum(self.min_end[2 * parents], self.min_end[2 * parents + 1])
+            level //= 2
+
+    def overlapping(self, start=None, end=None):
+        """
+        Ids of the rules whose window overlaps [start, end] (both inclusive).
+
+        Args:
+            start (int or datetime): Start of the query window (None for unbounded).
+            end (int or datetime): End of the query window (None for unbounded).
+
+        Returns:
+            np.ndarray: Sorted rule ids (i.e. in descending order of fitness).
+        """
+        low = INT64_MIN if start is None else self._encode_bound(start)
+        high = INT64_MAX if end is None else self._encode_bound(end)
+        # Only rules starting at or before the query end can overlap it
+        k = int(np.searchsorted(self.sorted_starts, high, side='right'))
+
+        ranges = []
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= k or self.max_end[node] < low:
+                continue
+            if hi <= k and self.min_end[node] >= low:
+                ranges.append((lo, hi))
+            elif hi - lo > 1:
+                middle = (lo + hi) // 2
+                stack.append((2 * node + 1, middle, hi))
+                stack.append((2 * node, lo, middle))
+
+        if not ranges:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate([self.order[lo:hi] for lo, hi in ranges]))
+
+    def with_feature(self, feature, side=None, category=None):
+        """
+        Ids of the rules with a condition on the feature.
+
+        Args:
+            feature (str): Feature name.
+            side (str): Restrict to the 'antecedent' or the 'consequent'.
+            category (str): Restrict to categorical conditions with this category.
+
+        Returns:
+            np.ndarray: Sorted rule ids.
+        """
+        if side is not None and side not in SIDES:
+            raise ValueError("Side must be 'antecedent', 'consequent' or None.")
+        key = (feature, side) if category is None else (feature, side, category)
+        return self.postings.get(key, np.zeros(0, dtype=np.int64))
+
+    def query_ids(self, start=None, end=None, features=None, side=None, categories=None, min_fitness=None, top_k=None):
+        """
+        Ids of the rules matching all given filters, in descending order of fitness.
+
+        Args:
+            start (int or datetime): The rule window must overlap a query window starting here.
+            end (int or datetime): The rule window must overlap a query window ending here.
+            features (str or list[str]): Features that must all appear in the rule.
+            side (str): Side of the rule the features and categories must appear on.
+            categories (dict): Feature -> category of categorical conditions that must appear in the rule.
+            min_fitness (float): Minimum fitness of the rules.
+            top_k (int): Return at most this many rules.
+
+        Returns:
+            np.ndarray: Rule ids; use :meth:`entry` or :meth:`query` for the archive entries.
+        """
+        limit = self.n_rules
+        if min_fitness is not None:
+            limit = int(np.searchsorted(-self.fitness, -min_fitness, side='right'))
+
+        if isinstance(features, str):
+            features = [features]
+        lists = [self.with_feature(feature, side) for feature in features or []]
+        lists += [self.with_feature(feature, side, category) for feature, category in (categories or {}).items()]
+
+        # Intersect the shortest posting lists first
+        lists.sort(key=len)
+        ids = None
+        for postings in lists:
+            postings = postings[:np.searchsorted(postings, limit)]
+            ids = postings if ids is None else np.intersect1d(ids, postings, assume_unique=True)
+            if len(ids) == 0:
+                break
+
+        if start is not None or end is not None:
+            if ids is None or len(ids) > 0:
+                windows = self.overlapping(start, end)
+                windows = windows[:np.searchsorted(windows, limit)]
+                ids = windows if ids is None else np.intersect1d(ids, windows, assume_unique=True)
+        if ids is None:
+            ids = np.arange(limit, dtype=np.int64)
+
+        return ids[:top_k] if top_k is not None else ids
+
+    def query(self, **filters):
+        """
+        Archive entries of the rules matching all filters of :meth:`query_ids`, in descending order of fitness.
+        """
+        return [self.entries[i] for i in self.query_ids(**filters)]
+
+    def entry(self, rule_id):
+        """
+        Archive entry of a rule id.
+        """
+        return self.entries[rule_id]
+
+    def archive_position(self, rule_id):
+        """
+        Position of a rule id in the archive the index was built from.
+        """
+        return int(self.positions[rule_id])
+
+    def __len__(self):
+        return self.n_rules
@@ -0,0 +1,257 @@
+import gzip
+import json
+import numpy as np
+import pandas as pd
+
+METRICS = ['fitness', 'support', 'confidence', 'inclusion', 'amplitude', 'tsm']
+
+
+def _open_text(file_path, mode, compress):
+    if compress is None:
+        compress = 'gzip' if str(file_path).endswith('.gz') else False
+    if compress == 'gzip':
+        return gzip.open(file_path, mode + 't', encoding='utf-8')
+    if compress:
+        raise ValueError(f"Unsupported compression: {compress}.")
+    return open(file_path, mode, encoding='utf-8')
+
+
+def _json_default(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable.")
+
+
+def _restore_bound(value):
+    return pd.Timestamp(value) if isinstance(value, str) else value
+
+
+# Python types of the categories stored in the columnar representation
+CATEGORY_KINDS = ('str', 'int', 'float', 'bool', 'none')
+
+
+def _encode_category(value):
+    # Categories are stored as text with their kind, so the loader restores the original type
+    if value is None:
+        return 'none', ''
+    if isinstance(value, (bool, np.bool_)):
+        return 'bool', str(bool(value))
+    if isinstance(value, (int, np.integer)):
+        return 'int', str(int(value))
+    if isinstance(value, (float, np.floating)):
+        return 'float', str(float(value))
+    return 'str', str(value)
+
+
+def _decode_category(kind, text):
+    if kind == 'none':
+        return None
+    if kind == 'bool':
+        return text == 'True'
+    if kind == 'int':
+        return int(text)
+    if kind == 'float':
+        return float(text)
+    return text
+
+
+def write_rules_jsonl(rules, file_path, compress=None):
+    """
+    Stream archived rules to a JSON Lines file, one rule per line.
+
+    Args:
+        rules (iterable[dict]): Archive entries as returned by :meth:`NiaARMTS.get_rule_archive`.
+        file_path (str): The path to save the file.
+        compress (str): 'gzip' to compress the file. By default, files ending with '.gz' are compressed.
+    """
+    with _open_text(file_path, 'w', compress) as f:
+        for entry in rules:
+            record = {metric: entry[metric] for metric in METRICS}
+            record['antecedent'] = entry['antecedent']
+            record['consequent'] = entry['consequent']
+            record['start'] = entry['start']
+            record['end'] = entry['end']
+            f.write(json.dumps(record, default=_json_default, separators=(',', ':')))
+            f.write('\n')
+
+
+def iter_rules_jsonl(file_path, compress=None):
+    """
+    Lazily read archive entries from a JSON Lines file written by :func:`write_rules_jsonl`.
+
+    Args:
+        file_path (str): The path of the file.
+        compress (str): 'gzip' for compressed files. By default, files ending with '.gz' are decompressed.
+
+    Yields:
+        dict: Archive entries with 'full_rule', 'antecedent', 'consequent', the metrics and the
+        'start' and 'end' of the rule (timestamps are restored as pd.Timestamp).
+    """
+    with _open_text(file_path, 'r', compress) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record['full_rule'] = record['antecedent'] + record['consequent']
+            record['start'] = _restore_bound(record['start'])
+            record['end'] = _restore_bound(record['end'])
+            yield record
+
+
+def read_rules_jsonl(file_path, compress=None):
+    """
+    Read all archive entries from a JSON Lines file written by :func:`write_rules_jsonl`.
+
+    Args:
+        file_path (str): The path of the file.
+        compress (str): 'gzip' for compressed files. By default, files ending with '.gz' are decompressed.
+
+    Returns:
+        list[dict]: The archive entries.
+    """
+    return list(iter_rules_jsonl(file_path, compress))
+
+
+def rules_to_arrays(rules):
+    """
+    Convert archive entries to flat columnar arrays.
+
+    Conditions of all rules are stored one after another; the conditions of rule `i` are
+    `conditions[rule_offsets[i]:rule_offsets[i + 1]]`, of which the first `cut[i]` form the antecedent.
+    Feature names, types and categories are stored as codes into vocabularies. Categories are stored as
+    text together with their kind (see :data:`CATEGORY_KINDS`), so integer, float (including NaN),
+    boolean and missing categories are restored with their original type.
+
+    Args:
+        rules (list[dict]): Archive entries.
+
+    Returns:
+        dict[str, np.ndarray]: The columnar representation of the rules.
+    """
+    rules = list(rules)
+    vocabularies = {'features': {}, 'types': {}, 'categories': {}}
+
+    def code(vocabulary, value):
+        return vocabularies[vocabulary].setdefault(value, len(vocabularies[vocabulary]))
+
+    offsets = np.zeros(len(rules) + 1, dtype=np.int64)
+    cut = np.empty(len(rules), dtype=np.int64)
+    features, types, categories, border1, border2 = [], [], [], [], []
+
+    for i, entry in enumerate(rules):
+        conditions = entry['antecedent'] + entry['consequent']
+        offsets[i + 1] = offsets[i] + len(conditions)
+        cut[i] = len(entry['antecedent'])
+        for condition in conditions:
+            features.append(code('features', condition['feature']))
+            types.append(code('types', condition['type']))
+            categories.append(code('categories', _encode_category(condition['category'])))
+            border1.append(condition['border1'])
+            border2.append(condition['border2'])
+
+    is_timestamp = len(rules) > 0 and isinstance(rules[0]['start'], pd.Timestamp)
+    bounds = {}
+    for bound in ('start', 'end'):
+        values = [entry[bound] for entry in rules]
+        bounds[bound] = np.array([pd.Timestamp(v).value for v in values] if is_timestamp else values, dtype=np.int64)
+
+    arrays = {metric: np.array([entry[metric] for entry in rules], dtype=np.float64) for metric in METRICS}
+    arrays.update({
+        'start': bounds['start'],
+        'end': bounds['end'],
+        'window': np.array('timestamp' if is_timestamp else 'interval'),
+        'rule_offsets': offsets,
+        'cut': cut,
+        'feature_code': np.array(features, dtype=np.int32),
+        'type_code': np.array(types, dtype=np.int8),
+        'category_code': np.array(categories, dtype=np.int32),
+        'border1': np.array(border1, dtype=np.float64),
+        'border2': np.array(border2, dtype=np.float64),
+        'features': np.array(list(vocabularies['features']), dtype=str),
+        'types': np.array(list(vocabularies['types']), dtype=str),
+        'categories': np.array([text for _, text in vocabularies['categories']], dtype=str),
+        'category_kinds': np.array([CATEGORY_KINDS.index(kind) for kind, _ in vocabularies['categories']], dtype=np.int8)
+    })
+    return arrays
+
+
+def arrays_to_rules(arrays):
+    """
+    Rebuild archive entries from the columnar representation produced by :func:`rules_to_arrays`.
+
+    Args:
+        arrays (dict[str, np.ndarray]): The columnar representation of the rules.
+
+    Returns:
+        list[dict]: The archive entries.
+    """
+    features = arrays['features'].tolist()
+    types = arrays['types'].tolist()
+    categories = arrays['categories'].tolist()
+    if 'category_kinds' in arrays:
+        categories = [_decode_category(CATEGORY_KINDS[kind], text) for kind, text in zip(arrays['category_kinds'].tolist(), categories)]
+    feature_code = arrays['feature_code'].tolist()
+    type_code = arrays['type_code'].tolist()
+    category_code = arrays['category_code'].tolist()
+    border1 = arrays['border1'].tolist()
+    border2 = arrays['border2'].tolist()
+    offsets = arrays['rule_offsets'].tolist()
+    cut = arrays['cut'].tolist()
+    is_timestamp = str(arrays['window']) == 'timestamp'
+    metrics = {metric: arrays[metric].tolist() for metric in METRICS}
+    starts = arrays['start'].tolist()
+    ends = arrays['end'].tolist()
+
+    rules = []
+    for i in range(len(cut)):
+        conditions = [{
+            'feature': features[feature_code[j]],
+            'type': types[type_code[j]],
+            'border1': border1[j],
+            'border2': border2[j],
+            'category': categories[category_code[j]]
+        } for j in range(offsets[i], offsets[i + 1])]
+
+        entry = {
+            'full_rule': conditions,
+            'antecedent': conditions[:cut[i]],
+            'consequent': conditions[cut[i]:]
+        }
+        for metric in METRICS:
+            entry[metric] = metrics[metric][i]
+        entry['start'] = pd.Timestamp(starts[i]) if is_timestamp else starts[i]
+        entry['end'] = pd.Timestamp(ends[i]) if is_timestamp else ends[i]
+        rules.append(entry)
+
+    return rules
+
+
+def write_rules_npz(rules, file_path, compressed=True):
+    """
+    Save archived rules in a columnar binary NumPy (.npz) file.
+
+    Args:
+        rules (list[dict]): Archive entries as returned by :meth:`NiaARMTS.get_rule_archive`.
+        file_path (str): The path to save the file.
+        compressed (bool): Compress the arrays.
+    """
+    save = np.savez_compressed if compressed else np.savez
+    save(file_path, **rules_to_arrays(rules))
+
+
+def read_rules_npz(file_path, as_arrays=False):
+    """
+    Read archived rules from a file written by :func:`write_rules_npz`.
+
+    Args:
+        file_path (str): The path of the file.
+        as_arrays (bool): Return the columnar arrays instead of archive entries.
+
+    Returns:
+        list[dict] or dict[str, np.ndarray]: The archive entries or their columnar representation.
+    """
+    with np.load(file_path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    return arrays if as_arrays else arrays_to_rules(arrays)
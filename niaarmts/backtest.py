@@ -0,0 +1,160 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from niaarmts.metrics import score_rules
+from niaarmts.shared import share_dataframe, attach_dataframe, release_shared
+
+# Metrics along the last axis of the backtest tensor
+METRIC_NAMES = ('support', 'confidence', 'amplitude', 'antecedent_coverage', 'consequent_coverage')
+
+
+def rolling_origin(first_origin, last_time, horizon, step=None):
+    """
+    Build a rolling-origin schedule of test windows: train up to T, test on [T, T + horizon].
+
+    Args:
+        first_origin (int or datetime): The first origin T.
+        last_time (int or datetime): No test window extends beyond this point.
+        horizon (int or pd.Timedelta): Length of every test window (a Timedelta string such as '1D' is
+            accepted for timestamps).
+        step (int or pd.Timedelta): Distance between consecutive origins. Defaults to the horizon
+            (adjacent, non-overlapping test windows).
+
+    Returns:
+        list[tuple]: The (start, end) test windows, both bounds inclusive.
+    """
+    if isinstance(horizon, str):
+        horizon = pd.Timedelta(horizon)
+    if isinstance(step, str):
+        step = pd.Timedelta(step)
+    step = horizon if step is None else step
+    if isinstance(first_origin, str):
+        first_origin, last_time = pd.Timestamp(first_origin), pd.Timestamp(last_time)
+    if not step > step * 0:
+        raise ValueError("Step between origins must be positive.")
+
+    windows = []
+    origin = first_origin
+    while origin + horizon <= last_time:
+        windows.append((origin, origin + horizon))
+        origin = origin + step
+    return windows
+
+
+def _init_worker(spec, rules, use_interval):
+    global _worker_state
+    df, blocks = attach_dataframe(spec)
+    # The blocks are kept with the data frame for the lifetime of the worker
+    _worker_state = (df, blocks, rules, use_interval)
+
+
+def _score_chunk(windows):
+    df, _, rules, use_interval = _worker_state
+    return _tensor(score_rules(df, rules, windows=windows, use_interval=use_interval))
+
+
+def _tensor(scores):
+    metrics = np.stack([scores[name] for name in METRIC_NAMES], axis=-1).astype(np.float32)
+    # Empty test windows carry no evidence
+    rows = scores['rows'][:, 0] if scores['rows'].shape[1] > 0 else np.zeros(len(scores['rows']), dtype=np.int64)
+    metrics[rows == 0] = np.nan
+    return metrics, rows, scores['rule_count'].astype(np.int64)
+
+
+def backtest(df, archive, windows, use_interval=False, n_workers=None, chunk_size=None):
+    """
+    Re-score every archived rule on every out-of-sample test window.
+
+    The test windows are split into chunks scored in parallel worker processes with
+    :func:`niaarmts.metrics.score_rules`; the transactions are placed in shared memory once and the
+    rules are sent to every worker once.
+
+    Args:
+        df (pd.DataFrame): The transactions, including the test periods.
+        archive (list[dict] or RuleArchive): Archived rules with their in-sample 'support' and 'confidence'.
+        windows (list[tuple]): Test windows, e.g. from :func:`rolling_origin`.
+        use_interval (bool): Windows are interval ids instead of timestamps.
+        n_workers (int): Number of worker processes. Defaults to the number of CPUs; 1 runs serially.
+        chunk_size (int): Number of windows per task. Defaults to an even split over the workers.
+
+    Returns:
+        dict: 'metrics' is a float32 tensor of shape (windows, rules, metrics) with the metrics of
+        :data:`METRIC_NAMES` (NaN for empty test windows), 'metric_names' names its last axis, 'rows'
+        holds the number of transactions per window, 'rule_count' the matching transactions per window
+        and rule, and 'summary' the per-rule degradation summary (see :func:`degradation_summary`).
+    """
+    rules = list(archive)
+    windows = list(windows)
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(windows)))
+    chunk_size = chunk_size or max(1, -(-len(windows) // n_workers))
+    chunks = [windows[i:i + chunk_size] for i in range(0, len(windows), chunk_size)]
+
+    if n_workers == 1 or len(chunks) <= 1:
+        results = [_tensor(score_rules(df, rules, windows=chunk, use_interval=use_interval)) for chunk in chunks]
+    else:
+        spec, blocks = share_dataframe(df)
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(spec, rules, use_interval)) as executor:
+                results = list(executor.map(_score_chunk, chunks))
+        finally:
+            release_shared(blocks, unlink=True)
+
+    if results:
+        metrics = np.concatenate([result[0] for result in results])
+        rows = np.concatenate([result[1] for result in results])
+        rule_count = np.concatenate([result[2] for result in results])
+    else:
+        metrics = np.zeros((0, len(rules), len(METRIC_NAMES)), dtype=np.float32)
+        rows = np.zeros(0, dtype=np.int64)
+        rule_count = np.zeros((0, len(rules)), dtype=np.int64)
+
+    return {
+        'windows': windows,
+        'metrics': metrics,
+        'metric_names': METRIC_NAMES,
+        'rows': rows,
+        'rule_count': rule_count,
+        'summary': degradation_summary(rules, metrics, rule_count)
+    }
+
+
+def degradation_summary(rules, metrics, rule_count):
+    """
+    Summarize how the rules hold up out of sample.
+
+    Args:
+        rules (list[dict]): The archived rules with their in-sample 'support' and 'confidence'.
+        metrics (np.ndarray): Backtest tensor of shape (windows, rules, metrics).
+        rule_count (np.ndarray): Matching transactions per window and rule.
+
+    Returns:
+        dict: Per-rule arrays: 'support_mean', 'confidence_mean' and 'confidence_std' over the
+        non-empty test windows, 'confidence_min' (the worst window), 'support_drop' and 'confidence_drop'
+        (in-sample value minus out-of-sample mean) and 'hit_rate' (fraction of non-empty windows in which
+        the rule holds at least once).
+    """
+    support = metrics[..., METRIC_NAMES.index('support')].astype(np.float64)
+    confidence = metrics[..., METRIC_NAMES.index('confidence')].astype(np.float64)
+    observed = ~np.isnan(support)
+    n_observed = observed.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        support_mean = np.where(n_observed > 0, np.where(observed, support, 0.0).sum(axis=0) / n_observed, np.nan)
+        confidence_mean = np.where(n_observed > 0, np.where(observed, confidence, 0.0).sum(axis=0) / n_observed, np.nan)
+        deviations = np.where(observed, confidence - confidence_mean, 0.0)
+        confidence_std = np.where(n_observed > 0, np.sqrt((deviations ** 2).sum(axis=0) / n_observed), np.nan)
+        confidence_min = np.where(n_observed > 0, np.where(observed, confidence, np.inf).min(axis=0, initial=np.inf), np.nan)
+        hit_rate = np.where(n_observed > 0, ((rule_count > 0) & observed).sum(axis=0) / n_observed, np.nan)
+
+    in_support = np.array([rule['support'] for rule in rules], dtype=np.float64)
+    in_confidence = np.array([rule['confidence'] for rule in rules], dtype=np.float64)
+    return {
+        'support_mean': support_mean,
+        'confidence_mean': confidence_mean,
+        'confidence_std': confidence_std,
+        'confidence_min': confidence_min,
+        'support_drop': in_support - support_mean,
+        'confidence_drop': in_confidence - confidence_mean,
+        'hit_rate': hit_rate
+    }
@@ -0,0 +1,221 @@
+import numpy as np
+
+# Number of set bits of every byte value
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def pack_mask(mask):
+    """
+    Pack a boolean mask into a bitset (eight rows per byte, the first row in the most significant bit).
+    """
+    return np.packbits(mask)
+
+
+def unpack_bits(bits, lo, hi):
+    """
+    Unpack the rows lo, ..., hi - 1 of a window bitset returned by :meth:`BitmapIndex.condition_bits`.
+
+    Returns:
+        np.ndarray: Boolean mask over the rows of the window.
+    """
+    start = lo & 7
+    return np.unpackbits(bits)[start:start + hi - lo].astype(bool)
+
+
+def trim_bits(bits, lo, hi):
+    """
+    Clear the bits of rows outside lo, ..., hi - 1 in the first and last byte of a window bitset (in place).
+
+    Returns:
+        np.ndarray: The trimmed bitset.
+    """
+    if len(bits) == 0:
+        return bits
+    bits[0] &= 0xFF >> (lo & 7)
+    if hi & 7:
+        bits[-1] &= (0xFF << (8 - (hi & 7))) & 0xFF
+    return bits
+
+
+def count_bits(bits):
+    """
+    Count the set bits of a bitset.
+    """
+    return int(POPCOUNT[bits].sum())
+
+
+class BitmapIndex:
+    def __init__(self, df, features, n_bins=64):
+        """
+        Bitmap index for evaluating rule conditions on packed bitsets instead of full column comparisons.
+
+        Every numerical feature is split into (at most) `n_bins` quantile buckets. The index keeps the
+        value range of every bucket, its rows and a range-encoded bitset: bitset `k` marks the rows of
+        buckets 0, ..., k - 1, so the rows of any run of whole buckets are `bitset[b] & ~bitset[a]`. A
+        numerical condition is this run of buckets inside its borders plus an exact comparison of the
+        rows of the (at most two) buckets that straddle a border. Categorical features keep one bitset
+        per category. Rows with missing values belong to no bucket and match no condition.
+
+        Bitsets of a window cover only the bytes of its rows, so conjunctions of conditions are bitwise
+        ANDs over 1/8 of the memory of boolean masks (1/64 of the float columns).
+
+        Args:
+            df (pd.DataFrame): The transactions, in the row order used for the windows.
+            features (dict): A dictionary of feature metadata (see :meth:`Dataset.get_all_features_with_metadata`).
+            n_bins (int): Maximum number of buckets per numerical feature.
+        """
+        if n_bins < 1:
+            raise ValueError("Number of bins must be positive.")
+
+        self.n_rows = len(df)
+        self.n_bins = n_bins
+        self.numerical = {}
+        self.categorical = {}
+
+        for feature, meta in features.items():
+            if meta['type'] == 'Numerical':
+                self.numerical[feature] = self._index_numerical(df[feature].to_numpy(dtype=np.float64))
+            elif meta['type'] == 'Categorical':
+                values = df[feature]
+                self.categorical[feature] = {category: pack_mask((values == category).to_numpy()) for category in values.dropna().unique()}
+
+    def _index_numerical(self, values):
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return None
+
+        edges = np.unique(np.quantile(values[valid], np.linspace(0.0, 1.0, self.n_bins + 1)))
+        bins = np.full(len(values), -1, dtype=np.int64)
+        bins[valid] = np.clip(np.searchsorted(edges, values[valid], side='right') - 1, 0, max(len(edges) - 2, 0))
+
+        # Rows grouped by bucket; the stable sort keeps the rows of every bucket in ascending order
+        order = np.argsort(bins, kind='stable')[np.count_nonzero(~valid):]
+        sorted_bins = bins[order]
+        used, bucket_offsets = np.unique(sorted_bins, return_index=True)
+        bucket_offsets = np.append(bucket_offsets, len(order))
+
+        lower = np.minimum.reduceat(values[order], bucket_offsets[:-1])
+        upper = np.maximum.reduceat(values[order], bucket_offsets[:-1])
+
+        # Range encoding: cumulative[k] marks the rows of the first k buckets
+        position = np.full(len(values), len(used), dtype=np.int64)
+        position[order] = np.repeat(np.arange(len(used)), np.diff(bucket_offsets))
+        cumulative = np.stack([pack_mask(position < k) for k in range(len(used) + 1)])
+
+        return {
+            'values': values,
+            'lower': lower,
+            'upper': upper,
+            'rows': order,
+            'offsets': bucket_offsets,
+            'cumulative': cumulative
+        }
+
+    _trim = staticmethod(trim_bits)
+
+    def window_bits(self, lo, hi):
+        """
+        Bitset of all rows of the window lo, ..., hi - 1.
+        """
+        bits = np.full((hi + 7) // 8 - lo // 8 if hi > lo else 0, 0xFF, dtype=np.uint8)
+        return self._trim(bits, lo, hi)
+
+    def condition_bits(self, condition, lo, hi):
+        """
+        Evaluate a single rule condition on the rows lo, ..., hi - 1.
+
+        Args:
+            condition (dict): A dictionary defining the condition (as built by :func:`niaarmts.build_rule`).
+            lo (int): First row of the window.
+            hi (int): Row after the last row of the window.
+
+        Returns:
+            np.ndarray: Bitset (uint8) covering bytes lo // 8, ..., (hi - 1) // 8; bits of rows outside
+            the window are cleared. Conditions of other types than 'Numerical' and 'Categorical' are
+            satisfied by every row.
+        """
+        if hi <= lo:
+            return np.zeros(0, dtype=np.uint8)
+        first, last = lo // 8, (hi + 7) // 8
+
+        if condition['type'] == 'Categorical':
+            bits = self.categorical[condition['feature']].get(condition['category'])
+            if bits is None:
+                return np.zeros(last - first, dtype=np.uint8)
+            return self._trim(bits[first:last].copy(), lo, hi)
+
+        if condition['type'] != 'Numerical':
+            return self.window_bits(lo, hi)
+
+        index = self.numerical[condition['feature']]
+        if index is None:
+            return np.zeros(last - first, dtype=np.uint8)
+
+        border1, border2 = condition['border1'], condition['border2']
+        lower, upper = index['lower'], index['upper']
+
+        # Buckets overlapping the borders; all but the first and the last one are inside the borders
+        a = int(np.searchsorted(upper, border1, side='left'))
+        b = int(np.searchsorted(lower, border2, side='right'))
+        if b <= a:
+            return np.zeros(last - first, dtype=np.uint8)
+
+        edges = []
+        if lower[a] < border1:
+            edges.append(a)
+            a += 1
+        if b > a and upper[b - 1] > border2:
+            edges.append(b - 1)
+            b -= 1
+
+        cumulative = index['cumulative']
+        if b > a:
+            bits = cumulative[b, first:last] & ~cumulative[a, first:last]
+        else:
+            bits = np.zeros(last - first, dtype=np.uint8)
+
+        # Exact comparisons for the rows of the edge buckets inside the window
+        for bucket in edges:
+            rows = index['rows'][index['offsets'][bucket]:index['offsets'][bucket + 1]]
+            rows = rows[np.searchsorted(rows, lo, side='left'):np.searchsorted(rows, hi, side='left')]
+            values = index['values'][rows]
+            rows = rows[(values >= border1) & (values <= border2)] - 8 * first
+            if len(rows) > 0:
+                # Rows are sorted, so the bits of every byte are combined with one segmented reduction
+                positions = rows >> 3
+                starts = np.flatnonzero(np.concatenate(([True], positions[1:] != positions[:-1])))
+                bits[positions[starts]] |= np.bitwise_or.reduceat((0x80 >> (rows & 7)).astype(np.uint8), starts)
+
+        return self._trim(bits, lo, hi)
+
+    def conditions_bits(self, conditions, lo, hi, bits=None):
+        """
+        Evaluate a conjunction of rule conditions on the rows lo, ..., hi - 1.
+
+        Args:
+            conditions (list): A list of dictionaries defining the conditions.
+            lo (int): First row of the window.
+            hi (int): Row after the last row of the window.
+            bits (np.ndarray): Optional window bitset of already selected rows to start from.
+
+        Returns:
+            np.ndarray: Window bitset of the rows satisfying all conditions. The evaluation stops as soon
+            as no row is left.
+        """
+        bits = self.window_bits(lo, hi) if bits is None else bits.copy()
+        for condition in conditions:
+            if not bits.any():
+                break
+            bits &= self.condition_bits(condition, lo, hi)
+        return bits
+
+    @property
+    def nbytes(self):
+        """
+        Number of bytes used by the bitsets and bucket row lists.
+        """
+        total = sum(bits.nbytes for categories in self.categorical.values() for bits in categories.values())
+        for index in self.numerical.values():
+            if index is not None:
+                total += index['cumulative'].nbytes + index['rows'].nbytes
+        return total
@@ -0,0 +1,151 @@
+import os
+import pickle
+import tempfile
+import time
+import zlib
+
+CHECKPOINT_VERSION = 2
+
+
+def save_checkpoint(file_path, problem, task=None, algorithm=None, population=None):
+    """
+    Atomically write the state of a mining run to a compressed binary checkpoint file.
+
+    The checkpoint is written to a temporary file in the same directory and moved over the previous
+    checkpoint, so an interrupted write never leaves a corrupted file behind.
+
+    Args:
+        file_path (str): The path of the checkpoint file.
+        problem (NiaARMTS): The problem whose run state (see :meth:`NiaARMTS.get_run_state`) is saved.
+        task (Task): Optional NiaPy task whose iteration and evaluation counters are saved.
+        algorithm (Algorithm): Optional NiaPy algorithm whose random generator state is saved.
+        population (tuple): Optional population state (population, population fitness, best solution,
+            best fitness, additional algorithm parameters) as passed between algorithm iterations.
+    """
+    state = {
+        'version': CHECKPOINT_VERSION,
+        'problem': problem.get_run_state(),
+        'task': None,
+        'rng': None,
+        'population': population
+    }
+
+    if task is not None:
+        state['task'] = {
+            'iters': task.iters,
+            'evals': task.evals,
+            'x_f': task.x_f,
+            'n_evals': task.n_evals,
+            'fitness_evals': task.fitness_evals,
+            'fitness_iters': task.fitness_iters
+        }
+
+    if algorithm is not None:
+        state['rng'] = algorithm.rng.bit_generator.state
+
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_checkpoint(file_path):
+    """
+    Read a checkpoint written by :func:`save_checkpoint`.
+
+    Args:
+        file_path (str): The path of the checkpoint file.
+
+    Returns:
+        dict: The saved state.
+
+    Raises:
+        ValueError: The checkpoint was written by an incompatible version.
+    """
+    with open(file_path, 'rb') as f:
+        state = pickle.loads(zlib.decompress(f.read()))
+
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {state.get('version')}.")
+
+    return state
+
+
+def restore_checkpoint(state, problem, task=None, algorithm=None):
+    """
+    Restore a run from a loaded checkpoint. Archived rules are restored as they are, without re-evaluation.
+
+    Args:
+        state (dict): The state returned by :func:`load_checkpoint`.
+        problem (NiaARMTS): The problem to restore the run state into (see :meth:`NiaARMTS.set_run_state`).
+        task (Task): Optional NiaPy task to restore the counters into.
+        algorithm (Algorithm): Optional NiaPy algorithm to restore the random generator state into.
+
+    Returns:
+        tuple: The saved population state, or None if the checkpoint holds none.
+    """
+    problem.set_run_state(state['problem'])
+
+    if task is not None and state['task'] is not None:
+        for key, value in state['task'].items():
+            setattr(task, key, value)
+
+    if algorithm is not None and state['rng'] is not None:
+        algorithm.rng.bit_generator.state = state['rng']
+
+    return state['population']
+
+
+def run_with_checkpoints(algorithm, task, file_path, interval=300.0, resume=True):
+    """
+    Run a NiaPy algorithm on a NiaARMTS task and periodically checkpoint the run.
+
+    The loop is equivalent to `algorithm.run(task)`; additionally, the state is written to `file_path`
+    whenever `interval` seconds passed since the last checkpoint and once more at the end of the run.
+    When `resume` is set and the checkpoint file exists, the run continues from the saved state.
+
+    Args:
+        algorithm (Algorithm): NiaPy algorithm.
+        task (Task): NiaPy task whose problem is a :class:`NiaARMTS` instance.
+        file_path (str): The path of the checkpoint file.
+        interval (float): Minimum number of seconds between two checkpoints.
+        resume (bool): Continue from an existing checkpoint.
+
+    Returns:
+        tuple: The best solution and its fitness, as returned by `algorithm.run`.
+    """
+    problem = task.problem
+    population = None
+    if resume and os.path.exists(file_path):
+        population = restore_checkpoint(load_checkpoint(file_path), problem, task, algorithm)
+
+    algorithm.callbacks.before_run()
+    if population is None:
+        pop, fpop, params = algorithm.init_population(task)
+        xb, fxb = algorithm.get_best(pop, fpop)
+    else:
+        pop, fpop, xb, fxb, params = population
+
+    last_checkpoint = time.monotonic()
+    while not task.stopping_condition():
+        algorithm.callbacks.before_iteration(pop, fpop, xb, fxb, **params)
+        pop, fpop, xb, fxb, params = algorithm.run_iteration(task, pop, fpop, xb, fxb, **params)
+        algorithm.callbacks.after_iteration(pop, fpop, xb, fxb, **params)
+        task.next_iter()
+
+        if time.monotonic() - last_checkpoint >= interval:
+            save_checkpoint(file_path, problem, task, algorithm, (pop, fpop, xb, fxb, params))
+            last_checkpoint = time.monotonic()
+    algorithm.callbacks.after_run()
+
+    save_checkpoint(file_path, problem, task, algorithm, (pop, fpop, xb, fxb, params))
+    return xb, fxb * task.optimization_type.value
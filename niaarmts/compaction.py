@@ -0,0 +1,144 @@
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from niaarmts.archive import RuleArchive
+
+# Rules with more conditions look up superset candidates by scanning the signatures instead of enumerating subsets
+MAX_ENUMERATED_CONDITIONS = 12
+
+
+def _condition_key(condition):
+    if condition['type'] == 'Categorical':
+        return condition['feature'], 'Categorical', condition['category']
+    return condition['feature'], condition['type']
+
+
+def _signature(entry):
+    return tuple(sorted(map(_condition_key, entry['antecedent']))), tuple(sorted(map(_condition_key, entry['consequent'])))
+
+
+def _sub_signatures(signature):
+    # Proper sub-signatures with non-empty sides, more general (shorter) ones first
+    antecedent, consequent = signature
+    subsets = []
+    for i in range(1, len(antecedent) + 1):
+        for j in range(1, len(consequent) + 1):
+            if i == len(antecedent) and j == len(consequent):
+                continue
+            subsets.append((i + j, i, j))
+    subsets.sort()
+    for _, i, j in subsets:
+        for sub_antecedent in combinations(antecedent, i):
+            for sub_consequent in combinations(consequent, j):
+                yield sub_antecedent, sub_consequent
+
+
+def _is_sub_signature(general, specific):
+    return set(general[0]) <= set(specific[0]) and set(general[1]) <= set(specific[1]) and general != specific
+
+
+def compact_archive(archive, features=None, tolerance=0.0, border_tolerance=0.0, window_tolerance=None):
+    """
+    Collapse near-redundant rules of an archive.
+
+    Rules are grouped by their signature: the features (and categories of categorical conditions) on
+    each side. A rule is removed as
+
+    * 'near-duplicate' if a fitter rule with the same signature has all numerical borders within
+      `border_tolerance`;
+    * 'subsumed' if a rule with a sub-signature on both sides (a more general rule whose conditions
+      are a subset of its conditions, up to `border_tolerance`) has support and confidence within
+      `tolerance` and a fitness at most `tolerance` lower.
+
+    Candidates are looked up in the signature index (by enumerating the sub-signatures of a rule), so
+    rules are only compared with rules on the same features. Rules are processed from general to
+    specific and, within a length, by descending fitness, so the kept representative of a group is
+    its most general and fittest rule.
+
+    Args:
+        archive (list[dict] or RuleArchive): Archive entries.
+        features (dict): Optional feature metadata (see :meth:`Dataset.get_all_features_with_metadata`);
+            with 'min' and 'max', `border_tolerance` is a fraction of the feature range.
+        tolerance (float): Maximum difference of support, confidence and fitness for subsumption.
+        border_tolerance (float): Maximum difference of the borders of matching numerical conditions.
+        window_tolerance (int or pd.Timedelta): Maximum difference of the window bounds of collapsed
+            rules. None ignores the windows, like the duplicate check of :class:`niaarmts.NiaARMTS`.
+
+    Returns:
+        dict: 'rules' holds the compacted archive (of the same type as the input, in the input order)
+        and 'removed' maps the positions of removed rules to the position of the rule representing
+        them and the reason of their removal.
+    """
+    entries = list(archive)
+    n_rules = len(entries)
+    signatures = [_signature(entry) for entry in entries]
+    interval = getattr(archive, 'interval', None)
+    if interval is None:
+        interval = n_rules > 0 and not isinstance(entries[0]['start'], (pd.Timestamp, np.datetime64))
+
+    scales = {}
+    for name, meta in (features or {}).items():
+        if meta.get('type') == 'Numerical' and meta.get('min') is not None and meta.get('max') is not None:
+            scales[name] = float(meta['max'] - meta['min']) or 1.0
+
+    if window_tolerance is not None:
+        encode = (lambda value: int(value)) if interval else (lambda value: pd.Timestamp(value).value)
+        window_limit = int(window_tolerance) if interval else pd.Timedelta(window_tolerance).value
+        windows = np.array([(encode(entry['start']), encode(entry['end'])) for entry in entries], dtype=np.int64).reshape(-1, 2)
+
+    def borders(entry):
+        return {(_condition_key(condition), side): (condition['border1'], condition['border2'])
+                for side in ('antecedent', 'consequent') for condition in entry[side] if condition['type'] == 'Numerical'}
+
+    cached_borders = {}
+
+    def matches(general, specific):
+        # Every numerical condition of the general rule is close to the same condition of the specific rule
+        if window_tolerance is not None and np.abs(windows[general] - windows[specific]).max() > window_limit:
+            return False
+        for index in (general, specific):
+            if index not in cached_borders:
+                cached_borders[index] = borders(entries[index])
+        specific_borders = cached_borders[specific]
+        for key, (border1, border2) in cached_borders[general].items():
+            other1, other2 = specific_borders[key]
+            limit = border_tolerance * scales.get(key[0][0], 1.0)
+            if abs(border1 - other1) > limit or abs(border2 - other2) > limit:
+                return False
+        return True
+
+    def similar_metrics(general, specific):
+        general, specific = entries[general], entries[specific]
+        return (abs(general['support'] - specific['support']) <= tolerance
+                and abs(general['confidence'] - specific['confidence']) <= tolerance
+                and general['fitness'] >= specific['fitness'] - tolerance)
+
+    order = sorted(range(n_rules), key=lambda i: (len(signatures[i][0]) + len(signatures[i][1]), -entries[i]['fitness'], i))
+    kept = {}
+    removed = {}
+    for i in order:
+        signature = signatures[i]
+        representative = next((j for j in kept.get(signature, []) if matches(j, i)), None)
+        if representative is not None:
+            removed[i] = (representative, 'near-duplicate')
+            continue
+
+        if len(signature[0]) + len(signature[1]) <= MAX_ENUMERATED_CONDITIONS:
+            candidates = (sub for sub in _sub_signatures(signature) if sub in kept)
+        else:
+            candidates = (sub for sub in list(kept) if _is_sub_signature(sub, signature))
+        for sub in candidates:
+            representative = next((j for j in kept[sub] if similar_metrics(j, i) and matches(j, i)), None)
+            if representative is not None:
+                removed[i] = (representative, 'subsumed')
+                break
+        else:
+            kept.setdefault(signature, []).append(i)
+
+    mask = np.ones(n_rules, dtype=bool)
+    mask[list(removed)] = False
+    if isinstance(archive, RuleArchive):
+        rules = archive.filter(mask)
+    else:
+        rules = [entry for entry, keep in zip(entries, mask) if keep]
+    return {'rules': rules, 'removed': removed}
@@ -1,6 +1,209 @@
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
 from niaarmts.feature import Feature
+from niaarmts.bitmap import BitmapIndex
+
+def problem_dimension(features, column_types, interval_range=False):
+    """
+    Calculate the dimension of the problem for feature metadata over transactions with the given column types.
+
+    - Adds 4 for each numerical attribute (lower and upper bound, threshold and permutation).
+    - Adds 3 for each categorical attribute (category, threshold and permutation).
+    - The time columns ('timestamp' and 'interval') are counted by their type as well.
+    - Adds 1 if an interval (datetime) attribute is present (2 if interval ranges are mined).
+    - Adds 2 if time series data (timestamp or another datetime column) is present.
+    - Adds 1 for cut point value.
+
+    :param features: Feature metadata without the time columns (see :meth:`Dataset.get_all_features_with_metadata`).
+    :param column_types: Type ('Numerical', 'Categorical', 'Datetime' or 'Unknown') of every column of the transactions.
+    :param interval_range: Mine rules over ranges of intervals instead of single intervals.
+    :return: The calculated dimension of the problem.
+    """
+    slots = {'Numerical': 4, 'Categorical': 3}
+    dimension = sum(slots.get(meta['type'], 0) for meta in features.values())
+    dimension += sum(slots.get(column_types[column], 0) for column in ('timestamp', 'interval') if column in column_types)
+
+    # Add to dimension if interval (datetime) attribute is present
+    if 'interval' in column_types:
+        dimension += 2 if interval_range else 1
+
+    # Add to dimension if time series data (timestamp) is present (assuming it's datetime feature)
+    if 'timestamp' in column_types or 'Datetime' in column_types.values():
+        dimension += 2
+
+    # cut point
+    return dimension + 1
+
+class WindowIndex:
+    def __init__(self, values, tz=None):
+        """
+        Row offsets of time windows over a sorted time column ('timestamp' or 'interval').
+
+        A window [start, end] (both inclusive) maps to a contiguous block of rows, which is found with a
+        binary search. Integer interval ids are additionally indexed densely, so a window of interval
+        ids maps to its rows in constant time.
+
+        :param values: Values of the time column, sorted in non-decreasing order.
+        :param tz: Time zone of timezone-aware timestamps, whose values are then given as int64 UTC
+            nanoseconds.
+        """
+        self.values = values
+        self.tz = tz
+        self.min = values[0] if len(values) > 0 else None
+        self.max = values[-1] if len(values) > 0 else None
+        self.offsets = None
+
+        if tz is None and len(values) > 0 and np.issubdtype(values.dtype, np.integer) and self.max - self.min <= 10 * len(values):
+            # offsets[k] is the first row whose interval id is at least min + k
+            self.offsets = np.searchsorted(values, np.arange(self.min, self.max + 2), side='left')
+
+    @classmethod
+    def from_dataframe(cls, df, use_interval=False):
+        """
+        Build the index over the 'interval' or 'timestamp' column of the transactions.
+
+        :param df: The dataset containing the transactions.
+        :param use_interval: Index the 'interval' column instead of the 'timestamp' column.
+        :return: The index, or None if the column is missing, not sorted or of another type than a
+            numerical or datetime one.
+        """
+        col = 'interval' if use_interval else 'timestamp'
+        if col not in df.columns:
+            return None
+
+        series = df[col]
+        if not (pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_datetime64_any_dtype(series.dtype)):
+            return None
+        if series.isna().any() or not series.is_monotonic_increasing:
+            return None
+
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            # Timezone-aware timestamps are searched by their int64 (UTC nanosecond) view
+            return cls(series.array.asi8, tz=series.dtype.tz)
+        return cls(series.to_numpy())
+
+    def rows(self, start, end):
+        """
+        Find the rows of a window.
+
+        :param start: The start of the window (inclusive).
+        :param end: The end of the window (inclusive).
+        :return: A tuple (lo, hi) such that rows lo, ..., hi - 1 belong to the window.
+        """
+        if self.offsets is not None:
+            last = len(self.offsets) - 1
+            lo = self.offsets[int(min(max(np.ceil(start) - self.min, 0), last))]
+            hi = self.offsets[int(min(max(np.floor(end) - self.min + 1, 0), last))]
+        else:
+            if self.tz is not None:
+                start = self._utc_value(start)
+                end = self._utc_value(end)
+            elif np.issubdtype(self.values.dtype, np.datetime64):
+                start = pd.Timestamp(start).to_datetime64()
+                end = pd.Timestamp(end).to_datetime64()
+            lo = np.searchsorted(self.values, start, side='left')
+            hi = np.searchsorted(self.values, end, side='right')
+
+        return int(lo), int(max(lo, hi))
+
+    def _utc_value(self, value):
+        value = pd.Timestamp(value)
+        return (value.tz_localize(self.tz) if value.tz is None else value).value
+
+
+@dataclass(frozen=True)
+class DatasetStatistics:
+    """
+    Immutable snapshot of the statistics of a dataset, computed once when the data is loaded.
+
+    :param n_rows: Number of transactions.
+    :param columns: Names of all columns.
+    :param summary: Read-only per-column statistics (as in :meth:`Feature.get_feature_summary`, with
+        category vocabularies as tuples).
+    :param numerical: Names of the numerical columns.
+    :param categorical: Names of the categorical columns.
+    :param datetime: Names of the datetime columns.
+    :param time_bounds: Read-only (min, max) bounds of the 'timestamp' and 'interval' columns.
+    """
+    n_rows: int
+    columns: tuple
+    summary: Mapping
+    numerical: tuple
+    categorical: tuple
+    datetime: tuple
+    time_bounds: Mapping
+
+    @classmethod
+    def from_dataframe(cls, df, feature_analysis=None):
+        """
+        Compute the snapshot of a data frame.
+
+        :param df: The dataset containing the transactions.
+        :param feature_analysis: Optional Feature instance of the data frame to take the statistics from.
+        :return: The statistics snapshot.
+        """
+        summary = (feature_analysis or Feature(df)).get_feature_summary()
+
+        frozen = {}
+        for column, stats in summary.items():
+            stats = dict(stats)
+            if 'classes' in stats:
+                stats['classes'] = tuple(stats['classes'])
+            frozen[column] = MappingProxyType(stats)
+
+        time_bounds = {}
+        for column in ('timestamp', 'interval'):
+            if column in frozen and 'min' in frozen[column]:
+                time_bounds[column] = (frozen[column]['min'], frozen[column]['max'])
+
+        return cls(
+            n_rows=len(df),
+            columns=tuple(df.columns),
+            summary=MappingProxyType(frozen),
+            numerical=tuple(column for column, stats in frozen.items() if stats['type'] == 'Numerical'),
+            categorical=tuple(column for column, stats in frozen.items() if stats['type'] == 'Categorical'),
+            datetime=tuple(column for column, stats in frozen.items() if stats['type'] == 'Datetime'),
+            time_bounds=MappingProxyType(time_bounds)
+        )
+
+    def get_time_bounds(self, use_interval=False):
+        """
+        Get the bounds of the time column.
+
+        :param use_interval: Bounds of the 'interval' column instead of the 'timestamp' column.
+        :return: A tuple (min, max).
+        """
+        col = 'interval' if use_interval else 'timestamp'
+        if col not in self.time_bounds:
+            raise KeyError(f"Column '{col}' is required in the dataframe to compute TSM.")
+        return self.time_bounds[col]
+
+    def feature_metadata(self):
+        """
+        Get the metadata of all features except the time columns, in the format of
+        :meth:`Dataset.get_all_features_with_metadata`.
+
+        :return: A new dictionary of feature metadata.
+        """
+        features_metadata = {}
+        for idx, column in enumerate(self.columns):
+            if column == 'timestamp' or column == 'interval':
+                continue
+
+            stats = self.summary[column]
+            feature_type = stats['type'] if stats['type'] in ('Numerical', 'Categorical') else 'Unknown'
+            features_metadata[column] = {
+                'type': feature_type,
+                'min': stats['min'] if stats['type'] == 'Numerical' else None,
+                'max': stats['max'] if stats['type'] == 'Numerical' else None,
+                'categories': np.array(stats['classes'], dtype=object) if feature_type == 'Categorical' else None,
+                'position': idx
+            }
+        return features_metadata
+
 
 class Dataset:
     def __init__(self):
@@ -10,15 +213,40 @@ class Dataset:
         self.data = pd.DataFrame()
         self.timestamp_col = None
         self.feature_analysis = None
-
-    def load_data_from_csv(self, file_path: str, timestamp_col: str = None):
+        self.statistics = None
+        self._statistics_data = None
+        self.window_indexes = {}
+        self.bitmap_indexes = {}
+        self.entity_col = None
+        self.entity_ranges = {}
+
+    def load_data_from_csv(self, file_path: str, timestamp_col: str = None, entity_col: str = None):
         """
         Load the dataset from a CSV file.
 
+        Interval data (an 'interval' column) that is not sorted by interval is sorted on load (stably), so
+        :meth:`get_all_transactions` returns the rows in interval order. The feature metadata, including
+        the order of the category vocabularies, is computed from the rows in file order.
+
         :param file_path: Path to the CSV file.
         :param timestamp_col: Optional, the name of the column containing timestamps (if applicable).
+        :param entity_col: Optional, the name of the column identifying the entity (e.g. the device) of
+            every transaction, for tables holding the series of many entities.
+        """
+        self.load_data_from_dataframe(pd.read_csv(file_path), timestamp_col, entity_col)
+
+    def load_data_from_dataframe(self, data: pd.DataFrame, timestamp_col: str = None, entity_col: str = None):
         """
-        self.data = pd.read_csv(file_path)
+        Load the dataset from a data frame. Unsorted interval data is sorted as in :meth:`load_data_from_csv`.
+
+        :param data: The transactions.
+        :param timestamp_col: Optional, the name of the column containing timestamps (if applicable).
+        :param entity_col: Optional, the name of the column identifying the entity of every transaction.
+            The rows are then grouped by entity (and sorted by time within every entity), so the
+            transactions of an entity form a contiguous block of rows (see :meth:`get_entity_ranges`).
+        """
+        # A shallow copy, so converting columns does not modify the caller's data frame
+        self.data = data.copy(deep=False)
 
         if timestamp_col:
             self.timestamp_col = timestamp_col
@@ -28,8 +256,97 @@ class Dataset:
             except (KeyError, ValueError, TypeError):
                 pass
 
-        # Initialize FeatureAnalysis after data loading
+        # The feature statistics are taken in the row order of the input, so the category vocabularies
+        # (and the rules decoded from a solution) do not depend on the reordering below
         self.feature_analysis = Feature(self.data)
+        statistics = DatasetStatistics.from_dataframe(self.data, self.feature_analysis)
+
+        self.entity_col = entity_col
+        self.entity_ranges = {}
+        if entity_col:
+            self._group_entities(timestamp_col)
+        # Interval data is kept sorted by interval, so every interval range is a contiguous block of rows
+        elif 'interval' in self.data.columns and not self.data['interval'].is_monotonic_increasing:
+            self.data = self.data.sort_values('interval', kind='stable').reset_index(drop=True)
+
+        self.window_indexes = {}
+        self.bitmap_indexes = {}
+        self.statistics = statistics
+        self._statistics_data = self.data
+
+    def _group_entities(self, timestamp_col):
+        if self.entity_col not in self.data.columns:
+            raise KeyError(f"Entity column '{self.entity_col}' not found in the dataset.")
+        if self.data[self.entity_col].isna().any():
+            raise ValueError("Entity column must not contain missing values.")
+
+        time_col = 'interval' if 'interval' in self.data.columns else timestamp_col
+        by = [self.entity_col] + ([time_col] if time_col in self.data.columns else [])
+        self.data = self.data.sort_values(by, kind='stable').reset_index(drop=True)
+
+        # Row ranges of the entities, from the positions where the entity id changes
+        values = self.data[self.entity_col].to_numpy()
+        starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1)) if len(values) > 0 else np.zeros(0, dtype=np.int64)
+        ends = np.append(starts[1:], len(values))
+        self.entity_ranges = {entity: (int(lo), int(hi)) for entity, lo, hi in zip(values[starts].tolist(), starts, ends)}
+
+    def get_entities(self):
+        """
+        Get the entity ids of a dataset loaded with an entity column.
+
+        :return: A list of entity ids, in row order.
+        """
+        return list(self.entity_ranges)
+
+    def get_entity_ranges(self):
+        """
+        Get the row ranges of the entities.
+
+        :return: A dictionary mapping every entity id to (lo, hi), such that rows lo, ..., hi - 1 hold
+            its transactions.
+        """
+        if not self.entity_col:
+            raise ValueError("Dataset was loaded without an entity column.")
+        return dict(self.entity_ranges)
+
+    def get_entity_transactions(self, entity):
+        """
+        Get the transactions of one entity.
+
+        :param entity: The entity id.
+        :return: A DataFrame with the transactions of the entity, indexed from 0.
+        """
+        lo, hi = self.get_entity_ranges()[entity]
+        return self.data.iloc[lo:hi].reset_index(drop=True)
+
+    def get_entity_dataset(self, entity):
+        """
+        Get the dataset of one entity, with its own statistics and without the entity column.
+
+        :param entity: The entity id.
+        :return: A new Dataset holding the transactions of the entity.
+        """
+        dataset = Dataset()
+        dataset.load_data_from_dataframe(self.get_entity_transactions(entity).drop(columns=[self.entity_col]), self.timestamp_col)
+        return dataset
+
+    def get_statistics(self):
+        """
+        Get the immutable statistics snapshot of the loaded data.
+
+        The snapshot is computed at load time; if the data was replaced afterwards, it is computed again.
+
+        :return: A DatasetStatistics instance.
+        """
+        if self.feature_analysis is None:
+            raise ValueError("Data has not been loaded yet.")
+
+        if self.statistics is None or self._statistics_data is not self.data:
+            if self.feature_analysis.data is not self.data:
+                self.feature_analysis = Feature(self.data)
+            self.statistics = DatasetStatistics.from_dataframe(self.data, self.feature_analysis)
+            self._statistics_data = self.data
+        return self.statistics
 
     def get_feature_summary(self):
         """
@@ -37,9 +354,7 @@ class Dataset:
 
         :return: A dictionary with feature summaries.
         """
-        if self.feature_analysis is None:
-            raise ValueError("Data has not been loaded yet.")
-        return self.feature_analysis.get_feature_summary()
+        return {column: self._unfreeze(stats) for column, stats in self.get_statistics().summary.items()}
 
     def get_numerical_features(self):
         """
@@ -47,9 +362,7 @@ class Dataset:
 
         :return: A list of numerical feature names.
         """
-        if self.feature_analysis is None:
-            raise ValueError("Data has not been loaded yet.")
-        return self.feature_analysis.get_numerical_features()
+        return list(self.get_statistics().numerical)
 
     def get_categorical_features(self):
         """
@@ -57,9 +370,7 @@ class Dataset:
 
         :return: A list of categorical feature names.
         """
-        if self.feature_analysis is None:
-            raise ValueError("Data has not been loaded yet.")
-        return self.feature_analysis.get_categorical_features()
+        return list(self.get_statistics().categorical)
 
     def get_datetime_features(self):
         """
@@ -67,9 +378,7 @@ class Dataset:
 
         :return: A list of datetime feature names.
         """
-        if self.feature_analysis is None:
-            raise ValueError("Data has not been loaded yet.")
-        return self.feature_analysis.get_datetime_features()
+        return list(self.get_statistics().datetime)
 
     def get_feature_stats(self, feature_name: str):
         """
@@ -78,75 +387,75 @@ class Dataset:
         :param feature_name: The name of the feature to analyze.
         :return: A dictionary with statistics about the feature.
         """
-        if self.feature_analysis is None:
+        summary = self.get_statistics().summary
+        if feature_name not in summary:
+            raise ValueError(f"Feature '{feature_name}' not found in the dataset.")
+        return self._unfreeze(summary[feature_name])
+
+    @staticmethod
+    def _unfreeze(stats):
+        stats = dict(stats)
+        if 'classes' in stats:
+            stats['classes'] = np.array(stats['classes'], dtype=object)
+        return stats
+
+    def get_window_index(self, use_interval=False):
+        """
+        Get the row offset index of the 'interval' (or 'timestamp') column, built once and cached.
+
+        :param use_interval: Index the 'interval' column instead of the 'timestamp' column.
+        :return: A WindowIndex, or None if the column is missing or not sorted.
+        """
+        if self.data.empty:
+            raise ValueError("Data has not been loaded yet.")
+
+        if use_interval not in self.window_indexes:
+            self.window_indexes[use_interval] = WindowIndex.from_dataframe(self.data, use_interval)
+        return self.window_indexes[use_interval]
+
+    def get_bitmap_index(self, n_bins=64):
+        """
+        Get the bitmap index of the features (quantile buckets and category bitsets), built once and cached.
+
+        :param n_bins: Maximum number of buckets per numerical feature.
+        :return: A BitmapIndex over the rows of the loaded data.
+        """
+        if self.data.empty:
             raise ValueError("Data has not been loaded yet.")
-        return self.feature_analysis.get_feature_stats(feature_name)
 
-    def calculate_problem_dimension(self):
+        if n_bins not in self.bitmap_indexes:
+            self.bitmap_indexes[n_bins] = BitmapIndex(self.data, self.get_all_features_with_metadata(), n_bins)
+        return self.bitmap_indexes[n_bins]
+
+    def calculate_problem_dimension(self, interval_range=False):
         """
-        Calculates the dimension of the problem based on the type of features.
+        Calculates the dimension of the problem based on the type of features (see :func:`problem_dimension`).
 
         - Adds 4 for each numerical attribute (lower and upper bound, threshold and permutation).
         - Adds 3 for each categorical attribute (category, threshold and permutation).
-        - Adds 1 if an interval (datetime) attribute is present.
+        - Adds 1 if an interval (datetime) attribute is present (2 if interval ranges are mined).
         - Adds 2 if time series data (timestamp) is present.
         - Adds 1 for cut point value.
 
+        :param interval_range: Mine rules over ranges of intervals instead of single intervals.
         :return: The calculated dimension of the problem.
         """
-        dimension = 0
-        numerical_features = self.get_numerical_features()
-        categorical_features = self.get_categorical_features()
-
-        # Add to dimension based on numerical features
-        dimension += len(numerical_features) * 4
-
-        # Add to dimension based on categorical features
-        dimension += len(categorical_features) * 3
-
-        # Add to dimension if interval (datetime) attribute is present
-        if 'interval' in self.data.columns:
-            dimension += 1
-
-        # Add to dimension if time series data (timestamp) is present (assuming it's datetime feature)
-        if 'timestamp' in self.data.columns or self.data.select_dtypes(include=[np.datetime64]).shape[1] > 0:
-            dimension += 2
-
-        # cut point
-        dimension = dimension + 1
-
-        return dimension
+        statistics = self.get_statistics()
+        column_types = {column: statistics.summary[column]['type'] for column in statistics.columns}
+        # The entity column identifies the series and is not mined (it is left out of the feature metadata)
+        return problem_dimension(self.get_all_features_with_metadata(), column_types, interval_range)
 
     def get_all_features_with_metadata(self):
-        if self.feature_analysis is None:
-            raise ValueError("Data has not been loaded yet.")
-
-        # Prepare feature metadata
-        features_metadata = {}
-
-        for idx, column in enumerate(self.data.columns):
-            if column == 'timestamp' or column == 'interval':  # Skip the timestamp or interval column
-                continue
-
-            feature_type = 'Unknown'
-            col_data = self.data[column]
-
-            if np.issubdtype(col_data.dtype, np.number):
-                feature_type = 'Numerical'
-            elif col_data.dtype == 'object':
-                feature_type = 'Categorical'
-
-            # Create metadata for each feature
-            features_metadata[column] = {
-                'type': feature_type,
-                'min': col_data.min() if np.issubdtype(col_data.dtype, np.number) else None,
-                'max': col_data.max() if np.issubdtype(col_data.dtype, np.number) else None,
-                'categories': col_data.unique() if feature_type == 'Categorical' else None,
-                'position': idx  # Position in the dataset
-            }
+        """
+        Get the metadata (type, bounds, categories and position) of all features except the time columns.
 
-        return features_metadata
+        The metadata is taken from the statistics snapshot, so the columns are not scanned again.
 
+        :return: A dictionary of feature metadata.
+        """
+        features = self.get_statistics().feature_metadata()
+        features.pop(self.entity_col, None)
+        return features
 
     def get_all_transactions(self):
         """
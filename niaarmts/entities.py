@@ -0,0 +1,157 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from niapy.task import Task, OptimizationType
+from niapy.util.factory import get_algorithm
+from niaarmts.dataset import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.portfolio import spawn_seeds
+from niaarmts.shared import share_dataframe, attach_dataframe, release_shared
+
+
+def _default_problem_kwargs(transactions):
+    return {
+        'lower': 0.0,
+        'upper': 1.0,
+        'interval': 'true' if 'interval' in transactions.columns else 'false',
+        'alpha': 1.0,
+        'beta': 1.0,
+        'gamma': 1.0,
+        'delta': 1.0,
+        'epsilon': 1.0
+    }
+
+
+def _mine_entity(transactions, timestamp_col, problem_kwargs, run):
+    # Every entity is mined with its own statistics (feature bounds, categories and dimension)
+    dataset = Dataset()
+    dataset.load_data_from_dataframe(transactions, timestamp_col)
+    problem = NiaARMTS(
+        dimension=dataset.calculate_problem_dimension(problem_kwargs.get('interval_range', False)),
+        features=dataset.get_all_features_with_metadata(),
+        transactions=dataset.get_all_transactions(),
+        **problem_kwargs
+    )
+
+    if isinstance(run['algorithm'], str):
+        algorithm = get_algorithm(run['algorithm'], seed=run['seed'], **run['params'])
+    else:
+        algorithm = run['algorithm'](seed=run['seed'], **run['params'])
+    task = Task(problem=problem, max_iters=run['max_iters'], max_evals=run['max_evals'], optimization_type=run['optimization_type'])
+
+    started = time.perf_counter()
+    _, best_fitness = algorithm.run(task)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'seed': run['seed'],
+        'rows': len(transactions),
+        'best_fitness': best_fitness,
+        'evaluations': task.evals,
+        'elapsed': elapsed,
+        'archive_size': len(problem.rule_archive),
+        'rules': problem.get_rule_archive()
+    }
+
+
+def _init_worker(spec, entity_col, timestamp_col, problem_kwargs):
+    global _worker_state
+    transactions, blocks = attach_dataframe(spec)
+    # The blocks are kept with the data frame for the lifetime of the worker
+    _worker_state = (transactions, blocks, entity_col, timestamp_col, problem_kwargs)
+
+
+def _run_entity(job):
+    transactions, _, entity_col, timestamp_col, problem_kwargs = _worker_state
+    part = transactions.iloc[job['lo']:job['hi']].drop(columns=[entity_col]).reset_index(drop=True)
+    return job['entity'], _mine_entity(part, timestamp_col, problem_kwargs, job['run'])
+
+
+def mine_entities(
+    dataset,
+    problem_kwargs=None,
+    algorithm='ParticleSwarmAlgorithm',
+    entities=None,
+    seed=None,
+    max_iters=np.inf,
+    max_evals=np.inf,
+    algorithm_params=None,
+    n_workers=None,
+    optimization_type=OptimizationType.MAXIMIZATION
+):
+    """
+    Mine every entity (or a chosen subset) of a dataset loaded with an entity column.
+
+    Every entity is mined as its own series, with the feature bounds, categories and problem dimension
+    of its transactions. Entities are distributed over a process pool; the whole table is placed in
+    shared memory once and every worker reads the row ranges of its entities from the shared columns.
+
+    Args:
+        dataset (Dataset): A dataset loaded with `entity_col` (see :meth:`Dataset.load_data_from_csv`).
+        problem_kwargs (dict): Keyword arguments for the :class:`NiaARMTS` constructor except 'dimension',
+            'features' and 'transactions', which are derived per entity. Defaults to the [0, 1] search
+            space, all metric weights 1.0 and interval mode if the data has an 'interval' column.
+        algorithm (str or type): NiaPy algorithm name or class.
+        entities (list): Entity ids to mine. Defaults to all entities.
+        seed (int): Base seed from which the per-entity seeds are derived.
+        max_iters (int): Maximum number of iterations per entity.
+        max_evals (int): Maximum number of evaluations per entity.
+        algorithm_params (dict): Optional parameters of the algorithm.
+        n_workers (int): Number of worker processes. Defaults to the number of CPUs; 1 runs serially.
+        optimization_type (OptimizationType): Optimization type of every run.
+
+    Returns:
+        dict: 'entities' maps every mined entity id to its result ('rules' holds its archive, besides
+        'seed', 'rows', 'best_fitness', 'evaluations', 'elapsed' and 'archive_size'); 'evaluations' and
+        'elapsed' summarize the whole run.
+    """
+    ranges = dataset.get_entity_ranges()
+    entities = list(ranges) if entities is None else list(entities)
+    unknown = [entity for entity in entities if entity not in ranges]
+    if unknown:
+        raise KeyError(f"Unknown entities: {unknown}")
+
+    transactions = dataset.get_all_transactions()
+    problem_kwargs = {**_default_problem_kwargs(transactions), **(problem_kwargs or {})}
+
+    jobs = []
+    for entity, entity_seed in zip(entities, spawn_seeds(seed, len(entities))):
+        lo, hi = ranges[entity]
+        jobs.append({
+            'entity': entity,
+            'lo': lo,
+            'hi': hi,
+            'run': {
+                'algorithm': algorithm,
+                'seed': entity_seed,
+                'params': algorithm_params or {},
+                'max_iters': max_iters,
+                'max_evals': max_evals,
+                'optimization_type': optimization_type
+            }
+        })
+
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(jobs)))
+
+    started = time.perf_counter()
+    if n_workers == 1:
+        results = []
+        for job in jobs:
+            part = dataset.get_entity_transactions(job['entity']).drop(columns=[dataset.entity_col])
+            results.append((job['entity'], _mine_entity(part, dataset.timestamp_col, problem_kwargs, job['run'])))
+    else:
+        spec, blocks = share_dataframe(transactions)
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(spec, dataset.entity_col, dataset.timestamp_col, problem_kwargs)) as executor:
+                results = list(executor.map(_run_entity, jobs))
+        finally:
+            release_shared(blocks, unlink=True)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'entities': dict(results),
+        'evaluations': sum(result['evaluations'] for _, result in results),
+        'elapsed': elapsed
+    }
@@ -22,9 +22,11 @@ def _explain_rule_part(
     end=0,
     use_interval=False,
     part_name="Antecedent",
-    weights=None
+    weights=None,
+    window_stats=None
 ):
     contributions = []
+    stats = window_stats.window(start, end) if window_stats is not None else None
 
     df_filtered = df[(df['interval'] >= start) & (df['interval'] <= end)] if use_interval else \
                   df[(df['timestamp'] >= start) & (df['timestamp'] <= end)]
@@ -47,8 +49,11 @@ def _explain_rule_part(
         if 'amplitude' in weights:
             if feature_type == 'numerical':
                 if feature_name in df_filtered.columns:
-                    feature_min = df_filtered[feature_name].min()
-                    feature_max = df_filtered[feature_name].max()
+                    if stats is not None:
+                        feature_min, feature_max, _ = stats.min_max(feature_name)
+                    else:
+                        feature_min = df_filtered[feature_name].min()
+                        feature_max = df_filtered[feature_name].max()
                     if feature_max != feature_min:
                         normalized_range = (attr['border2'] - attr['border1']) / (feature_max - feature_min)
                         amplitude = 1 - normalized_range
@@ -59,7 +64,10 @@ def _explain_rule_part(
             elif feature_type == 'categorical':
                 value = attr['category']
                 if feature_name in df_filtered.columns and not df_filtered[feature_name].empty:
-                    value_count = df_filtered[feature_name].value_counts(normalize=True).get(value, 0.0)
+                    if stats is not None:
+                        value_count = stats.frequency(feature_name, value)
+                    else:
+                        value_count = df_filtered[feature_name].value_counts(normalize=True).get(value, 0.0)
                     amplitude = 1.0 - value_count
                 else:
                     amplitude = 0.0
@@ -149,20 +157,21 @@ def explain_rule(
     use_interval=False,
     show_plot=True,
     antecedent_weights={'coverage': 0.5, 'inclusion': 0.3, 'amplitude': 0.2},
-    consequent_weights={'coverage': 0.5, 'amplitude': 0.5}
+    consequent_weights={'coverage': 0.5, 'amplitude': 0.5},
+    window_stats=None
 ):
     print("=== Explaining Antecedent ===")
     antecedent_data = _explain_rule_part(
         df, features, antecedent, counterpart=consequent,
         start=start, end=end, use_interval=use_interval,
-        part_name="Antecedent", weights=antecedent_weights
+        part_name="Antecedent", weights=antecedent_weights, window_stats=window_stats
     )
 
     print("\n=== Explaining Consequent ===")
     consequent_data = _explain_rule_part(
         df, features, consequent, counterpart=antecedent,
         start=start, end=end, use_interval=use_interval,
-        part_name="Consequent", weights=consequent_weights
+        part_name="Consequent", weights=consequent_weights, window_stats=window_stats
     )
 
     results = {
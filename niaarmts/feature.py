@@ -1,62 +1,155 @@
+import warnings
 import pandas as pd
 import numpy as np
 
+def column_type(dtype):
+    """
+    Classify a column by its dtype.
+
+    :param dtype: The dtype of the column.
+    :return: 'Numerical', 'Categorical', 'Datetime' or 'Unknown'.
+    """
+    if isinstance(dtype, pd.CategoricalDtype) or dtype == 'object':
+        return 'Categorical'
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return 'Datetime'
+    if not isinstance(dtype, np.dtype):
+        return 'Unknown'
+    if np.issubdtype(dtype, np.number):
+        return 'Numerical'
+    if np.issubdtype(dtype, np.datetime64):
+        return 'Datetime'
+    return 'Unknown'
+
 class Feature:
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, sample_size: int = None, seed: int = None, block_bytes: int = 64 * 2 ** 20):
         """
         Initializes the Feature class.
 
+        Column types are classified once from the dtypes. Statistics of numerical columns are computed
+        for blocks of columns with vectorized, in-place reductions and cached, so repeated calls do not
+        scan the data again.
+
         :param data: A Pandas DataFrame containing the dataset.
+        :param sample_size: Optional, compute the statistics from a random sample of this many rows (a
+            quick, approximate summary of huge tables); column types are always exact.
+        :param seed: Optional, the seed of the row sample.
+        :param block_bytes: Memory budget of a block of columns reduced at once (float64 values of all rows).
         """
         self.data = data
         if self.data.empty:
             raise ValueError("No data available for feature analysis.")
 
-    def get_feature_summary(self):
-        """
-        Provides a summary of features in the dataset, categorized by type.
+        self.sample_size = sample_size
+        self.seed = seed
+        self.block_bytes = block_bytes
+        self.sampled = sample_size is not None and len(data) > sample_size
 
-        :return: A dictionary with feature summaries.
-        """
+        # One pass over the dtypes
+        self.types = {column: column_type(dtype) for column, dtype in data.dtypes.items()}
+        self._summary = None
+
+    def _stats_data(self):
+        if self.sampled:
+            return self.data.sample(n=self.sample_size, random_state=self.seed)
+        return self.data
+
+    def _numerical_summary(self, data, columns):
         summary = {}
-        for column in self.data.columns:
-            col_data = self.data[column]
+        # Every block of columns is one float64 array of at most block_bytes bytes
+        block_size = max(1, self.block_bytes // max(len(data) * 8, 1))
+
+        for i in range(0, len(columns), block_size):
+            block_columns = columns[i:i + block_size]
+            block = np.empty((len(data), len(block_columns)), dtype=np.float64, order='F')
+            mins, maxs = [], []
 
-            if np.issubdtype(col_data.dtype, np.number):
+            with warnings.catch_warnings(), np.errstate(all='ignore'):
+                warnings.simplefilter('ignore', RuntimeWarning)
+                for j, column in enumerate(block_columns):
+                    values = data[column].to_numpy()
+                    # min/max keep the column dtype; fmin/fmax skip missing values, like pandas
+                    if np.issubdtype(values.dtype, np.floating):
+                        mins.append(np.fmin.reduce(values))
+                        maxs.append(np.fmax.reduce(values))
+                    else:
+                        mins.append(values.min())
+                        maxs.append(values.max())
+                    block[:, j] = values
+                means, stds = self._mean_std(block)
+
+            for j, column in enumerate(block_columns):
                 summary[column] = {
                     'type': 'Numerical',
-                    'min': col_data.min(),
-                    'max': col_data.max(),
-                    'mean': col_data.mean(),
-                    'std_dev': col_data.std(),
-                }
-            elif col_data.dtype == 'object':
-                summary[column] = {
-                    'type': 'Categorical',
-                    'unique_classes': col_data.nunique(),
-                    'classes': col_data.unique()
+                    'min': mins[j],
+                    'max': maxs[j],
+                    'mean': means[j],
+                    'std_dev': stds[j],
                 }
-            elif np.issubdtype(col_data.dtype, np.datetime64):
-                summary[column] = {
-                    'type': 'Datetime',
-                    'min': col_data.min(),
-                    'max': col_data.max(),
-                }
-            else:
-                summary[column] = {
-                    'type': 'Unknown',
-                }
-
         return summary
 
+    @staticmethod
+    def _mean_std(values):
+        # Column means and sample standard deviations, skipping missing values; `values` is overwritten
+        missing = np.isnan(values)
+        any_missing = missing.any()
+        if any_missing:
+            counts = (len(values) - missing.sum(axis=0)).astype(np.float64)
+            values[missing] = 0.0
+        else:
+            counts = np.full(values.shape[1], values.shape[0], dtype=np.float64)
+        means = values.sum(axis=0) / counts
+        values -= means
+        if any_missing:
+            values[missing] = 0.0
+        stds = np.sqrt(np.einsum('ij,ij->j', values, values) / np.maximum(counts - 1, 1))
+        # Like pandas, the standard deviation of fewer than two values is undefined
+        stds[counts < 2] = np.nan
+        return means, stds
+
+    @staticmethod
+    def _column_summary(col_data, col_type):
+        if col_type == 'Categorical':
+            return {
+                'type': 'Categorical',
+                'unique_classes': col_data.nunique(),
+                'classes': col_data.unique()
+            }
+        elif col_type == 'Datetime':
+            return {
+                'type': 'Datetime',
+                'min': col_data.min(),
+                'max': col_data.max(),
+            }
+        return {
+            'type': 'Unknown',
+        }
+
+    def _get_summary(self):
+        if self._summary is None:
+            data = self._stats_data()
+            numerical = self._numerical_summary(data, self.get_numerical_features())
+            self._summary = {
+                column: numerical[column] if col_type == 'Numerical' else self._column_summary(data[column], col_type)
+                for column, col_type in self.types.items()
+            }
+        return self._summary
+
+    def get_feature_summary(self):
+        """
+        Provides a summary of features in the dataset, categorized by type.
+
+        :return: A dictionary with feature summaries.
+        """
+        return {column: dict(stats) for column, stats in self._get_summary().items()}
+
     def get_numerical_features(self):
         """
         Returns a list of numerical features in the dataset.
 
         :return: A list of numerical feature names.
         """
-        numerical_features = [col for col in self.data.columns if np.issubdtype(self.data[col].dtype, np.number)]
-        return numerical_features
+        return [col for col, col_type in self.types.items() if col_type == 'Numerical']
 
     def get_categorical_features(self):
         """
@@ -64,8 +157,7 @@ class Feature:
 
         :return: A list of categorical feature names.
         """
-        categorical_features = [col for col in self.data.columns if self.data[col].dtype == 'object']
-        return categorical_features
+        return [col for col, col_type in self.types.items() if col_type == 'Categorical']
 
     def get_datetime_features(self):
         """
@@ -73,8 +165,7 @@ class Feature:
 
         :return: A list of datetime feature names.
         """
-        datetime_features = [col for col in self.data.columns if np.issubdtype(self.data[col].dtype, np.datetime64)]
-        return datetime_features
+        return [col for col, col_type in self.types.items() if col_type == 'Datetime']
 
     def get_feature_stats(self, feature_name: str):
         """
@@ -86,28 +177,4 @@ class Feature:
         if feature_name not in self.data.columns:
             raise ValueError(f"Feature '{feature_name}' not found in the dataset.")
 
-        col_data = self.data[feature_name]
-        if np.issubdtype(col_data.dtype, np.number):
-            return {
-                'type': 'Numerical',
-                'min': col_data.min(),
-                'max': col_data.max(),
-                'mean': col_data.mean(),
-                'std_dev': col_data.std(),
-            }
-        elif col_data.dtype == 'object':
-            return {
-                'type': 'Categorical',
-                'unique_classes': col_data.nunique(),
-                'classes': col_data.unique(),
-            }
-        elif np.issubdtype(col_data.dtype, np.datetime64):
-            return {
-                'type': 'Datetime',
-                'min': col_data.min(),
-                'max': col_data.max(),
-            }
-        else:
-            return {
-                'type': 'Unknown',
-            }
+        return dict(self._get_summary()[feature_name])
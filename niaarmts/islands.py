@@ -0,0 +1,222 @@
+import queue
+import time
+import multiprocessing
+import numpy as np
+from niapy.algorithms.algorithm import Individual
+from niapy.task import Task, OptimizationType
+from niapy.util.factory import get_algorithm
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.portfolio import merge_archives, spawn_seeds
+from niaarmts.shared import share_dataframe, attach_dataframe, release_shared
+
+
+def archive_rule(problem, entry):
+    """
+    Insert an entry taken from another archive into the archive of a problem, keeping its metrics.
+
+    Args:
+        problem (NiaARMTS): The problem whose archive receives the rule.
+        entry (dict): An archive entry as returned by :meth:`NiaARMTS.get_rule_archive`.
+    """
+    problem.add_rule_to_archive(
+        entry['full_rule'], entry['antecedent'], entry['consequent'], entry['fitness'], entry['start'], entry['end'],
+        entry['support'], entry['confidence'], entry['inclusion'], entry['amplitude'], entry['tsm']
+    )
+
+
+def _select_migrants(population, population_fitness, n_migrants):
+    # Task values are always minimized internally, so the best individuals come first
+    best = np.argsort(population_fitness)[:n_migrants]
+    vectors = [population[i].x.copy() if isinstance(population[i], Individual) else population[i].copy() for i in best]
+    return vectors, [population_fitness[i] for i in best]
+
+
+def _replace_worst(population, population_fitness, vectors, fitness, params=None):
+    worst = np.argsort(population_fitness)[::-1][:len(vectors)]
+    for i, x, f in zip(worst, vectors, fitness):
+        if f >= population_fitness[i]:
+            continue
+        if isinstance(population[i], Individual):
+            population[i].x = x
+            population[i].f = f
+        else:
+            population[i] = x
+        population_fitness[i] = f
+        if params is not None:
+            _reset_individual_state(params, i, x, f)
+    return population, population_fitness
+
+
+def _reset_individual_state(params, i, x, f):
+    # A migrant replaces an individual, so it starts without the memory of the replaced one: the
+    # personal best of particle swarm algorithms is the migrant itself and its velocity is zero.
+    # Other algorithm-specific state is kept as it is.
+    if 'personal_best' in params and 'personal_best_fitness' in params:
+        params['personal_best'][i] = np.copy(x)
+        params['personal_best_fitness'][i] = f
+    if isinstance(params.get('v'), np.ndarray):
+        params['v'][i] = 0.0
+
+
+def _run_island(island, spec, problem_kwargs, run, inbox, outbox, results):
+    transactions, blocks = attach_dataframe(spec)
+    problem = NiaARMTS(transactions=transactions, **problem_kwargs)
+
+    if isinstance(run['algorithm'], str):
+        algorithm = get_algorithm(run['algorithm'], seed=run['seed'], **run['params'])
+    else:
+        algorithm = run['algorithm'](seed=run['seed'], **run['params'])
+    task = Task(problem=problem, max_iters=run['generations'], optimization_type=run['optimization_type'])
+
+    started = time.perf_counter()
+    # The loop of Algorithm.iteration_generator, with the callbacks of the algorithm and migrations
+    algorithm.callbacks.before_run()
+    pop, fpop, params = algorithm.init_population(task)
+    xb, fxb = algorithm.get_best(pop, fpop)
+    migrations = 0
+
+    while not task.stopping_condition():
+        algorithm.callbacks.before_iteration(pop, fpop, xb, fxb, **params)
+        pop, fpop, xb, fxb, params = algorithm.run_iteration(task, pop, fpop, xb, fxb, **params)
+        algorithm.callbacks.after_iteration(pop, fpop, xb, fxb, **params)
+        task.next_iter()
+
+        # Synchronous ring migration; every island migrates after the same generations
+        if task.iters % run['migration_interval'] == 0 and task.iters < run['generations']:
+            vectors, fitness = _select_migrants(pop, fpop, run['n_migrants'])
+            outbox.put((vectors, fitness, problem.get_rule_archive()[:run['n_rules']]))
+            try:
+                vectors, fitness, rules = inbox.get(timeout=run['timeout'])
+            except queue.Empty:
+                continue
+            pop, fpop = _replace_worst(pop, np.asarray(fpop), vectors, fitness, params)
+            xb, fxb = algorithm.get_best(pop, fpop, xb, fxb)
+            for entry in rules:
+                archive_rule(problem, entry)
+            migrations += 1
+    algorithm.callbacks.after_run()
+
+    elapsed = time.perf_counter() - started
+    results.put({
+        'island': island,
+        'algorithm': run['algorithm'] if isinstance(run['algorithm'], str) else run['algorithm'].__name__,
+        'seed': run['seed'],
+        'best_fitness': fxb * task.optimization_type.value,
+        'evaluations': task.evals,
+        'iterations': task.iters,
+        'migrations': migrations,
+        'elapsed': elapsed,
+        'evaluations_per_second': task.evals / elapsed if elapsed > 0 else 0.0,
+        'archive_size': len(problem.rule_archive),
+        'archive': problem.get_rule_archive()
+    })
+
+    del problem, transactions
+    release_shared(blocks)
+
+
+def run_islands(
+    problem_kwargs,
+    algorithms='ParticleSwarmAlgorithm',
+    n_islands=4,
+    generations=100,
+    migration_interval=10,
+    n_migrants=2,
+    n_rules=10,
+    seed=None,
+    algorithm_params=None,
+    optimization_type=OptimizationType.MAXIMIZATION,
+    timeout=600.0
+):
+    """
+    Optimize one NiaARMTS problem with several populations (islands) evolving in parallel processes.
+
+    Islands are connected in a ring. Every `migration_interval` generations each island sends its best
+    solution vectors and the best rules of its archive to the next island, which replaces its worst
+    individuals with the migrants (when they are better) and adds the rules to its archive. A migrant
+    starts without the memory of the individual it replaces: particle swarm algorithms take it as the
+    personal best of the particle and reset its velocity; other algorithm-specific state is kept. The
+    transactions are placed in shared memory once and every island works on the same columns.
+
+    Args:
+        problem_kwargs (dict): Keyword arguments for the :class:`NiaARMTS` constructor, including 'transactions'.
+        algorithms (str or list): NiaPy algorithm name or class, or a list of them assigned to islands in turn.
+        n_islands (int): Number of islands (processes).
+        generations (int): Number of generations every island runs.
+        migration_interval (int): Number of generations between two migrations.
+        n_migrants (int): Number of elite solution vectors sent in every migration.
+        n_rules (int): Number of top archive rules sent in every migration.
+        seed (int): Base seed from which the per-island seeds are derived.
+        algorithm_params (dict): Optional parameters per algorithm name (or class).
+        optimization_type (OptimizationType): Optimization type of every island.
+        timeout (float): Seconds an island waits for migrants before it continues without them.
+
+    Returns:
+        dict: 'rules' holds the merged archive of all islands, 'islands' the per-island statistics and
+        'evaluations', 'elapsed' and 'evaluations_per_second' summarize the whole run.
+    """
+    if not isinstance(algorithms, (list, tuple)):
+        algorithms = [algorithms]
+    if migration_interval <= 0:
+        raise ValueError("Migration interval must be positive.")
+
+    algorithm_params = algorithm_params or {}
+    problem_kwargs = dict(problem_kwargs)
+    spec, blocks = share_dataframe(problem_kwargs.pop('transactions'))
+
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(n_islands)]
+    results = context.Queue()
+
+    processes = []
+    for island, island_seed in enumerate(spawn_seeds(seed, n_islands)):
+        algorithm = algorithms[island % len(algorithms)]
+        run = {
+            'algorithm': algorithm,
+            'seed': island_seed,
+            'params': algorithm_params.get(algorithm, {}),
+            'generations': generations,
+            'migration_interval': migration_interval,
+            'n_migrants': n_migrants,
+            'n_rules': n_rules,
+            'optimization_type': optimization_type,
+            'timeout': timeout
+        }
+        process = context.Process(
+            target=_run_island,
+            args=(island, spec, problem_kwargs, run, inboxes[island], inboxes[(island + 1) % n_islands], results)
+        )
+        processes.append(process)
+
+    started = time.perf_counter()
+    try:
+        for process in processes:
+            process.start()
+        # Collect results before joining, so large archives cannot block the queue
+        islands = []
+        while len(islands) < n_islands:
+            try:
+                islands.append(results.get(timeout=1.0))
+            except queue.Empty:
+                if any(process.exitcode not in (None, 0) for process in processes):
+                    raise RuntimeError("An island terminated unexpectedly.")
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        release_shared(blocks, unlink=True)
+    elapsed = time.perf_counter() - started
+
+    islands.sort(key=lambda x: x['island'])
+    rules = merge_archives([island.pop('archive') for island in islands])
+    evaluations = sum(island['evaluations'] for island in islands)
+
+    return {
+        'rules': rules,
+        'islands': islands,
+        'evaluations': evaluations,
+        'elapsed': elapsed,
+        'evaluations_per_second': evaluations / elapsed if elapsed > 0 else 0.0
+    }
@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+    HAS_NUMBA = False
+
+# Kinds of compiled conditions
+COMPARE = 0
+ALWAYS = 1
+
+
+def _fused_kernel_py(matrix, lo, hi, features, kinds, lows, highs, n_antecedent):
+    # One pass over the window rows; no temporary arrays besides the per-condition accumulators
+    n_conditions = len(features)
+    mins = np.full(n_conditions, np.nan)
+    maxs = np.full(n_conditions, np.nan)
+    valid = np.zeros(n_conditions, dtype=np.int64)
+    hits = np.zeros(n_conditions, dtype=np.int64)
+    antecedent_count = 0
+    rule_count = 0
+
+    for row in range(lo, hi):
+        antecedent = True
+        rule = True
+        for c in range(n_conditions):
+            if kinds[c] == ALWAYS:
+                continue
+            value = matrix[features[c], row]
+            match = False
+            if value == value:
+                if valid[c] == 0 or value < mins[c]:
+                    mins[c] = value
+                if valid[c] == 0 or value > maxs[c]:
+                    maxs[c] = value
+                valid[c] += 1
+                if lows[c] <= value <= highs[c]:
+                    match = True
+                    hits[c] += 1
+            if not match:
+                rule = False
+                if c < n_antecedent:
+                    antecedent = False
+        if antecedent:
+            antecedent_count += 1
+        if rule:
+            rule_count += 1
+
+    return antecedent_count, rule_count, mins, maxs, valid, hits
+
+
+def _numpy_kernel(matrix, lo, hi, features, kinds, lows, highs, n_antecedent):
+    n_conditions = len(features)
+    if hi <= lo:
+        return 0, 0, np.full(n_conditions, np.nan), np.full(n_conditions, np.nan), np.zeros(n_conditions, dtype=np.int64), np.zeros(n_conditions, dtype=np.int64)
+
+    block = matrix[features, lo:hi]
+    valid = ~np.isnan(block)
+    match = (block >= lows[:, None]) & (block <= highs[:, None])
+    match[kinds == ALWAYS] = True
+
+    antecedent = match[:n_antecedent].all(axis=0)
+    rule = antecedent & match[n_antecedent:].all(axis=0)
+    # fmin/fmax skip missing values and give NaN for conditions without any value, like pandas
+    return (int(antecedent.sum()), int(rule.sum()), np.fmin.reduce(block, axis=1), np.fmax.reduce(block, axis=1),
+            valid.sum(axis=1), (match & valid).sum(axis=1))
+
+
+_fused_kernel = numba.njit(cache=True, nogil=True)(_fused_kernel_py) if HAS_NUMBA else None
+
+
+class RuleKernel:
+    def __init__(self, transactions, features, backend='auto'):
+        """
+        Fused evaluation of support, confidence and amplitude of a rule over a contiguous window of rows.
+
+        The features are stored once as a float64 matrix (categories as codes, missing values as NaN) and
+        the conditions of a rule are compiled into a condition table (feature row, kind and borders). The
+        'numba' backend evaluates the table in a single JIT-compiled pass over the window rows; the
+        'numpy' backend evaluates it with vectorized operations on the window block. Both give the same
+        counts and amplitude as the pandas code in :mod:`niaarmts.metrics`.
+
+        Args:
+            transactions (pd.DataFrame): The transactions, in the row order used for the windows.
+            features (dict): A dictionary of feature metadata (see :meth:`Dataset.get_all_features_with_metadata`).
+            backend (str): 'numba', 'numpy' or 'auto' (Numba when it is installed, NumPy otherwise).
+
+        Raises:
+            ImportError: The 'numba' backend was requested, but Numba is not installed.
+        """
+        if backend == 'auto':
+            backend = 'numba' if HAS_NUMBA else 'numpy'
+        if backend not in ('numba', 'numpy'):
+            raise ValueError("Kernel backend must be 'numba', 'numpy' or 'auto'.")
+        if backend == 'numba' and not HAS_NUMBA:
+            raise ImportError("The 'numba' kernel backend requires Numba.")
+        self.backend = backend
+        self.kernel = _fused_kernel if backend == 'numba' else _numpy_kernel
+
+        self.features = {}
+        self.vocabularies = {}
+        self.n_rows = len(transactions)
+        rows = []
+        for feature, meta in features.items():
+            if meta['type'] == 'Numerical':
+                rows.append(transactions[feature].to_numpy(dtype=np.float64))
+            elif meta['type'] == 'Categorical':
+                codes, categories = pd.factorize(transactions[feature])
+                rows.append(np.where(codes >= 0, codes, np.nan).astype(np.float64))
+                self.vocabularies[feature] = {category: float(code) for code, category in enumerate(categories)}
+            else:
+                continue
+            self.features[feature] = len(rows) - 1
+
+        self.matrix = np.ascontiguousarray(np.vstack(rows)) if rows else np.zeros((1, self.n_rows))
+
+    def compile(self, conditions):
+        """
+        Compile rule conditions into a condition table.
+
+        Args:
+            conditions (list): A list of dictionaries defining the conditions.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Feature rows, kinds, lower and upper
+            borders (equal category codes for categorical conditions) of the conditions.
+        """
+        n_conditions = len(conditions)
+        features = np.zeros(n_conditions, dtype=np.int64)
+        kinds = np.full(n_conditions, ALWAYS, dtype=np.int64)
+        lows = np.full(n_conditions, -np.inf)
+        highs = np.full(n_conditions, np.inf)
+
+        for i, condition in enumerate(conditions):
+            if condition['type'] == 'Numerical':
+                lows[i], highs[i] = condition['border1'], condition['border2']
+            elif condition['type'] == 'Categorical':
+                # Unknown categories get code -1, which no row has
+                lows[i] = highs[i] = self.vocabularies[condition['feature']].get(condition['category'], -1.0)
+            else:
+                continue
+            features[i] = self.features[condition['feature']]
+            kinds[i] = COMPARE
+
+        return features, kinds, lows, highs
+
+    def evaluate(self, antecedent, consequent, lo, hi):
+        """
+        Evaluate a rule on the rows lo, ..., hi - 1.
+
+        Args:
+            antecedent (list): The antecedent part of the rule.
+            consequent (list): The consequent part of the rule.
+            lo (int): First row of the window.
+            hi (int): Row after the last row of the window.
+
+        Returns:
+            dict: 'antecedent_count' and 'rule_count' (rows matching the antecedent and the whole rule)
+            and 'amplitude', the amplitude metric of the rule over the window.
+        """
+        conditions = antecedent + consequent
+        features, kinds, lows, highs = self.compile(conditions)
+        antecedent_count, rule_count, mins, maxs, valid, hits = self.kernel(self.matrix, lo, hi, features, kinds, lows, highs, len(antecedent))
+
+        return {
+            'antecedent_count': int(antecedent_count),
+            'rule_count': int(rule_count),
+            'amplitude': self._amplitude(conditions, hi - lo, mins, maxs, valid, hits)
+        }
+
+    @staticmethod
+    def _amplitude(conditions, n_rows, mins, maxs, valid, hits):
+        # Same terms, in the same order, as metrics._amplitude
+        if n_rows <= 0:
+            return 0.0
+
+        total_metric = 0.0
+        total_attributes = 0
+        for i, condition in enumerate(conditions):
+            if condition['type'] == 'Numerical':
+                feature_min, feature_max = float(mins[i]), float(maxs[i])
+                if feature_max != feature_min:
+                    normalized_range = (condition['border2'] - condition['border1']) / (feature_max - feature_min)
+                else:
+                    normalized_range = 0.0
+                total_metric += (1 - normalized_range)
+                total_attributes += 1
+            elif condition['type'] == 'Categorical':
+                value_count = hits[i] / valid[i] if valid[i] > 0 else 0.0
+                total_metric += 1.0 - value_count
+                total_attributes += 1
+
+        if total_attributes == 0:
+            return 0.0
+        return total_metric / total_attributes
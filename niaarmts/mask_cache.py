@@ -0,0 +1,169 @@
+from collections import OrderedDict
+import numpy as np
+from niaarmts.bitmap import pack_mask, trim_bits
+
+
+class ConditionMaskCache:
+    def __init__(self, transactions, max_bytes=64 * 2 ** 20, snap=True):
+        """
+        Memory-bounded LRU cache of packed condition masks over all rows of the transactions.
+
+        A cached mask is the bitset of the rows satisfying one condition (eight rows per byte, as in
+        :mod:`niaarmts.bitmap`); a window of rows lo, ..., hi - 1 is a slice of its bytes, so conditions
+        recurring in different windows are compared with the column only once. Numerical conditions
+        are keyed by their (already rounded) borders or, with `snap`, by the range of distinct column
+        values inside the borders: conditions selecting the same data values share one mask, which
+        raises the hit rate without changing any result.
+
+        Args:
+            transactions (pd.DataFrame): The transactions, in the row order used for the windows.
+            max_bytes (int): Maximum total size of the cached masks; least recently used masks are evicted.
+            snap (bool): Snap numerical borders to the distinct values of the column.
+        """
+        if max_bytes <= 0:
+            raise ValueError("Cache size must be positive.")
+
+        self.transactions = transactions
+        self.n_rows = len(transactions)
+        self.max_bytes = max_bytes
+        self.snap = snap
+
+        self.masks = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._values = {}
+        self._distinct = {}
+
+    def _column(self, feature):
+        if feature not in self._values:
+            self._values[feature] = self.transactions[feature].to_numpy()
+        return self._values[feature]
+
+    def key(self, condition):
+        """
+        Cache key of a condition, or None for conditions of other types than 'Numerical' and 'Categorical'.
+
+        Snapped numerical conditions selecting no data value get the key (feature, 'Numerical', 0, 0).
+        """
+        feature = condition['feature']
+        if condition['type'] == 'Categorical':
+            return feature, 'Categorical', condition['category']
+        if condition['type'] != 'Numerical':
+            return None
+        if not self.snap:
+            return feature, 'Numerical', float(condition['border1']), float(condition['border2'])
+
+        if feature not in self._distinct:
+            values = self._column(feature).astype(np.float64)
+            self._distinct[feature] = np.unique(values[~np.isnan(values)])
+        distinct = self._distinct[feature]
+        # Distinct values first, last - 1 are exactly the values inside the borders
+        first = int(np.searchsorted(distinct, condition['border1'], side='left'))
+        last = int(np.searchsorted(distinct, condition['border2'], side='right'))
+        if last <= first:
+            return feature, 'Numerical', 0, 0
+        return feature, 'Numerical', first, last
+
+    def full_bits(self, condition):
+        """
+        Packed mask of a condition over all rows, from the cache or computed (and cached).
+
+        Returns:
+            np.ndarray: Bitset (uint8) of the rows satisfying the condition; None for conditions that
+            every row satisfies. The array is shared with the cache and must not be modified.
+        """
+        key = self.key(condition)
+        if key is None:
+            return None
+        bits = self.masks.get(key)
+        if bits is not None:
+            self.hits += 1
+            self.masks.move_to_end(key)
+            return bits
+
+        self.misses += 1
+        values = self._column(condition['feature'])
+        if condition['type'] == 'Categorical':
+            mask = np.asarray(values == condition['category'], dtype=bool)
+        else:
+            with np.errstate(invalid='ignore'):
+                mask = (values >= condition['border1']) & (values <= condition['border2'])
+        bits = pack_mask(mask)
+
+        if bits.nbytes <= self.max_bytes:
+            self.masks[key] = bits
+            self.nbytes += bits.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self.masks.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+        return bits
+
+    def window_bits(self, lo, hi):
+        """
+        Bitset of all rows of the window lo, ..., hi - 1.
+        """
+        bits = np.full((hi + 7) // 8 - lo // 8 if hi > lo else 0, 0xFF, dtype=np.uint8)
+        return trim_bits(bits, lo, hi)
+
+    def condition_bits(self, condition, lo, hi):
+        """
+        Window bitset of a condition on the rows lo, ..., hi - 1 (see :meth:`BitmapIndex.condition_bits`).
+        """
+        if hi <= lo:
+            return np.zeros(0, dtype=np.uint8)
+        bits = self.full_bits(condition)
+        if bits is None:
+            return self.window_bits(lo, hi)
+        return trim_bits(bits[lo // 8:(hi + 7) // 8].copy(), lo, hi)
+
+    def conditions_bits(self, conditions, lo, hi, bits=None):
+        """
+        Window bitset of a conjunction of conditions on the rows lo, ..., hi - 1.
+
+        Args:
+            conditions (list): A list of dictionaries defining the conditions.
+            lo (int): First row of the window.
+            hi (int): Row after the last row of the window.
+            bits (np.ndarray): Optional window bitset of already selected rows to start from.
+
+        Returns:
+            np.ndarray: Window bitset of the rows satisfying all conditions. The evaluation stops as soon
+            as no row is left.
+        """
+        bits = self.window_bits(lo, hi) if bits is None else bits.copy()
+        first, last = lo // 8, (hi + 7) // 8
+        for condition in conditions:
+            if not bits.any():
+                break
+            full = self.full_bits(condition)
+            if full is not None:
+                # Bits outside the window are already cleared in `bits`
+                bits &= full[first:last]
+        return bits
+
+    def stats(self):
+        """
+        Cache statistics.
+
+        Returns:
+            dict: 'hits', 'misses', 'hit_rate', 'evictions', 'entries' and 'nbytes' (size of the cached masks).
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.masks),
+            'nbytes': self.nbytes
+        }
+
+    def clear(self):
+        """
+        Drop all cached masks (the statistics are kept).
+        """
+        self.masks.clear()
+        self.nbytes = 0
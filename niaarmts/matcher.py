@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+SIDES = ('antecedent', 'consequent')
+
+
+class RuleMatcher:
+    def __init__(self, archive, max_chunk_bytes=16 * 2 ** 20):
+        """
+        Archived rules compiled for matching batches of incoming rows.
+
+        The conditions of all rules are grouped by feature. The borders of the numerical conditions on a
+        feature are merged into one sorted array of edges; a binary search maps every row value to the
+        elementary interval (between or on the edges) it falls into, and the conditions are evaluated
+        once per elementary interval present in the batch instead of once per row. Categorical values
+        are mapped to category codes and looked up in a precompiled (category x condition) table. Every
+        rule side fails on a row as soon as one of its conditions fails, so a batch is matched against
+        all rules with a few array operations per feature.
+
+        A rule fires on a row if its antecedent holds; a firing rule is violated if its consequent does
+        not hold. The time windows of the rules are not taken into account. Conditions of other types
+        than 'Numerical' and 'Categorical' hold on every row, as in
+        :func:`niaarmts.metrics.calculate_condition_mask`.
+
+        Args:
+            archive (list[dict] or RuleArchive): Archive entries; rules are identified by their position.
+            max_chunk_bytes (int): Rows are matched in chunks whose (row x rule) work arrays take at
+                most this many bytes.
+        """
+        entries = list(archive)
+        self.n_rules = len(entries)
+        self.max_chunk_bytes = max_chunk_bytes
+
+        # Row of a condition in the (2 * rules x row) failure matrix: antecedents first, then consequents
+        numerical = {}
+        categorical = {}
+        for rule_id, entry in enumerate(entries):
+            for side_id, side in enumerate(SIDES):
+                for condition in entry[side]:
+                    slot = side_id * self.n_rules + rule_id
+                    if condition['type'] == 'Numerical':
+                        numerical.setdefault(condition['feature'], []).append((slot, condition['border1'], condition['border2']))
+                    elif condition['type'] == 'Categorical':
+                        categorical.setdefault(condition['feature'], []).append((slot, condition['category']))
+
+        self.groups = []
+        for feature, conditions in numerical.items():
+            for layer in self._layers(conditions):
+                slots = np.array([slot for slot, _, _ in layer], dtype=np.int64)
+                border1 = np.array([b1 for _, b1, _ in layer], dtype=np.float64)
+                border2 = np.array([b2 for _, _, b2 in layer], dtype=np.float64)
+                edges = np.unique(np.concatenate((border1, border2)))
+                self.groups.append(('Numerical', feature, slots, (border1, border2, edges, self._segment_values(edges))))
+        for feature, conditions in categorical.items():
+            for layer in self._layers(conditions):
+                slots = np.array([slot for slot, _ in layer], dtype=np.int64)
+                # Missing (NaN or None) categories equal no value, as in calculate_condition_mask, so they
+                # are not compiled and their conditions never hold
+                categories = list(dict.fromkeys(category for _, category in layer if not pd.isna(category)))
+                codes = {category: code for code, category in enumerate(categories)}
+                # Last column of the table is for values of no compiled category
+                table = np.zeros((len(layer), len(categories) + 1), dtype=bool)
+                for row, (_, category) in enumerate(layer):
+                    if not pd.isna(category):
+                        table[row, codes[category]] = True
+                self.groups.append(('Categorical', feature, slots, (pd.Index(categories), table)))
+
+        self.features = sorted({group[1] for group in self.groups}, key=str)
+
+    @staticmethod
+    def _layers(conditions):
+        # A rule side may repeat a feature; every layer holds at most one condition per slot
+        layers = []
+        seen = []
+        for condition in conditions:
+            for layer, slots in zip(layers, seen):
+                if condition[0] not in slots:
+                    layer.append(condition)
+                    slots.add(condition[0])
+                    break
+            else:
+                layers.append([condition])
+                seen.append({condition[0]})
+        return layers
+
+    @staticmethod
+    def _segment_values(edges):
+        # Segment 2k + 1 is the edge k, segment 2k lies strictly between the edges k - 1 and k
+        values = np.empty(2 * len(edges) + 1, dtype=np.float64)
+        values[1::2] = edges
+        if len(edges) > 0:
+            values[0] = np.nextafter(edges[0], -np.inf)
+            values[-1] = np.nextafter(edges[-1], np.inf)
+            values[2:-1:2] = edges[:-1] / 2 + edges[1:] / 2
+        return values
+
+    def _failures(self, group, batch):
+        kind, feature, _, compiled = group
+        if kind == 'Categorical':
+            categories, table = compiled
+            codes = categories.get_indexer(batch[feature])
+            codes[codes < 0] = len(categories)
+            return ~np.take(table, codes, axis=1)
+
+        border1, border2, edges, segment_values = compiled
+        values = np.asarray(batch[feature], dtype=np.float64)
+        positions = np.searchsorted(edges, values, side='left')
+        on_edge = np.zeros(len(values), dtype=bool)
+        inside = positions < len(edges)
+        on_edge[inside] = values[inside] == edges[positions[inside]]
+        # NaN is sorted after the last edge and, like larger values, satisfies no condition
+        segments = 2 * positions + on_edge
+
+        present = np.zeros(len(segment_values), dtype=bool)
+        present[segments] = True
+        (used,) = np.nonzero(present)
+        remap = np.cumsum(present) - 1
+        representatives = segment_values[used][:, None]
+        holds = (representatives >= border1) & (representatives <= border2)
+        return ~np.take(holds.T, remap[segments], axis=1)
+
+    def match(self, batch):
+        """
+        Match all rules against a batch of rows.
+
+        Args:
+            batch (pd.DataFrame): Rows with (at least) the columns of the features used by the rules.
+
+        Returns:
+            dict: Sparse (coordinate) fire indicators: 'row' and 'rule' hold the row position and rule id
+            of every firing (by rule within every chunk of rows) and 'violation' whether the consequent fails there;
+            'fire_count' and 'violation_count' hold the number of firings and violations per rule.
+
+        Raises:
+            KeyError: A feature used by the rules is missing from the batch.
+        """
+        missing = [feature for feature in self.features if feature not in batch]
+        if missing:
+            raise KeyError(f"Missing features: {missing}")
+
+        n_rows = len(batch)
+        chunk_rows = max(1, self.max_chunk_bytes // max(2 * self.n_rules, 1))
+        rows, rules, violations = [], [], []
+        for lo in range(0, n_rows, chunk_rows):
+            chunk = batch.iloc[lo:lo + chunk_rows]
+            failed = np.zeros((2 * self.n_rules, len(chunk)), dtype=bool)
+            for group in self.groups:
+                failed[group[2]] |= self._failures(group, chunk)
+
+            rule, row = np.nonzero(~failed[:self.n_rules])
+            rows.append(row + lo)
+            rules.append(rule)
+            violations.append(failed[rule + self.n_rules, row])
+
+        row = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        rule = np.concatenate(rules) if rules else np.zeros(0, dtype=np.int64)
+        violation = np.concatenate(violations) if violations else np.zeros(0, dtype=bool)
+        return {
+            'row': row.astype(np.int64, copy=False),
+            'rule': rule.astype(np.int64, copy=False),
+            'violation': violation,
+            'fire_count': np.bincount(rule, minlength=self.n_rules),
+            'violation_count': np.bincount(rule[violation], minlength=self.n_rules)
+        }
+
+    def __len__(self):
+        return self.n_rules
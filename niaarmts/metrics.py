@@ -1,5 +1,61 @@
 import pandas as pd
 import numpy as np
+from niaarmts.dataset import WindowIndex
+
+def filter_window(df, start, end, use_interval=False):
+    """
+    Select the transactions inside the given time range or interval range (both bounds inclusive).
+
+    Args:
+        df (pd.DataFrame): The dataset containing the transactions.
+        start (int or datetime): The start of the interval (if use_interval is True) or timestamp range.
+        end (int or datetime): The end of the interval (if use_interval is True) or timestamp range.
+        use_interval (bool): Whether to filter by 'interval' (True) or 'timestamp' (False) for time-based filtering.
+
+    Returns:
+        pd.DataFrame: The transactions inside the range.
+    """
+    col = 'interval' if use_interval else 'timestamp'
+    return df[(df[col] >= start) & (df[col] <= end)]
+
+def calculate_condition_mask(df, condition):
+    """
+    Evaluate a single rule condition on every transaction.
+
+    Args:
+        df (pd.DataFrame): The transactions to evaluate.
+        condition (dict): A dictionary defining the condition (as built by :func:`niaarmts.build_rule`).
+
+    Returns:
+        np.ndarray: Boolean mask of the transactions satisfying the condition. Conditions of other types
+        than 'Numerical' and 'Categorical' are satisfied by every transaction.
+    """
+    values = df[condition['feature']]
+    if condition['type'] == 'Categorical':
+        return (values == condition['category']).to_numpy()
+    elif condition['type'] == 'Numerical':
+        return ((values >= condition['border1']) & (values <= condition['border2'])).to_numpy()
+    return np.ones(len(df), dtype=bool)
+
+def calculate_conditions_mask(df, conditions, mask=None):
+    """
+    Evaluate a conjunction of rule conditions on every transaction.
+
+    Args:
+        df (pd.DataFrame): The transactions to evaluate.
+        conditions (list): A list of dictionaries defining the conditions.
+        mask (np.ndarray): Optional mask of already selected transactions to start from.
+
+    Returns:
+        np.ndarray: Boolean mask of the transactions satisfying all conditions. The evaluation stops as
+        soon as no transaction is left.
+    """
+    mask = np.ones(len(df), dtype=bool) if mask is None else mask.copy()
+    for condition in conditions:
+        if not mask.any():
+            break
+        mask &= calculate_condition_mask(df, condition)
+    return mask
 
 def calculate_support(df, antecedents, consequents, start=0, end=0, use_interval=False):
     """
@@ -106,6 +162,116 @@ def calculate_confidence(df, antecedents, consequents, start, end, use_interval=
     return consequent_count / antecedent_count if antecedent_count > 0 else 0.0
 
 
+def stratified_sample(n_rows, sample_size, n_strata=10, rng=None):
+    """
+    Draw a stratified random sample of row positions.
+
+    The rows are split into `n_strata` consecutive strata of (nearly) equal size, i.e. time slices of
+    the window, and every stratum contributes rows in proportion to its size (without replacement).
+
+    Args:
+        n_rows (int): Number of rows to sample from.
+        sample_size (int): Total number of sampled rows.
+        n_strata (int): Number of strata.
+        rng (np.random.Generator): Random generator; a new unseeded one is used if not given.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Sorted positions of the sampled rows, the stratum of
+        every sampled row and the number of rows in every stratum.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    n_strata = max(1, min(n_strata, n_rows))
+    sample_size = min(sample_size, n_rows)
+
+    bounds = np.linspace(0, n_rows, n_strata + 1).astype(np.int64)
+    sizes = np.diff(bounds)
+
+    # Proportional allocation; the rows left after rounding go to the strata with the largest remainders
+    quota = sample_size * sizes / max(n_rows, 1)
+    counts = np.floor(quota).astype(np.int64)
+    counts[np.argsort(counts - quota, kind='stable')[:sample_size - counts.sum()]] += 1
+    counts = np.minimum(counts, sizes)
+
+    positions = np.concatenate([bounds[h] + np.sort(rng.choice(sizes[h], counts[h], replace=False)) for h in range(n_strata)])
+    strata = np.repeat(np.arange(n_strata), counts)
+    return positions, strata, sizes
+
+def estimate_support_confidence(df, antecedents, consequents, sample_size=1000, n_strata=10, z=1.96, rng=None):
+    """
+    Estimate the support and confidence of a rule from a stratified sample of the transactions.
+
+    Support is estimated with the stratified proportion and confidence with the combined ratio
+    estimator; the confidence intervals use the normal approximation with the finite population
+    correction. Windows with at most `sample_size` rows are evaluated exactly (zero-width intervals).
+
+    Args:
+        df (pd.DataFrame): The transactions inside the time bounds of the rule.
+        antecedents (list): A list of dictionaries defining the antecedent conditions.
+        consequents (list): A list of dictionaries defining the consequent conditions.
+        sample_size (int): Number of sampled rows.
+        n_strata (int): Number of strata (consecutive time slices of the window).
+        z (float): Standard normal quantile of the confidence intervals (1.96 for 95%).
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        dict: 'support' and 'confidence' estimates, their 'support_ci' and 'confidence_ci' intervals
+        (clipped to [0, 1]), 'antecedent_count' and 'rule_count' (matching sampled rows), 'sample_size'
+        and 'rows', the positions of the sampled rows in `df`.
+    """
+    positions, strata, sizes = stratified_sample(len(df), sample_size, n_strata, rng)
+    sample = df.iloc[positions]
+
+    antecedent_mask = calculate_conditions_mask(sample, antecedents)
+    rule_mask = calculate_conditions_mask(sample, consequents, antecedent_mask)
+    x = antecedent_mask.astype(np.float64)
+    y = rule_mask.astype(np.float64)
+
+    n_h = np.bincount(strata, minlength=len(sizes)).astype(np.float64)
+    weights = sizes / max(len(df), 1)
+    taken = n_h > 0
+
+    def stratum_means(values):
+        means = np.zeros(len(sizes))
+        means[taken] = np.bincount(strata, weights=values, minlength=len(sizes))[taken] / n_h[taken]
+        return means
+
+    def stratified_variance(values):
+        # Variance of the stratified mean of per-row values
+        means = stratum_means(values)
+        squares = np.bincount(strata, weights=(values - means[strata]) ** 2, minlength=len(sizes))
+        variance = 0.0
+        for h in np.flatnonzero(n_h > 1):
+            fpc = 1.0 - n_h[h] / sizes[h]
+            variance += weights[h] ** 2 * fpc * squares[h] / (n_h[h] - 1) / n_h[h]
+        return variance
+
+    if len(positions) == len(df):
+        # The whole window was taken, so the plain ratios are exact
+        support = float(y.sum()) / len(df) if len(df) > 0 else 0.0
+        antecedent_support = float(x.sum()) / len(df) if len(df) > 0 else 0.0
+        confidence = float(y.sum()) / float(x.sum()) if x.sum() > 0 else 0.0
+    else:
+        support = float(np.dot(weights, stratum_means(y)))
+        antecedent_support = float(np.dot(weights, stratum_means(x)))
+        confidence = support / antecedent_support if antecedent_support > 0 else 0.0
+
+    support_margin = z * np.sqrt(stratified_variance(y))
+    confidence_margin = 0.0
+    if antecedent_support > 0:
+        confidence_margin = z * np.sqrt(stratified_variance(y - confidence * x)) / antecedent_support
+
+    return {
+        'support': support,
+        'confidence': confidence,
+        'support_ci': (max(0.0, support - support_margin), min(1.0, support + support_margin)),
+        'confidence_ci': (max(0.0, confidence - confidence_margin), min(1.0, confidence + confidence_margin)),
+        'antecedent_count': int(antecedent_mask.sum()),
+        'rule_count': int(rule_mask.sum()),
+        'sample_size': len(positions),
+        'rows': positions
+    }
+
+
 def calculate_inclusion_metric(features, antecedents, consequents):
     """
     Calculate the inclusion metric, which measures how many attributes appear in both the antecedent and consequent
@@ -154,17 +320,15 @@ def calculate_amplitude_metric(df, features, antecedents, consequents, start=0,
     """
 
     # Filter the dataframe based on time or interval
-    if use_interval:
-        df_filtered = df[(df['interval'] >= start) & (df['interval'] <= end)]
-    else:
-        df_filtered = df[(df['timestamp'] >= start) & (df['timestamp'] <= end)]
+    df_filtered = filter_window(df, start, end, use_interval)
+
+    return _amplitude(df_filtered, antecedents + consequents)
 
+def _amplitude(df_filtered, rule_parts, window_stats=None):
+    """Amplitude metric of the rule parts over already filtered transactions (or their cached statistics)."""
     total_metric = 0.0
     total_attributes = 0
 
-    # Combine antecedents and consequents
-    rule_parts = antecedents + consequents
-
     for feature in rule_parts:
         feature_name = feature['feature']
         feature_type = feature['type']
@@ -174,8 +338,11 @@ def calculate_amplitude_metric(df, features, antecedents, consequents, start=0,
             border2 = feature['border2']
 
             if feature_name in df_filtered.columns and not df_filtered[feature_name].empty:
-                feature_min = df_filtered[feature_name].min()
-                feature_max = df_filtered[feature_name].max()
+                if window_stats is not None:
+                    feature_min, feature_max, _ = window_stats.min_max(feature_name)
+                else:
+                    feature_min = df_filtered[feature_name].min()
+                    feature_max = df_filtered[feature_name].max()
             else:
                 continue  # Skip if feature is missing or empty
 
@@ -190,7 +357,10 @@ def calculate_amplitude_metric(df, features, antecedents, consequents, start=0,
         elif feature_type == 'Categorical':
             value = feature['category']
             if feature_name in df_filtered.columns and not df_filtered[feature_name].empty:
-                value_count = df_filtered[feature_name].value_counts(normalize=True).get(value, 0.0)
+                if window_stats is not None:
+                    value_count = window_stats.frequency(feature_name, value)
+                else:
+                    value_count = df_filtered[feature_name].value_counts(normalize=True).get(value, 0.0)
                 inverse_frequency = 1.0 - value_count
                 total_metric += inverse_frequency
                 total_attributes += 1
@@ -216,7 +386,157 @@ def calculate_coverage_metric(df, conditions, start, end, use_interval):
     coverage = mask.sum() / len(df_filtered) if len(df_filtered) > 0 else 0.0
     return coverage
 
-def calculate_timestamp_metric(df, start, end, use_interval: bool = False):
+def _rule_condition_key(condition):
+    # Conditions evaluating to the same mask share a key; other types than 'Numerical' and 'Categorical' match every row
+    if condition['type'] == 'Numerical':
+        return condition['feature'], 'Numerical', condition['border1'], condition['border2']
+    if condition['type'] == 'Categorical':
+        return condition['feature'], 'Categorical', condition['category']
+    return None
+
+def _score_window(df_filtered, rules):
+    n_rules = len(rules)
+    n_rows = len(df_filtered)
+
+    # Distinct conditions of all rules, evaluated once
+    keys = {}
+    for rule in rules:
+        for condition in rule['antecedent'] + rule['consequent']:
+            key = _rule_condition_key(condition)
+            if key is not None and key not in keys:
+                keys[key] = len(keys)
+    masks = [None] * len(keys)
+    columns = {}
+    for key, column in keys.items():
+        if key[0] not in columns:
+            columns[key[0]] = df_filtered[key[0]].to_numpy()
+        values = columns[key[0]]
+        if key[1] == 'Numerical':
+            with np.errstate(invalid='ignore'):
+                masks[column] = (values >= key[2]) & (values <= key[3])
+        else:
+            masks[column] = np.asarray(values == key[2], dtype=bool)
+
+    # Conjunctions shared by several rules (e.g. a common antecedent) are evaluated once
+    conjunctions = {(): np.ones(n_rows, dtype=bool)}
+
+    def conjunction(columns_of_conditions):
+        if columns_of_conditions not in conjunctions:
+            mask = conjunction(columns_of_conditions[:-1]).copy()
+            mask &= masks[columns_of_conditions[-1]]
+            conjunctions[columns_of_conditions] = mask
+        return conjunctions[columns_of_conditions]
+
+    antecedent_count = np.zeros(n_rules, dtype=np.int64)
+    consequent_count = np.zeros(n_rules, dtype=np.int64)
+    rule_count = np.zeros(n_rules, dtype=np.int64)
+    for i, rule in enumerate(rules):
+        antecedent = tuple(keys[key] for key in map(_rule_condition_key, rule['antecedent']) if key is not None)
+        consequent = tuple(keys[key] for key in map(_rule_condition_key, rule['consequent']) if key is not None)
+        antecedent_count[i] = np.count_nonzero(conjunction(antecedent))
+        consequent_count[i] = np.count_nonzero(conjunction(consequent))
+        rule_count[i] = np.count_nonzero(conjunction(antecedent + consequent))
+
+    # Amplitude terms in condition order, so the sums are formed as in _amplitude
+    ranges = {}
+    valid_counts = {}
+    longest = max((len(rule['antecedent']) + len(rule['consequent']) for rule in rules), default=0)
+    terms = np.zeros((n_rules, longest))
+    attributes = np.zeros(n_rules, dtype=np.int64)
+    if n_rows > 0:
+        for i, rule in enumerate(rules):
+            for position, condition in enumerate(rule['antecedent'] + rule['consequent']):
+                feature = condition['feature']
+                if condition['type'] not in ('Numerical', 'Categorical') or feature not in df_filtered.columns:
+                    continue
+                if condition['type'] == 'Numerical':
+                    if feature not in ranges:
+                        ranges[feature] = (df_filtered[feature].min(), df_filtered[feature].max())
+                    feature_min, feature_max = ranges[feature]
+                    if feature_max != feature_min:
+                        normalized_range = (condition['border2'] - condition['border1']) / (feature_max - feature_min)
+                    else:
+                        normalized_range = 0.0
+                    terms[i, position] = 1 - normalized_range
+                else:
+                    # Relative frequency of the category among the present values, as value_counts(normalize=True)
+                    if feature not in valid_counts:
+                        valid_counts[feature] = int(df_filtered[feature].count())
+                    hits = np.count_nonzero(masks[keys[_rule_condition_key(condition)]])
+                    terms[i, position] = 1.0 - (hits / valid_counts[feature] if valid_counts[feature] > 0 else 0.0)
+                attributes[i] += 1
+
+    total = np.zeros(n_rules)
+    for position in range(longest):
+        total = total + terms[:, position]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'support': rule_count / n_rows if n_rows > 0 else np.zeros(n_rules),
+            'confidence': np.where(antecedent_count > 0, rule_count / np.maximum(antecedent_count, 1), 0.0),
+            'amplitude': np.where(attributes > 0, total / np.maximum(attributes, 1), 0.0),
+            'antecedent_coverage': antecedent_count / n_rows if n_rows > 0 else np.zeros(n_rules),
+            'consequent_coverage': consequent_count / n_rows if n_rows > 0 else np.zeros(n_rules),
+            'antecedent_count': antecedent_count,
+            'rule_count': rule_count,
+            'rows': np.full(n_rules, n_rows, dtype=np.int64)
+        }
+
+def score_rules(df, rules, windows=None, use_interval=False):
+    """
+    Calculate support, confidence, amplitude and coverage of many rules at once.
+
+    Every window is selected once and every distinct condition of the rules is evaluated once per window
+    (shared by all rules containing it); conjunctions shared by several rules are also reused. The values
+    match :func:`calculate_support`, :func:`calculate_confidence`, :func:`calculate_amplitude_metric` and
+    :func:`calculate_coverage_metric` (of the antecedent and of the consequent) exactly, except that an
+    empty window gives support 0.0 instead of raising an error.
+
+    Args:
+        df (pd.DataFrame): The dataset containing the transactions.
+        rules (list[dict]): Rules in the archive format (with 'antecedent' and 'consequent', and 'start'
+            and 'end' if no windows are given).
+        windows (list[tuple]): Optional (start, end) windows (both bounds inclusive); every rule is scored
+            in every window. By default every rule is scored in its own window.
+        use_interval (bool): Whether to filter by 'interval' (True) or 'timestamp' (False) for time-based filtering.
+
+    Returns:
+        dict: Arrays 'support', 'confidence', 'amplitude', 'antecedent_coverage', 'consequent_coverage',
+        'antecedent_count', 'rule_count' and 'rows' (transactions in the window), of shape (len(rules),)
+        or, with windows, (len(windows), len(rules)).
+    """
+    # Windows of a sorted time column are contiguous blocks of rows, found by binary search
+    index = WindowIndex.from_dataframe(df, use_interval)
+
+    def select(start, end):
+        if index is None:
+            return filter_window(df, start, end, use_interval)
+        lo, hi = index.rows(start, end)
+        return df.iloc[lo:hi]
+
+    if windows is not None:
+        scores = [_score_window(select(start, end), rules) for start, end in windows]
+        return {name: np.stack([score[name] for score in scores]) if scores else np.zeros((0, len(rules)))
+                for name in ('support', 'confidence', 'amplitude', 'antecedent_coverage', 'consequent_coverage',
+                             'antecedent_count', 'rule_count', 'rows')}
+
+    # Rules sharing a window are scored together
+    groups = {}
+    for i, rule in enumerate(rules):
+        groups.setdefault((rule['start'], rule['end']), []).append(i)
+
+    result = None
+    for (start, end), members in groups.items():
+        score = _score_window(select(start, end), [rules[i] for i in members])
+        if result is None:
+            result = {name: np.zeros(len(rules), dtype=values.dtype) for name, values in score.items()}
+        for name, values in score.items():
+            result[name][members] = values
+    if result is None:
+        result = _score_window(df.iloc[:0], [])
+    return result
+
+def calculate_timestamp_metric(df, start, end, use_interval: bool = False, statistics=None):
     """
     Timestamp Metric (TSM)
     ----------------------
@@ -230,17 +550,22 @@ def calculate_timestamp_metric(df, start, end, use_interval: bool = False):
         start: Segment start (int/float for interval or pandas.Timestamp/datetime for time-series).
         end: Segment end (same type as start).
         use_interval (bool): If True, use the 'interval' column; otherwise use 'timestamp'.
+        statistics (DatasetStatistics): Optional statistics snapshot of `df`; the series bounds are
+            then taken from the snapshot instead of the column.
 
     Returns:
         float: Value in [0, 1]; higher means a shorter segment relative to the whole time series sequence.
     """
     col = "interval" if use_interval else "timestamp"
-    if col not in df.columns:
-        raise KeyError(f"Column '{col}' is required in the dataframe to compute TSM.")
+    if statistics is not None:
+        t0, tT = statistics.get_time_bounds(use_interval)
+    else:
+        if col not in df.columns:
+            raise KeyError(f"Column '{col}' is required in the dataframe to compute TSM.")
 
-    # Determine total series bounds
-    t0 = df[col].min()
-    tT = df[col].max()
+        # Determine total series bounds
+        t0 = df[col].min()
+        tT = df[col].max()
 
     if pd.isna(t0) or pd.isna(tT):
         return 0.0
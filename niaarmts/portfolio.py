@@ -0,0 +1,165 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from niapy.task import Task, OptimizationType
+from niapy.util.factory import get_algorithm
+from niaarmts.NiaARMTS import NiaARMTS
+
+# Problem arguments of the current worker process, set once by the pool initializer
+_worker_problem_kwargs = None
+
+
+def merge_archives(archives):
+    """
+    Merge rule archives of several runs into one archive without duplicates.
+
+    Rules are identified by :meth:`NiaARMTS.rule_representation`. When the same rule was found by more
+    than one run, the entry with the highest fitness is kept.
+
+    Args:
+        archives (list[list[dict]]): Rule archives as returned by :meth:`NiaARMTS.get_rule_archive`.
+
+    Returns:
+        list[dict]: The merged archive, sorted by fitness in descending order.
+    """
+    merged = {}
+    for archive in archives:
+        for entry in archive:
+            key = NiaARMTS.rule_representation(entry['full_rule'])
+            if key not in merged or entry['fitness'] > merged[key]['fitness']:
+                merged[key] = entry
+
+    return sorted(merged.values(), key=lambda x: x['fitness'], reverse=True)
+
+
+def spawn_seeds(seed, n_runs):
+    """
+    Derive independent, reproducible seeds for a number of runs from one base seed.
+
+    Args:
+        seed (int): Base seed. None draws fresh entropy.
+        n_runs (int): Number of seeds to derive.
+
+    Returns:
+        list[int]: One seed per run.
+    """
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(n_runs)]
+
+
+def _init_worker(problem_kwargs):
+    global _worker_problem_kwargs
+    _worker_problem_kwargs = problem_kwargs
+
+
+def _run_single(run):
+    problem = NiaARMTS(**_worker_problem_kwargs)
+    if isinstance(run['algorithm'], str):
+        algorithm = get_algorithm(run['algorithm'], seed=run['seed'], **run['params'])
+    else:
+        algorithm = run['algorithm'](seed=run['seed'], **run['params'])
+
+    task = Task(
+        problem=problem,
+        max_iters=run['max_iters'],
+        max_evals=run['max_evals'],
+        optimization_type=run['optimization_type']
+    )
+
+    started = time.perf_counter()
+    _, best_fitness = algorithm.run(task)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'algorithm': run['algorithm'] if isinstance(run['algorithm'], str) else run['algorithm'].__name__,
+        'seed': run['seed'],
+        'best_fitness': best_fitness,
+        'evaluations': task.evals,
+        'iterations': task.iters,
+        'elapsed': elapsed,
+        'evaluations_per_second': task.evals / elapsed if elapsed > 0 else 0.0,
+        'archive_size': len(problem.rule_archive),
+        'archive': problem.get_rule_archive()
+    }
+
+
+def run_portfolio(
+    problem_kwargs,
+    algorithms,
+    n_runs=None,
+    seed=None,
+    max_iters=np.inf,
+    max_evals=np.inf,
+    algorithm_params=None,
+    n_workers=None,
+    optimization_type=OptimizationType.MAXIMIZATION
+):
+    """
+    Run independent optimizations of the same NiaARMTS problem and merge their rule archives.
+
+    Runs cycle through the given algorithms and receive seeds derived from one base seed, so the
+    whole portfolio is reproducible. Runs are distributed over a process pool; the problem arguments
+    (including the transactions) are sent to every worker process only once.
+
+    Args:
+        problem_kwargs (dict): Keyword arguments for the :class:`NiaARMTS` constructor.
+        algorithms (list): NiaPy algorithm names (e.g. 'ParticleSwarmAlgorithm') or algorithm classes.
+        n_runs (int): Number of runs. Defaults to one run per algorithm.
+        seed (int): Base seed from which the per-run seeds are derived.
+        max_iters (int): Maximum number of iterations of every run.
+        max_evals (int): Maximum number of evaluations of every run.
+        algorithm_params (dict): Optional parameters per algorithm name (or class), e.g.
+            {'ParticleSwarmAlgorithm': {'population_size': 40}}.
+        n_workers (int): Number of worker processes. Defaults to the number of CPUs; 1 runs serially.
+        optimization_type (OptimizationType): Optimization type of every run.
+
+    Returns:
+        dict: 'rules' holds the merged archive, 'runs' the per-run statistics (algorithm, seed,
+        best fitness, evaluations, iterations, archive size, elapsed time and throughput) and
+        'evaluations', 'elapsed' and 'evaluations_per_second' summarize the whole portfolio.
+
+    Raises:
+        ValueError: No algorithm is given or the number of runs is not positive.
+    """
+    if not algorithms:
+        raise ValueError("At least one algorithm is required.")
+
+    n_runs = len(algorithms) if n_runs is None else n_runs
+    if n_runs < 1:
+        raise ValueError("At least one run is required.")
+    algorithm_params = algorithm_params or {}
+    seeds = spawn_seeds(seed, n_runs)
+
+    runs = []
+    for i, run_seed in enumerate(seeds):
+        algorithm = algorithms[i % len(algorithms)]
+        runs.append({
+            'algorithm': algorithm,
+            'seed': run_seed,
+            'params': algorithm_params.get(algorithm, {}),
+            'max_iters': max_iters,
+            'max_evals': max_evals,
+            'optimization_type': optimization_type
+        })
+
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, n_runs))
+
+    started = time.perf_counter()
+    if n_workers == 1:
+        _init_worker(problem_kwargs)
+        results = [_run_single(run) for run in runs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(problem_kwargs,)) as executor:
+            results = list(executor.map(_run_single, runs))
+    elapsed = time.perf_counter() - started
+
+    rules = merge_archives([result.pop('archive') for result in results])
+    evaluations = sum(result['evaluations'] for result in results)
+
+    return {
+        'rules': rules,
+        'runs': results,
+        'evaluations': evaluations,
+        'elapsed': elapsed,
+        'evaluations_per_second': evaluations / elapsed if elapsed > 0 else 0.0
+    }
@@ -0,0 +1,126 @@
+import numpy as np
+from niaarmts.dataset import problem_dimension
+from niaarmts.feature import column_type
+
+
+def calculate_dimension(features, transactions, interval_range=False):
+    """
+    Calculate the problem dimension for a (reduced) feature metadata dictionary, with the rules of
+    :meth:`Dataset.calculate_problem_dimension` (see :func:`niaarmts.dataset.problem_dimension`).
+
+    Args:
+        features (dict): A dictionary of feature metadata.
+        transactions (pd.DataFrame): The transactions.
+        interval_range (bool): Mine rules over ranges of intervals instead of single intervals.
+
+    Returns:
+        int: The dimension of the problem.
+    """
+    column_types = {column: column_type(dtype) for column, dtype in transactions.dtypes.items()}
+    return problem_dimension(features, column_types, interval_range)
+
+
+def _correlated(values, threshold):
+    # Greedy selection: a column is redundant if it is highly correlated with an earlier kept column
+    valid = ~np.isnan(values)
+    counts = np.maximum(valid.sum(axis=0), 1)
+    means = np.where(valid, values, 0.0).sum(axis=0) / counts
+    centered = np.where(valid, values - means, 0.0)
+    norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+    norms[norms == 0] = 1.0
+    standardized = centered / norms
+    correlation = np.abs(standardized.T @ standardized)
+
+    redundant = {}
+    kept = []
+    for j in range(values.shape[1]):
+        duplicates = [i for i in kept if correlation[i, j] >= threshold]
+        if duplicates:
+            redundant[j] = duplicates[0]
+        else:
+            kept.append(j)
+    return redundant
+
+
+def reduce_features(
+    transactions,
+    features,
+    nan_threshold=1.0,
+    variance_threshold=0.0,
+    correlation_threshold=0.98,
+    antecedent=None,
+    consequent=None,
+    interval_range=False
+):
+    """
+    Remove features that only inflate the search space before optimization.
+
+    Removed are features of unsupported types, features whose fraction of missing values reaches
+    `nan_threshold` (all-NaN columns by default), constant features (numerical variance at most
+    `variance_threshold`, categorical features with at most one category) and numerical features whose
+    absolute Pearson correlation with an earlier kept feature reaches `correlation_threshold`. With
+    antecedent and consequent whitelists, features allowed on neither side are removed as well.
+
+    Args:
+        transactions (pd.DataFrame): The transactions.
+        features (dict): A dictionary of feature metadata (see :meth:`Dataset.get_all_features_with_metadata`).
+        nan_threshold (float): Fraction of missing values at which a feature is removed.
+        variance_threshold (float): Variance at or below which a numerical feature is constant.
+        correlation_threshold (float): Absolute correlation at which a numerical feature is a near-duplicate
+            (None disables the check).
+        antecedent (list[str]): Optional whitelist of features allowed in antecedents.
+        consequent (list[str]): Optional whitelist of features allowed in consequents.
+        interval_range (bool): Mine rules over ranges of intervals instead of single intervals.
+
+    Returns:
+        dict: 'features' holds the reduced feature metadata, 'removed' maps removed features to the
+        reason of their removal, 'dimension' is the reduced problem dimension and 'antecedent_features'
+        and 'consequent_features' are the whitelists restricted to the kept features (None if not given).
+    """
+    removed = {}
+    names = list(features)
+
+    for name in names:
+        if features[name]['type'] not in ('Numerical', 'Categorical'):
+            removed[name] = 'unsupported type'
+
+    # A side without a whitelist allows every feature
+    if antecedent is not None and consequent is not None:
+        allowed = set(antecedent) | set(consequent)
+        for name in names:
+            if name not in allowed and name not in removed:
+                removed[name] = 'not whitelisted'
+
+    candidates = [name for name in names if name not in removed]
+    if candidates:
+        missing = transactions[candidates].isna().to_numpy().mean(axis=0)
+        for name, fraction in zip(candidates, missing):
+            if fraction >= nan_threshold:
+                removed[name] = 'missing values'
+
+    numerical = [name for name in names if name not in removed and features[name]['type'] == 'Numerical']
+    if numerical:
+        values = transactions[numerical].to_numpy(dtype=np.float64)
+        variances = np.nanvar(values, axis=0)
+        for name, variance in zip(numerical, variances):
+            if variance <= variance_threshold:
+                removed[name] = 'constant'
+
+        numerical = [name for name in numerical if name not in removed]
+        if correlation_threshold is not None and len(numerical) > 1:
+            values = transactions[numerical].to_numpy(dtype=np.float64)
+            for j, i in _correlated(values, correlation_threshold).items():
+                removed[numerical[j]] = f'correlated with {numerical[i]}'
+
+    for name in names:
+        if name not in removed and features[name]['type'] == 'Categorical' and transactions[name].nunique() <= 1:
+            removed[name] = 'constant'
+
+    reduced = {name: meta for name, meta in features.items() if name not in removed}
+    return {
+        'features': reduced,
+        'removed': removed,
+        'dimension': calculate_dimension(reduced, transactions, interval_range),
+        'antecedent_features': [name for name in antecedent if name in reduced] if antecedent is not None else None,
+        'consequent_features': [name for name in consequent if name in reduced] if consequent is not None else None
+    }
@@ -0,0 +1,106 @@
+import numpy as np
+from niaarmts.archive import RuleArchive
+
+# Weights of calculate_fitness, in the order of the metrics they weight
+WEIGHT_NAMES = ('alpha', 'beta', 'gamma', 'delta', 'epsilon')
+METRIC_NAMES = ('support', 'confidence', 'inclusion', 'amplitude', 'tsm')
+
+
+def metric_matrix(archive):
+    """
+    Stored metrics of the archived rules.
+
+    Args:
+        archive (list[dict] or RuleArchive): Archive entries.
+
+    Returns:
+        np.ndarray: Array of shape (rules, 5) with the metrics of :data:`METRIC_NAMES`.
+    """
+    if isinstance(archive, RuleArchive):
+        records = archive.records
+        return np.column_stack([records[name] for name in METRIC_NAMES]).astype(np.float64).reshape(-1, len(METRIC_NAMES))
+    return np.array([[entry[name] for name in METRIC_NAMES] for entry in archive], dtype=np.float64).reshape(-1, len(METRIC_NAMES))
+
+
+def weight_matrix(profiles):
+    """
+    Weight vectors of named weight profiles.
+
+    Args:
+        profiles (dict or list): Profiles by name (or a list of profiles, named by their position).
+            A profile is a dictionary of the weights 'alpha', ..., 'epsilon' (missing weights are 1.0,
+            as in :func:`niaarmts.metrics.calculate_fitness`) or a sequence of the five weights.
+
+    Returns:
+        tuple: The profile names and an array of shape (profiles, 5) with their weights.
+
+    Raises:
+        ValueError: A profile has unknown weights, a wrong number of weights or no positive weight.
+    """
+    items = list(profiles.items()) if isinstance(profiles, dict) else list(enumerate(profiles))
+    names = []
+    weights = np.ones((len(items), len(WEIGHT_NAMES)), dtype=np.float64)
+    for k, (name, profile) in enumerate(items):
+        if isinstance(profile, dict):
+            unknown = set(profile) - set(WEIGHT_NAMES)
+            if unknown:
+                raise ValueError(f"Unknown weights in profile {name!r}: {sorted(unknown)}")
+            for i, weight_name in enumerate(WEIGHT_NAMES):
+                weights[k, i] = profile.get(weight_name, 1.0)
+        else:
+            if len(profile) != len(WEIGHT_NAMES):
+                raise ValueError(f"Profile {name!r} must have {len(WEIGHT_NAMES)} weights.")
+            weights[k] = profile
+        if not (weights[k] > 0).any():
+            raise ValueError(f"Profile {name!r} has no positive weight.")
+        names.append(name)
+    return names, weights
+
+
+def reweight_fitness(archive, profiles):
+    """
+    Recompute the fitness of every archived rule under several weight profiles.
+
+    The fitness is :func:`niaarmts.metrics.calculate_fitness` of the stored support, confidence,
+    inclusion, amplitude and TSM, evaluated for all rules and profiles at once. The weighted terms are
+    added in the same order as in :func:`calculate_fitness`, so the values are identical to it.
+
+    Args:
+        archive (list[dict] or RuleArchive): Archive entries.
+        profiles (dict or list): Weight profiles (see :func:`weight_matrix`).
+
+    Returns:
+        dict: 'profiles' holds the profile names and 'fitness' an array of shape (profiles, rules).
+    """
+    names, weights = weight_matrix(profiles)
+    metrics = metric_matrix(archive)
+
+    fitness = np.zeros((len(names), len(metrics)), dtype=np.float64)
+    for i in range(len(WEIGHT_NAMES)):
+        fitness += weights[:, i:i + 1] * metrics[:, i]
+    fitness /= (weights > 0).sum(axis=1, keepdims=True)
+    return {'profiles': names, 'fitness': fitness}
+
+
+def rank_archive(archive, profiles, top_k=None):
+    """
+    Rank the archived rules under several weight profiles.
+
+    Args:
+        archive (list[dict] or RuleArchive): Archive entries.
+        profiles (dict or list): Weight profiles (see :func:`weight_matrix`).
+        top_k (int): Keep only the best rules of every profile.
+
+    Returns:
+        dict: Per profile name, the archive entries in descending order of their fitness under the
+        profile (ties keep their archive order), with 'fitness' set to that fitness. The entries are
+        copies; the archive is not modified.
+    """
+    entries = archive if isinstance(archive, RuleArchive) else list(archive)
+    result = reweight_fitness(entries, profiles)
+
+    rankings = {}
+    for name, fitness in zip(result['profiles'], result['fitness']):
+        order = np.argsort(-fitness, kind='stable')[:top_k]
+        rankings[name] = [{**entries[int(i)], 'fitness': float(fitness[i])} for i in order]
+    return rankings
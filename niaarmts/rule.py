@@ -1,6 +1,6 @@
 import numpy as np
 
-def build_rule(solution, features, is_time_series=False, start=None, end=None, transactions=None):
+def build_rule(solution, features, is_time_series=False, start=None, end=None, transactions=None, window=None, window_stats=None):
     """
     Build association rules based on a given solution and feature metadata.
 
@@ -11,6 +11,9 @@ def build_rule(solution, features, is_time_series=False, start=None, end=None, t
         start (datetime): Start timestamp for filtering time series data.
         end (datetime): End timestamp for filtering time series data.
         transactions (pd.DataFrame): Transaction data for calculating time-based feature bounds.
+        window (pd.DataFrame): Transactions already filtered to [start, end]; when given, `transactions` is not filtered again.
+        window_stats (WindowStats): Cached statistics of the window (see :class:`niaarmts.window_stats.WindowStatsCache`);
+            when given, the feature bounds are read from them instead of the transactions.
 
     Returns:
         list: A list of rules constructed from the solution and features.
@@ -35,7 +38,9 @@ def build_rule(solution, features, is_time_series=False, start=None, end=None, t
 
     # Filter transactions if time series is active
     ts_filtered = None
-    if is_time_series and transactions is not None and start is not None and end is not None:
+    if window is not None or window_stats is not None:
+        ts_filtered = window
+    elif is_time_series and transactions is not None and start is not None and end is not None:
         ts_filtered = transactions[(transactions['timestamp'] >= start) & (transactions['timestamp'] <= end)]
     else: # filter according to the interval values
         ts_filtered = transactions[(transactions['interval'] >= start) & (transactions['interval'] <= end)]
@@ -56,7 +61,12 @@ def build_rule(solution, features, is_time_series=False, start=None, end=None, t
         if solution_part[vector_position] > solution_part[threshold_position]:
             if feature_type != 'Categorical':
                 # Use filtered bounds if available for this feature
-                if ts_filtered is not None and feature_name in ts_filtered.columns:
+                if window_stats is not None:
+                    temp_min, temp_max, present = window_stats.min_max(feature_name)
+                    if present == 0:
+                        temp_min = feature_meta['min']
+                        temp_max = feature_meta['max']
+                elif ts_filtered is not None and feature_name in ts_filtered.columns:
                     series = ts_filtered[feature_name].dropna()
                     if not series.empty:
                         temp_min = series.min()
@@ -0,0 +1,413 @@
+import asyncio
+import json
+import numbers
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+from niaarmts.dataset import WindowIndex
+from niaarmts.metrics import filter_window
+
+CONDITION_TYPES = ('Numerical', 'Categorical')
+
+
+class RuleScorer:
+    def __init__(self, transactions, use_interval=False):
+        """
+        Batch evaluation of support, confidence and stability of ad hoc rules against resident transactions.
+
+        The transactions and their window index stay in memory between batches. Within a batch, every
+        distinct window is selected once and the distinct conditions on a feature are evaluated together,
+        in one broadcast comparison of the feature column against all their borders (or categories). The
+        results follow :func:`niaarmts.metrics.calculate_support`, :func:`niaarmts.metrics.calculate_confidence`
+        and :func:`niaarmts.rule_stability.calculate_stability_score`, except that an empty window has
+        support 0.0 instead of raising an error.
+
+        Args:
+            transactions (pd.DataFrame): The transactions (see :meth:`Dataset.get_all_transactions`).
+            use_interval (bool): Select windows by the 'interval' column instead of the 'timestamp' column.
+        """
+        self.transactions = transactions
+        self.use_interval = use_interval
+        self.time_column = 'interval' if use_interval else 'timestamp'
+        if self.time_column not in transactions.columns:
+            raise ValueError(f"Transactions have no '{self.time_column}' column.")
+        self.datetime = pd.api.types.is_datetime64_any_dtype(transactions[self.time_column].dtype)
+        self.window_index = WindowIndex.from_dataframe(transactions, use_interval)
+
+    def parse_time(self, value):
+        """
+        Convert a JSON start or end of a window to a value of the time column.
+        """
+        if self.datetime:
+            return pd.Timestamp(value)
+        return self._parse_number(value)
+
+    def parse_delta(self, value):
+        """
+        Convert a JSON stability offset to an offset of the time column. Offsets of timestamps are
+        Timedelta strings (e.g. '6h') or numbers of seconds.
+        """
+        if self.datetime:
+            return pd.Timedelta(seconds=value) if isinstance(value, (int, float)) else pd.Timedelta(value)
+        return self._parse_number(value)
+
+    @staticmethod
+    def _parse_number(value):
+        if isinstance(value, bool) or not isinstance(value, numbers.Real):
+            raise ValueError(f"Expected a number, got {value!r}.")
+        return value
+
+    def parse_condition(self, condition):
+        """
+        Validate a condition of a rule; numerical borders are converted to floats.
+
+        Raises:
+            ValueError: The condition is malformed or refers to an unknown feature.
+        """
+        if not isinstance(condition, dict):
+            raise ValueError("A condition must be a JSON object.")
+        if 'type' not in condition:
+            raise ValueError("Condition is missing 'type'.")
+        if condition['type'] not in CONDITION_TYPES:
+            return condition
+        if condition.get('feature') not in self.transactions.columns:
+            raise ValueError(f"Unknown feature '{condition.get('feature')}'.")
+        if condition['type'] == 'Numerical':
+            if 'border1' not in condition or 'border2' not in condition:
+                raise ValueError("Numerical condition must have 'border1' and 'border2'.")
+            try:
+                return {**condition, 'border1': float(condition['border1']), 'border2': float(condition['border2'])}
+            except (TypeError, ValueError):
+                raise ValueError("Borders of a numerical condition must be numbers.") from None
+        if 'category' not in condition:
+            raise ValueError("Categorical condition must have 'category'.")
+        if isinstance(condition['category'], (dict, list)):
+            raise ValueError("Category of a categorical condition must be a scalar.")
+        return condition
+
+    def parse_rule(self, rule):
+        """
+        Validate a rule of a request and convert its window.
+
+        Args:
+            rule (dict): 'antecedent' and 'consequent' (lists of conditions as built by
+                :func:`niaarmts.build_rule`), 'start' and 'end' of the window (both inclusive) and an
+                optional stability offset 'delta'.
+
+        Returns:
+            dict: The rule with converted window bounds and offset.
+
+        Raises:
+            ValueError: The rule is malformed or refers to an unknown feature.
+        """
+        if not isinstance(rule, dict):
+            raise ValueError("A rule must be a JSON object.")
+        for key in ('antecedent', 'consequent', 'start', 'end'):
+            if key not in rule:
+                raise ValueError(f"Rule is missing '{key}'.")
+
+        parsed = {'start': self.parse_time(rule['start']), 'end': self.parse_time(rule['end'])}
+        for side in ('antecedent', 'consequent'):
+            if not isinstance(rule[side], list):
+                raise ValueError(f"Rule '{side}' must be a list of conditions.")
+            parsed[side] = [self.parse_condition(condition) for condition in rule[side]]
+        if rule.get('delta') is not None:
+            parsed['delta'] = self.parse_delta(rule['delta'])
+        return parsed
+
+    def _window(self, start, end):
+        if self.window_index is not None:
+            lo, hi = self.window_index.rows(start, end)
+            return self.transactions.iloc[lo:hi]
+        return filter_window(self.transactions, start, end, self.use_interval)
+
+    @staticmethod
+    def _condition_key(condition):
+        if condition['type'] == 'Numerical':
+            return condition['feature'], 'Numerical', float(condition['border1']), float(condition['border2'])
+        return condition['feature'], 'Categorical', condition['category']
+
+    def _condition_masks(self, window, conditions):
+        # Distinct conditions per feature, evaluated with one broadcast comparison per feature
+        by_feature = {}
+        for key in {self._condition_key(condition) for condition in conditions}:
+            by_feature.setdefault((key[0], key[1]), []).append(key)
+
+        masks = {}
+        for (feature, kind), keys in by_feature.items():
+            values = window[feature].to_numpy()
+            if kind == 'Numerical':
+                borders = np.array([key[2:] for key in keys], dtype=np.float64)
+                with np.errstate(invalid='ignore'):
+                    matches = (values[:, None] >= borders[:, 0]) & (values[:, None] <= borders[:, 1])
+            else:
+                categories = np.empty(len(keys), dtype=object)
+                categories[:] = [key[2] for key in keys]
+                matches = values.astype(object)[:, None] == categories[None, :]
+            for i, key in enumerate(keys):
+                masks[key] = matches[:, i]
+        return masks
+
+    def _counts(self, window, masks, antecedent, consequent):
+        mask = np.ones(len(window), dtype=bool)
+        for condition in antecedent:
+            if condition['type'] in CONDITION_TYPES:
+                mask &= masks[self._condition_key(condition)]
+        antecedent_count = int(np.count_nonzero(mask))
+        for condition in consequent:
+            if condition['type'] in CONDITION_TYPES:
+                mask &= masks[self._condition_key(condition)]
+        return antecedent_count, int(np.count_nonzero(mask))
+
+    def score(self, rules):
+        """
+        Evaluate a batch of parsed rules (see :meth:`parse_rule`).
+
+        Args:
+            rules (list[dict]): The rules with their windows.
+
+        Returns:
+            list[dict]: Per rule 'support', 'confidence', 'rows' (transactions in the window),
+            'antecedent_count' and 'rule_count', and 'stability' for rules with a 'delta'.
+        """
+        # Every rule needs its own window and, for the stability score, the windows shifted by -delta and +delta
+        jobs = {}
+        for i, rule in enumerate(rules):
+            windows = [(rule['start'], rule['end'])]
+            if 'delta' in rule:
+                windows += [(rule['start'] - rule['delta'], rule['end'] - rule['delta']),
+                            (rule['start'] + rule['delta'], rule['end'] + rule['delta'])]
+            for j, window in enumerate(windows):
+                jobs.setdefault(window, []).append((i, j))
+
+        quality = [[0.0, 0.0, 0.0] for _ in rules]
+        results = [None] * len(rules)
+        for (start, end), members in jobs.items():
+            window = self._window(start, end)
+            conditions = [condition for i, _ in members for condition in rules[i]['antecedent'] + rules[i]['consequent']
+                          if condition['type'] in CONDITION_TYPES]
+            masks = self._condition_masks(window, conditions)
+
+            for i, j in members:
+                antecedent_count, rule_count = self._counts(window, masks, rules[i]['antecedent'], rules[i]['consequent'])
+                support = rule_count / len(window) if len(window) > 0 else 0.0
+                confidence = rule_count / antecedent_count if antecedent_count > 0 else 0.0
+                quality[i][j] = 0.5 * (support + confidence)
+                if j == 0:
+                    results[i] = {
+                        'support': support,
+                        'confidence': confidence,
+                        'rows': len(window),
+                        'antecedent_count': antecedent_count,
+                        'rule_count': rule_count
+                    }
+
+        for i, rule in enumerate(rules):
+            if 'delta' in rule:
+                current, minus, plus = quality[i]
+                results[i]['stability'] = round(float(np.sqrt((minus - current) ** 2 + (plus - current) ** 2)), 4)
+        return results
+
+
+class ScoringService:
+    def __init__(self, scorer, host='127.0.0.1', port=0, max_batch=256, batch_delay=0.002, latency_window=10000):
+        """
+        Local asyncio HTTP/JSON service that scores rules against a resident :class:`RuleScorer`.
+
+        Endpoints:
+            POST /score: body {"rules": [...]} (see :meth:`RuleScorer.parse_rule`); responds with
+                {"results": [...], "latency_ms": ..., "p99_ms": ...}.
+            GET /stats: latency percentiles and batching counters.
+            GET /health: {"status": "ok"}.
+
+        Concurrent requests are coalesced: rules arriving within `batch_delay` seconds of the first
+        waiting request (up to `max_batch` rules) are evaluated as one batch in a worker thread, so the
+        event loop keeps accepting requests meanwhile.
+
+        Args:
+            scorer (RuleScorer): The scorer holding the transactions.
+            host (str): Address to listen on (localhost by default).
+            port (int): Port to listen on (0 picks a free port, see :attr:`port` after :meth:`start`).
+            max_batch (int): Maximum number of rules per coalesced batch.
+            batch_delay (float): Seconds to wait for more requests before evaluating a batch.
+            latency_window (int): Number of most recent request latencies kept for the percentiles.
+        """
+        self.scorer = scorer
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.latencies = deque(maxlen=latency_window)
+        self.requests = 0
+        self.batches = 0
+        self.server = None
+        self._queue = None
+        self._batcher = None
+
+    async def start(self):
+        """
+        Start listening and evaluating batches.
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Stop listening and cancel the batch loop.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+    async def serve_forever(self):
+        """
+        Start the service and serve until cancelled.
+        """
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def score(self, rules):
+        """
+        Score rules (JSON objects as in a /score request) through the batch queue.
+
+        Returns:
+            list[dict]: The results of :meth:`RuleScorer.score`.
+
+        Raises:
+            ValueError: A rule is malformed.
+        """
+        started = time.perf_counter()
+        parsed = [self.scorer.parse_rule(rule) for rule in rules]
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((parsed, future))
+        results = await future
+        self.latencies.append((time.perf_counter() - started) * 1000.0)
+        self.requests += 1
+        return results
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.batch_delay
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            rules = [rule for parsed, _ in batch for rule in parsed]
+            self.batches += 1
+            try:
+                results = await loop.run_in_executor(None, self.scorer.score, rules)
+            except Exception:
+                # Score the requests one by one, so only the failing ones get the error
+                for parsed, future in batch:
+                    try:
+                        result = await loop.run_in_executor(None, self.scorer.score, parsed)
+                    except Exception as error:
+                        if not future.done():
+                            future.set_exception(error)
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+                continue
+
+            offset = 0
+            for parsed, future in batch:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(parsed)])
+                offset += len(parsed)
+
+    def latency_stats(self):
+        """
+        Latency percentiles (milliseconds) of the most recent requests and the batching counters.
+
+        Returns:
+            dict: 'requests', 'batches', 'p50_ms', 'p99_ms' and 'max_ms' (None before the first request).
+        """
+        stats = {'requests': self.requests, 'batches': self.batches, 'p50_ms': None, 'p99_ms': None, 'max_ms': None}
+        if self.latencies:
+            latencies = np.fromiter(self.latencies, dtype=np.float64)
+            stats['p50_ms'] = float(np.percentile(latencies, 50))
+            stats['p99_ms'] = float(np.percentile(latencies, 99))
+            stats['max_ms'] = float(latencies.max())
+        return stats
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                if len(parts) < 2:
+                    status, payload = 400, {'error': 'Malformed request line.'}
+                else:
+                    status, payload = await self._dispatch(parts[0], parts[1], body)
+
+                data = json.dumps(payload).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/stats':
+            return 200, self.latency_stats()
+        if method == 'POST' and path == '/score':
+            started = time.perf_counter()
+            try:
+                request = json.loads(body or b'{}')
+                rules = request['rules'] if isinstance(request, dict) and 'rules' in request else None
+                if not isinstance(rules, list):
+                    raise ValueError("Request body must be an object with a 'rules' list.")
+                results = await self.score(rules)
+            except (ValueError, TypeError, KeyError) as error:
+                return 400, {'error': str(error)}
+            return 200, {
+                'results': results,
+                'latency_ms': (time.perf_counter() - started) * 1000.0,
+                'p99_ms': self.latency_stats()['p99_ms']
+            }
+        return 404, {'error': f"No route for {method} {path}."}
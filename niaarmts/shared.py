@@ -0,0 +1,89 @@
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+
+def share_dataframe(df):
+    """
+    Copy the columns of a data frame into shared memory blocks.
+
+    Numerical, boolean and datetime columns are stored as they are; object columns are stored as
+    categorical codes, with the categories kept in the returned specification. Worker processes
+    rebuild the data frame on top of the shared blocks with :func:`attach_dataframe`, so the
+    transactions exist in memory only once, regardless of the number of workers.
+
+    Args:
+        df (pd.DataFrame): The dataset containing the transactions.
+
+    Returns:
+        tuple[dict, list[SharedMemory]]: A picklable specification of the shared data frame and the
+        shared memory blocks. The caller owns the blocks and has to release them with
+        :func:`release_shared`.
+    """
+    spec = {'columns': [], 'n_rows': len(df)}
+    blocks = []
+
+    for column in df.columns:
+        values = df[column]
+        categories = None
+        if values.dtype == 'object' or isinstance(values.dtype, pd.CategoricalDtype):
+            categorical = pd.Categorical(values)
+            array = categorical.codes
+            categories = list(categorical.categories)
+        else:
+            array = values.to_numpy()
+
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        spec['columns'].append({
+            'name': column,
+            'block': block.name,
+            'dtype': array.dtype.str,
+            'categories': categories
+        })
+
+    return spec, blocks
+
+
+def attach_dataframe(spec):
+    """
+    Rebuild a data frame shared with :func:`share_dataframe` without copying its columns.
+
+    Object columns come back as pandas categoricals, which compare equal to their category values.
+
+    Args:
+        spec (dict): Specification returned by :func:`share_dataframe`.
+
+    Returns:
+        tuple[pd.DataFrame, list[SharedMemory]]: The data frame and the attached blocks, which must be
+        kept alive (and closed with :func:`release_shared`) as long as the data frame is used.
+    """
+    columns = {}
+    blocks = []
+
+    for column in spec['columns']:
+        block = shared_memory.SharedMemory(name=column['block'])
+        blocks.append(block)
+
+        array = np.ndarray((spec['n_rows'],), dtype=np.dtype(column['dtype']), buffer=block.buf)
+        if column['categories'] is not None:
+            columns[column['name']] = pd.Categorical.from_codes(array, categories=column['categories'])
+        else:
+            columns[column['name']] = array
+
+    return pd.DataFrame(columns, copy=False), blocks
+
+
+def release_shared(blocks, unlink=False):
+    """
+    Close shared memory blocks and optionally free them.
+
+    Args:
+        blocks (list[SharedMemory]): Blocks returned by :func:`share_dataframe` or :func:`attach_dataframe`.
+        unlink (bool): Free the memory as well; only the creating process should do this.
+    """
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
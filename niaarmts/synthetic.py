@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+
+class SyntheticGenerator:
+    def __init__(
+        self,
+        n_rows,
+        numerical=3,
+        categorical=1,
+        categories=('low', 'mid', 'high'),
+        value_range=(0.0, 100.0),
+        noise=0.05,
+        nan_rate=0.0,
+        planted_rules=None,
+        interval=False,
+        rows_per_interval=50,
+        start='2024-01-01 00:00:00',
+        freq='10s',
+        seed=None
+    ):
+        """
+        Initialize a generator of synthetic time series (or interval) transaction tables.
+
+        The produced tables have the same layout as the shipped datasets, so they can be loaded with
+        :class:`niaarmts.Dataset` and mined with :class:`niaarmts.NiaARMTS` directly. Numerical columns
+        follow a noisy sine wave, categorical columns are drawn uniformly from their categories and
+        planted rules are enforced on a fraction of the rows in their time window.
+
+        Args:
+            n_rows (int): Total number of rows (transactions) to generate.
+            numerical (int or list[str]): Number of numerical columns or their names.
+            categorical (int or list[str]): Number of categorical columns or their names.
+            categories (tuple[str]): Categories used for every categorical column.
+            value_range (tuple[float, float]): Range of the values of numerical columns.
+            noise (float): Standard deviation of the Gaussian noise, relative to the value range.
+            nan_rate (float): Probability that a cell not covered by a planted rule is NaN.
+            planted_rules (list[dict]): Rules to plant. Each rule is a dictionary with 'antecedent' and
+                'consequent' lists (in the same format as rules built by :func:`niaarmts.build_rule`),
+                'start' and 'end' fractions of the series in [0, 1], 'coverage' (fraction of the window
+                rows on which the antecedent is enforced, default 0.3) and 'confidence' (probability that
+                the consequent holds on those rows, default 1.0).
+            interval (bool): Generate an 'interval' column instead of a 'timestamp' column.
+            rows_per_interval (int): Number of consecutive rows sharing one interval id.
+            start (str or pd.Timestamp): Timestamp of the first row.
+            freq (str or pd.Timedelta): Time between two consecutive rows.
+            seed (int): Seed of the random generator.
+
+        Raises:
+            ValueError: Planted rule refers to an unknown feature or has an invalid window.
+        """
+        if n_rows <= 0:
+            raise ValueError("Number of rows must be positive.")
+
+        self.n_rows = int(n_rows)
+        self.numerical = [f'num_{i}' for i in range(numerical)] if isinstance(numerical, int) else list(numerical)
+        self.categorical = [f'cat_{i}' for i in range(categorical)] if isinstance(categorical, int) else list(categorical)
+        self.categories = np.asarray(categories, dtype=object)
+        self.value_range = value_range
+        self.noise = noise
+        self.nan_rate = nan_rate
+        self.interval = interval
+        self.rows_per_interval = int(rows_per_interval)
+        self.start = pd.Timestamp(start)
+        self.freq = pd.Timedelta(freq)
+        self.seed = seed
+
+        self.planted_rules = [self._validate_rule(rule) for rule in (planted_rules or [])]
+
+        # Per-column wave parameters are drawn once, so every chunk continues the same signal
+        rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+        self._periods = rng.uniform(0.05, 0.5, len(self.numerical)) * self.n_rows + 1.0
+        self._phases = rng.uniform(0.0, 2.0 * np.pi, len(self.numerical))
+
+    def _validate_rule(self, rule):
+        for condition in rule['antecedent'] + rule['consequent']:
+            if condition['type'] == 'Numerical' and condition['feature'] not in self.numerical:
+                raise ValueError(f"Planted rule refers to unknown numerical feature '{condition['feature']}'.")
+            if condition['type'] == 'Categorical':
+                if condition['feature'] not in self.categorical:
+                    raise ValueError(f"Planted rule refers to unknown categorical feature '{condition['feature']}'.")
+                if condition['category'] not in self.categories:
+                    raise ValueError(f"Planted rule refers to unknown category '{condition['category']}'.")
+
+        if not 0.0 <= rule['start'] <= rule['end'] <= 1.0:
+            raise ValueError("Planted rule window must satisfy 0 <= start <= end <= 1.")
+
+        return {
+            'antecedent': rule['antecedent'],
+            'consequent': rule['consequent'],
+            'start': rule['start'],
+            'end': rule['end'],
+            'coverage': rule.get('coverage', 0.3),
+            'confidence': rule.get('confidence', 1.0)
+        }
+
+    def _rule_rows(self, rule):
+        """Global row range [lo, hi) covered by the window of a planted rule."""
+        last = self.n_rows - 1
+        return int(round(rule['start'] * last)), int(round(rule['end'] * last)) + 1
+
+    def _row_time(self, rows):
+        if self.interval:
+            return rows // self.rows_per_interval + 1
+        return pd.DatetimeIndex(self.start + rows * self.freq)
+
+    def planted_rule_windows(self):
+        """
+        Resolve the windows of the planted rules to the values of the time column.
+
+        Returns:
+            list[dict]: Planted rules with 'start' and 'end' given as timestamps (or interval ids),
+            ready to be passed to the metrics functions.
+        """
+        resolved = []
+        for rule in self.planted_rules:
+            lo, hi = self._rule_rows(rule)
+            bounds = self._row_time(np.array([lo, hi - 1]))
+            resolved.append({**rule, 'start': bounds[0], 'end': bounds[1]})
+        return resolved
+
+    def iter_chunks(self, chunk_size=100_000):
+        """
+        Generate the table chunk by chunk.
+
+        Every chunk uses its own random stream derived from the seed, so the generated table is
+        reproducible for a fixed seed and chunk size.
+
+        Args:
+            chunk_size (int): Number of rows per chunk.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the table.
+        """
+        low, high = self.value_range
+        mid = (low + high) / 2.0
+        amplitude = (high - low) / 2.0
+        root = np.random.SeedSequence(self.seed)
+
+        for chunk_idx, chunk_lo in enumerate(range(0, self.n_rows, chunk_size)):
+            chunk_hi = min(chunk_lo + chunk_size, self.n_rows)
+            size = chunk_hi - chunk_lo
+            rows = np.arange(chunk_lo, chunk_hi)
+            rng = np.random.default_rng(np.random.SeedSequence(root.entropy, spawn_key=(chunk_idx + 1,)))
+
+            columns = {}
+            for i, name in enumerate(self.numerical):
+                wave = mid + 0.8 * amplitude * np.sin(2.0 * np.pi * rows / self._periods[i] + self._phases[i])
+                values = wave + rng.normal(0.0, self.noise * (high - low), size)
+                columns[name] = np.clip(values, low, high)
+            for name in self.categorical:
+                columns[name] = self.categories[rng.integers(0, len(self.categories), size)]
+
+            # Rows on which a planted rule was enforced are protected from NaN injection
+            planted = {name: np.zeros(size, dtype=bool) for name in columns}
+            for rule in self.planted_rules:
+                rule_lo, rule_hi = self._rule_rows(rule)
+                lo, hi = max(rule_lo, chunk_lo), min(rule_hi, chunk_hi)
+                if lo >= hi:
+                    continue
+                local = np.arange(lo - chunk_lo, hi - chunk_lo)
+                covered = local[rng.random(len(local)) < rule['coverage']]
+                holds = covered[rng.random(len(covered)) < rule['confidence']]
+                self._plant(columns, planted, rule['antecedent'], covered, rng)
+                self._plant(columns, planted, rule['consequent'], holds, rng)
+
+            if self.nan_rate > 0.0:
+                for name, values in columns.items():
+                    missing = (rng.random(size) < self.nan_rate) & ~planted[name]
+                    if name in self.categorical:
+                        values = values.copy()
+                        values[missing] = np.nan
+                    else:
+                        values = np.where(missing, np.nan, values)
+                    columns[name] = values
+
+            time_values = self._row_time(rows)
+            if self.interval:
+                chunk = pd.DataFrame({'interval': time_values, **columns})
+            else:
+                chunk = pd.DataFrame({**columns, 'timestamp': time_values})
+            chunk.index = pd.RangeIndex(chunk_lo, chunk_hi)
+            yield chunk
+
+    def _plant(self, columns, planted, conditions, rows, rng):
+        for condition in conditions:
+            name = condition['feature']
+            if condition['type'] == 'Numerical':
+                columns[name][rows] = rng.uniform(condition['border1'], condition['border2'], len(rows))
+            else:
+                columns[name][rows] = condition['category']
+            planted[name][rows] = True
+
+    def generate(self, chunk_size=100_000):
+        """
+        Generate the whole table in memory.
+
+        Args:
+            chunk_size (int): Number of rows per chunk (see :meth:`iter_chunks`).
+
+        Returns:
+            pd.DataFrame: The generated transactions.
+        """
+        return pd.concat(self.iter_chunks(chunk_size))
+
+    def to_csv(self, file_path, chunk_size=100_000):
+        """
+        Stream the table to a CSV file chunk by chunk, so tables larger than memory can be generated.
+
+        Args:
+            file_path (str): The path to save the CSV file.
+            chunk_size (int): Number of rows held in memory at once.
+        """
+        with open(file_path, 'w', newline='') as f:
+            for i, chunk in enumerate(self.iter_chunks(chunk_size)):
+                chunk.to_csv(f, index=False, header=(i == 0))
+        print(f"Synthetic dataset saved to {file_path}.")
@@ -0,0 +1,183 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from niaarmts.dataset import WindowIndex
+
+
+class WindowStats:
+    def __init__(self, cache, lo, hi):
+        """
+        Statistics of the transactions of one window (rows lo, ..., hi - 1), computed per feature on first use.
+
+        Args:
+            cache (WindowStatsCache): The cache the statistics belong to (holds the column arrays).
+            lo (int): First row of the window.
+            hi (int): Row after the last row of the window.
+        """
+        self.cache = cache
+        self.lo = lo
+        self.hi = hi
+        self.rows = hi - lo
+        self._ranges = {}
+        self._histograms = {}
+
+    def min_max(self, feature):
+        """
+        Minimum and maximum of the present (non-NaN) values of a feature in the window.
+
+        Returns:
+            tuple: (min, max, count) with the number of present values; min and max are NaN if there
+            are none. The values are those of pandas' `min` and `max` on the window column.
+        """
+        if feature not in self._ranges:
+            self._ranges[feature] = self.cache._min_max(feature, self.lo, self.hi)
+        return self._ranges[feature]
+
+    def histogram(self, feature):
+        """
+        Category histogram of a feature in the window.
+
+        Returns:
+            tuple: (categories, counts, present): the distinct values of the column, the number of their
+            occurrences in the window (aligned with the categories) and the number of present values.
+        """
+        if feature not in self._histograms:
+            codes, categories = self.cache._codes(feature)
+            window_codes = codes[self.lo:self.hi]
+            counts = np.bincount(window_codes[window_codes >= 0], minlength=len(categories))
+            self._histograms[feature] = (categories, counts, int(counts.sum()))
+        return self._histograms[feature]
+
+    def frequency(self, feature, category):
+        """
+        Relative frequency of a category among the present values of a feature, as
+        `value_counts(normalize=True).get(category, 0.0)` on the window column.
+        """
+        _, counts, present = self.histogram(feature)
+        code = self.cache._category_codes[feature].get(category)
+        if code is None or present == 0 or counts[code] == 0:
+            return 0.0
+        return counts[code] / np.int64(present)
+
+
+class WindowStatsCache:
+    def __init__(self, transactions, window_index=None, use_interval=False, max_entries=4096):
+        """
+        LRU cache of per-window statistics shared by rule decoding, the amplitude metric and the
+        explanations.
+
+        The statistics of a window (row count, minimum and maximum of numerical features and category
+        histograms, see :class:`WindowStats`) are keyed by its row range, so every individual decoded
+        into the same window reuses them, whatever its exact time bounds. Columns are converted to
+        arrays (categorical ones to integer codes) once, so a miss only reduces slices of them.
+
+        Args:
+            transactions (pd.DataFrame): The transactions, sorted by the time column.
+            window_index (WindowIndex): Row offset index of the time column. By default it is built from
+                the transactions.
+            use_interval (bool): Windows are interval ids instead of timestamps.
+            max_entries (int): Maximum number of cached windows; least recently used windows are evicted.
+
+        Raises:
+            ValueError: The time column is missing or not sorted, or the cache size is not positive.
+        """
+        if max_entries <= 0:
+            raise ValueError("Cache size must be positive.")
+        if window_index is None:
+            window_index = WindowIndex.from_dataframe(transactions, use_interval)
+        if window_index is None:
+            raise ValueError("Window statistics require a sorted time column.")
+
+        self.transactions = transactions
+        self.window_index = window_index
+        self.n_rows = len(transactions)
+        self.max_entries = max_entries
+
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._values = {}
+        self._category_codes = {}
+        self._categories = {}
+
+    def _column(self, feature):
+        if feature not in self._values:
+            self._values[feature] = self.transactions[feature].to_numpy()
+        return self._values[feature]
+
+    def _codes(self, feature):
+        if feature not in self._categories:
+            codes, categories = pd.factorize(self.transactions[feature], use_na_sentinel=True)
+            self._categories[feature] = (codes.astype(np.int64), categories)
+            self._category_codes[feature] = {category: code for code, category in enumerate(categories)}
+        return self._categories[feature]
+
+    def _min_max(self, feature, lo, hi):
+        values = self._column(feature)
+        if values.dtype.kind in 'iu':
+            if hi <= lo:
+                return np.nan, np.nan, 0
+            window = values[lo:hi]
+            return window.min(), window.max(), hi - lo
+        if values.dtype.kind == 'f':
+            window = values[lo:hi]
+            present = window[~np.isnan(window)]
+            if len(present) == 0:
+                return np.nan, np.nan, 0
+            return present.min(), present.max(), len(present)
+        # Other dtypes keep pandas' semantics
+        series = self.transactions[feature].iloc[lo:hi].dropna()
+        if series.empty:
+            return np.nan, np.nan, 0
+        return series.min(), series.max(), len(series)
+
+    def get(self, lo, hi):
+        """
+        Statistics of the window of rows lo, ..., hi - 1, from the cache or created (and cached).
+
+        Returns:
+            WindowStats: The statistics of the window.
+        """
+        key = (lo, hi)
+        stats = self.entries.get(key)
+        if stats is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return stats
+
+        self.misses += 1
+        stats = WindowStats(self, lo, hi)
+        self.entries[key] = stats
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return stats
+
+    def window(self, start, end):
+        """
+        Statistics of the window [start, end] (both inclusive) of the time column.
+        """
+        return self.get(*self.window_index.rows(start, end))
+
+    def stats(self):
+        """
+        Cache statistics.
+
+        Returns:
+            dict: 'hits', 'misses', 'hit_rate', 'evictions' and 'entries'.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries)
+        }
+
+    def clear(self):
+        """
+        Drop all cached windows (the statistics are kept).
+        """
+        self.entries.clear()
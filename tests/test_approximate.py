@@ -0,0 +1,71 @@
+import os
+import unittest
+import numpy as np
+from niaarmts import Dataset, SyntheticGenerator
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.metrics import estimate_support_confidence, calculate_conditions_mask, stratified_sample
+
+class TestApproximateEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.df = SyntheticGenerator(20000, numerical=2, categorical=1, seed=5).generate()
+        self.antecedent = [{'feature': 'num_0', 'type': 'Numerical', 'border1': 20.0, 'border2': 60.0, 'category': 'EMPTY'}]
+        self.consequent = [{'feature': 'cat_0', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'low'}]
+
+    def test_stratified_sample(self):
+        positions, strata, sizes = stratified_sample(1005, 100, 10, np.random.default_rng(0))
+        self.assertEqual(len(positions), 100)
+        self.assertEqual(sizes.sum(), 1005)
+        self.assertTrue(np.all(np.diff(positions) > 0))
+        bounds = np.concatenate(([0], np.cumsum(sizes)))
+        self.assertTrue(np.all((positions >= bounds[strata]) & (positions < bounds[strata + 1])))
+
+    def test_intervals_cover_exact_values(self):
+        antecedent_mask = calculate_conditions_mask(self.df, self.antecedent)
+        rule_mask = calculate_conditions_mask(self.df, self.consequent, antecedent_mask)
+        support = rule_mask.sum() / len(self.df)
+        confidence = rule_mask.sum() / antecedent_mask.sum()
+
+        rng = np.random.default_rng(1)
+        covered = 0
+        for _ in range(100):
+            estimate = estimate_support_confidence(self.df, self.antecedent, self.consequent, sample_size=500, rng=rng)
+            self.assertEqual(estimate['sample_size'], 500)
+            covered += estimate['support_ci'][0] <= support <= estimate['support_ci'][1]
+            covered += estimate['confidence_ci'][0] <= confidence <= estimate['confidence_ci'][1]
+        self.assertGreater(covered, 170)
+
+    def test_small_windows_are_exact(self):
+        window = self.df.iloc[:300]
+        estimate = estimate_support_confidence(window, self.antecedent, self.consequent, sample_size=1000)
+        rule_count = calculate_conditions_mask(window, self.antecedent + self.consequent).sum()
+        self.assertEqual(estimate['support'], rule_count / len(window))
+        self.assertEqual(estimate['support_ci'][0], estimate['support_ci'][1])
+
+    def test_archive_is_exact(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        exact = NiaARMTS(*args)
+        approximate = NiaARMTS(*args, approximate=True, sample_size=10, sample_seed=0, pruning=True, prune_top_k=20)
+
+        for solution in np.random.default_rng(2).random((300, args[0])):
+            approximate._evaluate(solution)
+            exact._evaluate(solution)
+
+        self.assertGreater(approximate.approximate_evaluations, 0)
+        self.assertGreater(approximate.rescored_evaluations, 0)
+        exact_rules = {NiaARMTS.rule_representation(entry['full_rule']): entry for entry in exact.rule_archive}
+        for entry in approximate.rule_archive:
+            reference = exact_rules[NiaARMTS.rule_representation(entry['full_rule'])]
+            for metric in ['fitness', 'support', 'confidence', 'amplitude']:
+                self.assertEqual(entry[metric], reference[metric])
+
+    def test_requires_pruning(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        with self.assertRaises(ValueError):
+            NiaARMTS(*args, approximate=True)
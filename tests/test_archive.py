@@ -0,0 +1,76 @@
+import os
+import pickle
+import tracemalloc
+import unittest
+import numpy as np
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.archive import RuleArchive
+
+class TestRuleArchive(unittest.TestCase):
+
+    def mine(self, file_name, interval, backend):
+        dataset = Dataset()
+        dataset.load_data_from_csv(file_name, timestamp_col=None if interval == 'true' else 'timestamp')
+        problem = NiaARMTS(dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                           dataset.get_all_transactions(), interval, 1.0, 1.0, 1.0, 1.0, 1.0, archive_backend=backend)
+        rng = np.random.default_rng(0)
+        for _ in range(300):
+            problem._evaluate(rng.random(problem.dimension))
+        return problem
+
+    def test_matches_list_backend(self):
+        for file_name, interval in [(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false'),
+                                    ("datasets/intervals.csv", 'true')]:
+            expected = self.mine(file_name, interval, 'list').get_rule_archive()
+            archive = self.mine(file_name, interval, 'structured').get_rule_archive()
+            self.assertIsInstance(archive, RuleArchive)
+            self.assertEqual(len(archive), len(expected))
+            self.assertEqual(archive.to_dicts(), expected)
+            self.assertEqual(archive[:3], expected[:3])
+            self.assertEqual(archive[-1], expected[-1])
+
+    def test_memory_per_rule(self):
+        problem = self.mine(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false', 'structured')
+        archive = problem.rule_archive
+
+        tracemalloc.start()
+        rules = archive.to_dicts()
+        dict_bytes = tracemalloc.get_traced_memory()[0] / len(rules)
+        tracemalloc.stop()
+        self.assertLess(archive.nbytes / len(archive), dict_bytes / 10)
+
+    def test_vectorized_filter(self):
+        problem = self.mine(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false', 'structured')
+        archive = problem.get_rule_archive()
+        rules = archive.to_dicts()
+
+        mask = archive.feature_mask('humidity', side='consequent')
+        expected = [any(c['feature'] == 'humidity' for c in rule['consequent']) for rule in rules]
+        self.assertEqual(mask.tolist(), expected)
+
+        selected = archive.filter(mask & (archive.records['support'] > 0.1))
+        self.assertEqual(selected.to_dicts(), [rule for rule, hit in zip(rules, expected) if hit and rule['support'] > 0.1])
+
+        archive.sort_by('support', descending=False)
+        support = archive.records['support']
+        self.assertTrue(np.all(support[:-1] <= support[1:]))
+
+    def test_unknown_category(self):
+        features = {'color': {'type': 'Categorical', 'categories': ['red', 'blue']},
+                    'size': {'type': 'Numerical', 'categories': None}}
+        entry = {'fitness': 0.5, 'support': 0.5, 'confidence': 1.0, 'inclusion': 0.0, 'amplitude': 0.0, 'tsm': 0.0,
+                 'start': 0, 'end': 3, 'cut': 1,
+                 'antecedent': [{'feature': 'color', 'type': 'Categorical', 'category': 'green', 'border1': 1.0, 'border2': 1.0}],
+                 'consequent': [{'feature': 'size', 'type': 'Numerical', 'category': 'EMPTY', 'border1': 0.5, 'border2': 2.0}]}
+        archive = RuleArchive.from_rules(features, [entry], interval=True)
+        decoded = archive[0]
+        self.assertEqual(decoded['antecedent'], entry['antecedent'])
+        self.assertEqual(decoded['consequent'], entry['consequent'])
+        self.assertEqual(archive.categories[0], ['red', 'blue', 'green'])
+
+    def test_checkpoint_restore(self):
+        problem = self.mine(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false', 'structured')
+        restored = self.mine(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false', 'structured')
+        restored.set_rule_archive(pickle.loads(pickle.dumps(problem.rule_archive)))
+        self.assertEqual(restored.rule_archive.to_dicts(), problem.rule_archive.to_dicts())
@@ -0,0 +1,82 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.archive_index import ArchiveIndex
+
+class TestArchiveIndex(unittest.TestCase):
+
+    def mine(self, file_name, interval, backend='list'):
+        dataset = Dataset()
+        dataset.load_data_from_csv(file_name, timestamp_col=None if interval == 'true' else 'timestamp')
+        problem = NiaARMTS(dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                           dataset.get_all_transactions(), interval, 1.0, 1.0, 1.0, 1.0, 1.0, archive_backend=backend)
+        rng = np.random.default_rng(0)
+        for _ in range(400):
+            problem._evaluate(rng.random(problem.dimension))
+        return problem
+
+    def brute_force(self, rules, start=None, end=None, features=(), side=None, categories=None, min_fitness=None):
+        sides = [side] if side else ['antecedent', 'consequent']
+        selected = []
+        for rule in sorted(rules, key=lambda rule: -rule['fitness']):
+            conditions = [condition for s in sides for condition in rule[s]]
+            if start is not None and rule['end'] < start:
+                continue
+            if end is not None and rule['start'] > end:
+                continue
+            if not all(any(c['feature'] == feature for c in conditions) for feature in features):
+                continue
+            if not all(any(c['feature'] == feature and c['category'] == category and c['type'] == 'Categorical' for c in conditions)
+                       for feature, category in (categories or {}).items()):
+                continue
+            if min_fitness is not None and rule['fitness'] < min_fitness:
+                continue
+            selected.append(rule)
+        return selected
+
+    def test_matches_linear_scan(self):
+        problem = self.mine(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false')
+        rules = list(problem.get_rule_archive())
+        index = problem.get_archive_index()
+        self.assertEqual(len(index), len(rules))
+
+        times = problem.transactions['timestamp']
+        features = list(problem.features)
+        rng = np.random.default_rng(1)
+        for _ in range(200):
+            start, end = sorted(rng.choice(times.to_numpy(), 2))
+            start, end = pd.Timestamp(start), pd.Timestamp(end)
+            chosen = list(rng.choice(features, rng.integers(0, 3), replace=False))
+            side = rng.choice([None, 'antecedent', 'consequent'])
+            min_fitness = None if rng.random() < 0.5 else float(rng.uniform(0.0, 2.0))
+            filters = dict(start=start, end=end, features=chosen, side=side, min_fitness=min_fitness)
+            self.assertEqual(index.query(**filters), self.brute_force(rules, **filters))
+            self.assertEqual(index.query(top_k=5, **filters), self.brute_force(rules, **filters)[:5])
+
+        self.assertEqual(index.query(), self.brute_force(rules))
+        self.assertEqual(index.query(start=times.iloc[-1]), self.brute_force(rules, start=times.iloc[-1]))
+
+    def test_categories_and_intervals(self):
+        problem = self.mine("datasets/intervals.csv", 'true', backend='structured')
+        rules = problem.get_rule_archive().to_dicts()
+        index = ArchiveIndex(problem.rule_archive)
+        self.assertTrue(index.interval)
+
+        categorical = [(c['feature'], c['category']) for rule in rules for c in rule['full_rule'] if c['type'] == 'Categorical']
+        if categorical:
+            feature, category = categorical[0]
+            for side in [None, 'antecedent', 'consequent']:
+                self.assertEqual(index.query(categories={feature: category}, side=side),
+                                 self.brute_force(rules, categories={feature: category}, side=side))
+        for start in range(0, 5):
+            self.assertEqual(index.query(start=start, end=start + 1), self.brute_force(rules, start=start, end=start + 1))
+        with self.assertRaises(ValueError):
+            index.with_feature(problem.rule_archive.features[0], side='both')
+
+    def test_empty_archive(self):
+        index = ArchiveIndex([])
+        self.assertEqual(index.query(start=0, end=10, features='a'), [])
+        self.assertEqual(index.query(top_k=3), [])
@@ -0,0 +1,79 @@
+import math
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.archive_io import read_rules_jsonl, read_rules_npz, write_rules_jsonl, write_rules_npz
+
+class TestArchiveIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def mine(self, file_name, interval):
+        dataset = Dataset()
+        dataset.load_data_from_csv(file_name, timestamp_col=None if interval == 'true' else 'timestamp')
+        problem = NiaARMTS(dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                           dataset.get_all_transactions(), interval, 1.0, 1.0, 1.0, 1.0, 1.0)
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            problem._evaluate(rng.random(problem.dimension))
+        self.assertGreater(len(problem.rule_archive), 0)
+        return problem
+
+    def assertSameRules(self, loaded, archive):
+        self.assertEqual(len(loaded), len(archive))
+        for got, expected in zip(loaded, archive):
+            for key in ['full_rule', 'antecedent', 'consequent', 'fitness', 'support', 'confidence',
+                        'inclusion', 'amplitude', 'tsm', 'start', 'end']:
+                self.assertEqual(got[key], expected[key])
+
+    def test_jsonl_roundtrip(self):
+        problem = self.mine(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false')
+        for name in ['rules.jsonl', 'rules.jsonl.gz']:
+            path = os.path.join(self.tmp.name, name)
+            problem.save_rules_to_jsonl(path)
+            loaded = read_rules_jsonl(path)
+            self.assertSameRules(loaded, problem.get_rule_archive())
+            self.assertIsInstance(loaded[0]['start'], pd.Timestamp)
+
+    def test_npz_roundtrip(self):
+        problem = self.mine(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false')
+        path = os.path.join(self.tmp.name, 'rules.npz')
+        problem.save_rules_to_npz(path)
+        self.assertSameRules(read_rules_npz(path), problem.get_rule_archive())
+
+        arrays = read_rules_npz(path, as_arrays=True)
+        self.assertEqual(len(arrays['fitness']), len(problem.rule_archive))
+        self.assertEqual(arrays['rule_offsets'][-1], len(arrays['border1']))
+
+    def test_interval_roundtrip(self):
+        problem = self.mine("datasets/intervals.csv", 'true')
+        archive = problem.get_rule_archive()
+        write_rules_npz(archive, os.path.join(self.tmp.name, 'rules.npz'))
+        write_rules_jsonl(archive, os.path.join(self.tmp.name, 'rules.jsonl'))
+        self.assertSameRules(read_rules_npz(os.path.join(self.tmp.name, 'rules.npz')), archive)
+        self.assertSameRules(read_rules_jsonl(os.path.join(self.tmp.name, 'rules.jsonl')), archive)
+
+    def test_category_types_roundtrip(self):
+        categories = ['a', 3, 2.5, np.int64(7), float('nan'), True, None]
+        rules = [{'fitness': 0.5, 'support': 0.5, 'confidence': 1.0, 'inclusion': 0.0, 'amplitude': 0.0, 'tsm': 0.0,
+                  'start': 0, 'end': 3,
+                  'antecedent': [{'feature': 'f', 'type': 'Categorical', 'category': category, 'border1': 1.0, 'border2': 1.0}],
+                  'consequent': [{'feature': 'g', 'type': 'Numerical', 'category': 'EMPTY', 'border1': 0.0, 'border2': 1.0}]}
+                 for category in categories]
+        path = os.path.join(self.tmp.name, 'rules.npz')
+        write_rules_npz(rules, path)
+        loaded = [rule['antecedent'][0]['category'] for rule in read_rules_npz(path)]
+        for got, expected in zip(loaded, categories):
+            if isinstance(expected, float) and math.isnan(expected):
+                self.assertTrue(isinstance(got, float) and math.isnan(got))
+            else:
+                self.assertEqual(got, expected)
+                self.assertIs(type(got), int if isinstance(expected, np.integer) else type(expected))
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts import SyntheticGenerator, DatasetStatistics
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.backtest import backtest, rolling_origin, METRIC_NAMES
+from niaarmts.metrics import calculate_support, calculate_confidence
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.df = SyntheticGenerator(3000, numerical=2, categorical=1, nan_rate=0.02, seed=11).generate()
+        train = self.df.iloc[:1500].reset_index(drop=True)
+        features = DatasetStatistics.from_dataframe(train).feature_metadata()
+        dimension = sum(4 if meta['type'] == 'Numerical' else 3 for meta in features.values()) + 3
+        problem = NiaARMTS(dimension, 0.0, 1.0, features, train, 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        for solution in np.random.default_rng(0).random((200, dimension)):
+            problem._evaluate(solution)
+        self.rules = problem.get_rule_archive()[:40]
+        self.windows = rolling_origin(train['timestamp'].iloc[-1], self.df['timestamp'].iloc[-1], pd.Timedelta(minutes=30), step='20min')
+
+    def test_rolling_origin(self):
+        windows = rolling_origin(0, 10, 3)
+        self.assertEqual(windows, [(0, 3), (3, 6), (6, 9)])
+        self.assertEqual(rolling_origin(0, 10, 4, step=2), [(0, 4), (2, 6), (4, 8), (6, 10)])
+        self.assertEqual(rolling_origin('2024-01-01', '2024-01-03', '1D'),
+                         [(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02')), (pd.Timestamp('2024-01-02'), pd.Timestamp('2024-01-03'))])
+        with self.assertRaises(ValueError):
+            rolling_origin(0, 10, 3, step=0)
+
+    def test_metrics_tensor(self):
+        result = backtest(self.df, self.rules, self.windows)
+        self.assertEqual(result['metrics'].shape, (len(self.windows), len(self.rules), len(METRIC_NAMES)))
+        self.assertEqual(result['metrics'].dtype, np.float32)
+        for k in [0, len(self.windows) // 2, len(self.windows) - 1]:
+            start, end = self.windows[k]
+            for i, rule in enumerate(self.rules):
+                expected = calculate_support(self.df, rule['antecedent'], rule['consequent'], start, end)
+                self.assertEqual(result['metrics'][k, i, 0], np.float32(expected))
+                expected = calculate_confidence(self.df, rule['antecedent'], rule['consequent'], start, end)
+                self.assertEqual(result['metrics'][k, i, 1], np.float32(expected))
+
+        summary = result['summary']
+        confidence = result['metrics'][..., 1].astype(np.float64)
+        np.testing.assert_allclose(summary['confidence_mean'], confidence.mean(axis=0))
+        np.testing.assert_allclose(summary['confidence_drop'], [rule['confidence'] for rule in self.rules] - confidence.mean(axis=0))
+        np.testing.assert_allclose(summary['confidence_min'], confidence.min(axis=0))
+        self.assertTrue(np.all((summary['hit_rate'] >= 0.0) & (summary['hit_rate'] <= 1.0)))
+
+    def test_empty_windows_are_ignored(self):
+        last = self.df['timestamp'].iloc[-1]
+        windows = self.windows[:2] + [(last + pd.Timedelta(days=1), last + pd.Timedelta(days=2))]
+        result = backtest(self.df, self.rules, windows)
+        self.assertEqual(result['rows'][-1], 0)
+        self.assertTrue(np.isnan(result['metrics'][-1]).all())
+        np.testing.assert_allclose(result['summary']['support_mean'], result['metrics'][:2, :, 0].astype(np.float64).mean(axis=0))
+
+    def test_parallel_matches_serial(self):
+        serial = backtest(self.df, self.rules, self.windows, n_workers=1)
+        parallel = backtest(self.df, self.rules, self.windows, n_workers=2, chunk_size=7)
+        np.testing.assert_array_equal(serial['metrics'], parallel['metrics'])
+        np.testing.assert_array_equal(serial['rule_count'], parallel['rule_count'])
+        np.testing.assert_array_equal(serial['rows'], parallel['rows'])
@@ -0,0 +1,65 @@
+import os
+import unittest
+import numpy as np
+from niaarmts import Dataset, SyntheticGenerator
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.bitmap import BitmapIndex, count_bits, unpack_bits
+from niaarmts.metrics import calculate_conditions_mask
+
+class TestBitmapIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = Dataset()
+        self.dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        self.features = self.dataset.get_all_features_with_metadata()
+        self.transactions = self.dataset.get_all_transactions()
+
+    def random_conditions(self, rng, n):
+        conditions = []
+        for feature, meta in self.features.items():
+            if meta['type'] == 'Numerical':
+                border1, border2 = sorted(rng.uniform(meta['min'], meta['max'], 2))
+                conditions.append({'feature': feature, 'type': 'Numerical', 'border1': border1, 'border2': border2, 'category': 'EMPTY'})
+            elif meta['type'] == 'Categorical':
+                category = rng.choice(meta['categories'])
+                conditions.append({'feature': feature, 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': category})
+        return [conditions[i] for i in rng.permutation(len(conditions))[:n]]
+
+    def test_masks_match_comparisons(self):
+        rng = np.random.default_rng(0)
+        for n_bins in [1, 4, 64]:
+            index = BitmapIndex(self.transactions, self.features, n_bins)
+            for _ in range(200):
+                lo, hi = sorted(rng.integers(0, len(self.transactions) + 1, 2))
+                conditions = self.random_conditions(rng, rng.integers(1, 4))
+                expected = calculate_conditions_mask(self.transactions.iloc[lo:hi], conditions)
+                bits = index.conditions_bits(conditions, lo, hi)
+                self.assertEqual(count_bits(bits), int(expected.sum()))
+                np.testing.assert_array_equal(unpack_bits(bits, lo, hi), expected)
+
+    def test_missing_values(self):
+        df = SyntheticGenerator(500, numerical=1, categorical=1, nan_rate=0.1, seed=3).generate()
+        index = BitmapIndex(df, {'num_0': {'type': 'Numerical'}, 'cat_0': {'type': 'Categorical'}}, 16)
+        conditions = [
+            {'feature': 'num_0', 'type': 'Numerical', 'border1': -np.inf, 'border2': np.inf, 'category': 'EMPTY'},
+            {'feature': 'cat_0', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'low'}
+        ]
+        for condition in conditions:
+            expected = calculate_conditions_mask(df, [condition])
+            self.assertLess(int(expected.sum()), len(df))
+            self.assertEqual(count_bits(index.condition_bits(condition, 0, len(df))), int(expected.sum()))
+
+    def test_problem_with_bitmap_gives_same_fitness(self):
+        args = (self.dataset.calculate_problem_dimension(), 0.0, 1.0, self.features, self.transactions, 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        exact = NiaARMTS(*args)
+        indexed = NiaARMTS(*args, bitmap_index=self.dataset.get_bitmap_index(16))
+        rng = np.random.default_rng(1)
+        for solution in rng.random((300, args[0])):
+            self.assertEqual(exact._evaluate(solution), indexed._evaluate(solution))
+        self.assertEqual(len(exact.rule_archive), len(indexed.rule_archive))
+
+    def test_bitmap_requires_window_index(self):
+        shuffled = self.transactions.sample(frac=1.0, random_state=0)
+        with self.assertRaises(ValueError):
+            NiaARMTS(self.dataset.calculate_problem_dimension(), 0.0, 1.0, self.features, shuffled, 'false',
+                     1.0, 1.0, 1.0, 1.0, 1.0, bitmap_index=self.dataset.get_bitmap_index())
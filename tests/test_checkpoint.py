@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from niapy.algorithms.basic import ParticleSwarmAlgorithm
+from niapy.task import Task, OptimizationType
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.checkpoint import save_checkpoint, load_checkpoint, restore_checkpoint, run_with_checkpoints
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        self.args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                     dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.ckpt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_pso(self, max_iters, resume, **problem_kwargs):
+        # Seeded sampling generator, so the run state of separate runs can be compared
+        problem_kwargs.setdefault('sample_seed', 0)
+        problem = NiaARMTS(*self.args, **problem_kwargs)
+        task = Task(problem=problem, max_iters=max_iters, optimization_type=OptimizationType.MAXIMIZATION)
+        algorithm = ParticleSwarmAlgorithm(population_size=10, seed=1)
+        best = run_with_checkpoints(algorithm, task, self.path, interval=0.0, resume=resume)
+        return problem, task, best
+
+    def test_resume_matches_uninterrupted_run(self):
+        problem, task, best = self.run_pso(6, resume=False)
+        os.remove(self.path)
+
+        self.run_pso(3, resume=False)
+        resumed_problem, resumed_task, resumed_best = self.run_pso(6, resume=True)
+
+        self.assertEqual(resumed_best[1], best[1])
+        self.assertEqual(resumed_task.evals, task.evals)
+        self.assertEqual(resumed_problem.evaluations, problem.evaluations)
+        self.assertEqual([r['fitness'] for r in resumed_problem.get_rule_archive()],
+                         [r['fitness'] for r in problem.get_rule_archive()])
+
+    def assert_same_run_state(self, resumed, uninterrupted):
+        resumed_state, state = resumed.get_run_state(), uninterrupted.get_run_state()
+        self.assertEqual(resumed_state['counters'], state['counters'])
+        self.assertEqual(resumed_state['archive_keys'], state['archive_keys'])
+        self.assertEqual(resumed_state['top_fitness'], state['top_fitness'])
+        self.assertEqual(resumed_state['best_fitness'], state['best_fitness'])
+        self.assertEqual(resumed_state['sample_rng'], state['sample_rng'])
+        self.assertEqual(list(resumed.get_rule_archive()), list(uninterrupted.get_rule_archive()))
+
+    def test_resume_restores_run_state(self):
+        kwargs = {'pruning': True, 'prune_top_k': 5}
+        problem, task, best = self.run_pso(6, resume=False, **kwargs)
+        os.remove(self.path)
+
+        self.run_pso(3, resume=False, **kwargs)
+        resumed_problem, resumed_task, resumed_best = self.run_pso(6, resume=True, **kwargs)
+
+        self.assertEqual(resumed_best[1], best[1])
+        self.assertGreater(problem.pruned_evaluations, 0)
+        self.assert_same_run_state(resumed_problem, problem)
+
+    def test_resume_approximate_run(self):
+        kwargs = {'approximate': True, 'sample_size': 50, 'sample_seed': 2, 'pruning': True, 'prune_top_k': 5}
+        problem, _, best = self.run_pso(6, resume=False, **kwargs)
+        os.remove(self.path)
+
+        self.run_pso(3, resume=False, **kwargs)
+        resumed_problem, _, resumed_best = self.run_pso(6, resume=True, **kwargs)
+
+        self.assertEqual(resumed_best[1], best[1])
+        self.assertGreater(problem.approximate_evaluations, 0)
+        self.assert_same_run_state(resumed_problem, problem)
+
+    def test_resume_compacting_run(self):
+        kwargs = {'compact_every': 7, 'compaction': {'tolerance': 0.5, 'border_tolerance': 0.5}}
+        problem, _, best = self.run_pso(6, resume=False, **kwargs)
+        os.remove(self.path)
+
+        self.run_pso(3, resume=False, **kwargs)
+        resumed_problem, _, resumed_best = self.run_pso(6, resume=True, **kwargs)
+
+        self.assertEqual(resumed_best[1], best[1])
+        self.assertGreater(problem.compacted_rules, 0)
+        self.assertEqual(resumed_problem.compacted_rules, problem.compacted_rules)
+        self.assert_same_run_state(resumed_problem, problem)
+
+    def test_resume_multi_fidelity_run(self):
+        kwargs = {'fidelity_schedule': [(0, 4), (50, 1)], 'fidelity_threshold': 0.5}
+        problem, _, best = self.run_pso(6, resume=False, **kwargs)
+        os.remove(self.path)
+
+        self.run_pso(3, resume=False, **kwargs)
+        resumed_problem, _, resumed_best = self.run_pso(6, resume=True, **kwargs)
+
+        self.assertEqual(resumed_best[1], best[1])
+        self.assertGreater(problem.promoted_evaluations, 0)
+        self.assertEqual(resumed_problem.coarse_evaluations, problem.coarse_evaluations)
+        self.assertEqual(resumed_problem.promoted_evaluations, problem.promoted_evaluations)
+        self.assert_same_run_state(resumed_problem, problem)
+
+    def test_restore_does_not_reevaluate(self):
+        problem, _, _ = self.run_pso(2, resume=False)
+        restored = NiaARMTS(*self.args)
+        restore_checkpoint(load_checkpoint(self.path), restored)
+
+        self.assertEqual(restored.evaluations, problem.evaluations)
+        self.assertEqual(restored.best_fitness, problem.best_fitness)
+        self.assertEqual(len(restored.rule_archive), len(problem.rule_archive))
+        # Duplicate detection works on restored rules
+        entry = restored.rule_archive[0]
+        restored.add_rule_to_archive(entry['full_rule'], entry['antecedent'], entry['consequent'], entry['fitness'],
+                                     entry['start'], entry['end'], entry['support'], entry['confidence'],
+                                     entry['inclusion'], entry['amplitude'], entry['tsm'])
+        self.assertEqual(len(restored.rule_archive), len(problem.rule_archive))
+
+    def test_atomic_write_replaces_checkpoint(self):
+        problem = NiaARMTS(*self.args)
+        save_checkpoint(self.path, problem)
+        problem.evaluations = 7
+        save_checkpoint(self.path, problem)
+        self.assertEqual(load_checkpoint(self.path)['problem']['counters']['evaluations'], 7)
+        self.assertEqual(os.listdir(self.tmp.name), ['run.ckpt'])
@@ -0,0 +1,81 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.archive import RuleArchive
+from niaarmts.compaction import compact_archive
+
+def numerical(feature, border1, border2):
+    return {'feature': feature, 'type': 'Numerical', 'border1': border1, 'border2': border2, 'category': 'EMPTY'}
+
+def categorical(feature, category):
+    return {'feature': feature, 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': category}
+
+def entry(antecedent, consequent, fitness, support, confidence, start=0, end=10):
+    return {'full_rule': antecedent + consequent, 'antecedent': antecedent, 'consequent': consequent, 'fitness': fitness,
+            'support': support, 'confidence': confidence, 'inclusion': 0.5, 'amplitude': 0.5, 'tsm': 0.5, 'start': start, 'end': end}
+
+class TestCompaction(unittest.TestCase):
+
+    def setUp(self):
+        self.features = {'x': {'type': 'Numerical', 'min': 0.0, 'max': 100.0, 'categories': None},
+                         'y': {'type': 'Numerical', 'min': 0.0, 'max': 10.0, 'categories': None},
+                         'c': {'type': 'Categorical', 'min': None, 'max': None, 'categories': np.array(['a', 'b'], dtype=object)}}
+        self.rules = [
+            entry([numerical('y', 0.0, 5.0), numerical('x', 10.0, 20.0)], [categorical('c', 'a')], 0.8, 0.3, 0.9),  # subsumed by 2
+            entry([numerical('x', 10.5, 20.0)], [categorical('c', 'a')], 0.79, 0.3, 0.9),  # near-duplicate of 2
+            entry([numerical('x', 10.0, 20.0)], [categorical('c', 'a')], 0.8, 0.3, 0.9),
+            entry([numerical('x', 12.0, 18.0), numerical('y', 0.0, 5.0)], [categorical('c', 'a')], 0.95, 0.1, 1.0),  # other metrics: kept
+            entry([numerical('x', 10.0, 20.0)], [categorical('c', 'b')], 0.6, 0.2, 0.5),  # other category: kept
+            entry([numerical('x', 30.0, 40.0)], [categorical('c', 'a')], 0.5, 0.1, 0.4, start=5, end=9),  # other borders: kept
+        ]
+
+    def test_collapses_redundant_rules(self):
+        result = compact_archive(self.rules, self.features, tolerance=0.01, border_tolerance=0.01)
+        self.assertEqual(result['removed'], {0: (2, 'subsumed'), 1: (2, 'near-duplicate')})
+        self.assertEqual(result['rules'], [self.rules[i] for i in (2, 3, 4, 5)])
+
+    def test_tolerances(self):
+        self.assertEqual(compact_archive(self.rules, self.features)['removed'], {0: (2, 'subsumed')})
+        self.assertEqual(compact_archive(self.rules)['removed'], {0: (2, 'subsumed')})
+        # Absolute borders without feature metadata
+        self.assertIn(1, compact_archive(self.rules, border_tolerance=0.5)['removed'])
+        # Windows must be close
+        rules = self.rules[:3]
+        rules[0] = dict(rules[0], start=100, end=200)
+        self.assertEqual(compact_archive(rules, self.features, border_tolerance=0.01, window_tolerance=5)['removed'], {1: (2, 'near-duplicate')})
+
+    def test_structured_archive(self):
+        archive = RuleArchive.from_rules(self.features, self.rules, interval=True)
+        result = compact_archive(archive, self.features, tolerance=0.01, border_tolerance=0.01)
+        self.assertIsInstance(result['rules'], RuleArchive)
+        self.assertEqual(result['rules'].to_dicts(), compact_archive(archive.to_dicts(), self.features, tolerance=0.01, border_tolerance=0.01)['rules'])
+
+    def test_mined_archive(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        compaction = {'tolerance': 0.05, 'border_tolerance': 0.2, 'window_tolerance': pd.Timedelta(days=365)}
+        reference = NiaARMTS(*args)
+        problem = NiaARMTS(*args, compact_every=100, compaction=compaction)
+        for solution in np.random.default_rng(3).random((400, args[0])):
+            self.assertEqual(reference._evaluate(solution), problem._evaluate(solution))
+
+        rules = reference.get_rule_archive()
+        result = compact_archive(rules, reference.features, **compaction)
+        self.assertGreater(len(result['removed']), 0)
+        self.assertEqual(len(result['rules']) + len(result['removed']), len(rules))
+        for removed, (representative, reason) in result['removed'].items():
+            self.assertNotIn(representative, result['removed'])
+            self.assertGreaterEqual(rules[representative]['fitness'], rules[removed]['fitness'] - compaction['tolerance'])
+            general = {c['feature'] for c in rules[representative]['full_rule']}
+            specific = {c['feature'] for c in rules[removed]['full_rule']}
+            self.assertTrue(general == specific if reason == 'near-duplicate' else general < specific)
+
+        self.assertGreater(problem.compacted_rules, 0)
+        self.assertLess(len(problem.rule_archive), len(reference.rule_archive))
+        with self.assertRaises(ValueError):
+            NiaARMTS(*args, compact_every=0)
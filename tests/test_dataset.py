@@ -1,8 +1,10 @@
 import unittest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch
-from niaarmts.dataset import Dataset
+from niaarmts.dataset import Dataset, WindowIndex
 from niaarmts.feature import Feature
+from niaarmts.NiaARMTS import NiaARMTS
 
 class TestDataset(unittest.TestCase):
 
@@ -63,3 +65,97 @@ class TestDataset(unittest.TestCase):
 
         # Test the correct calculation of dimensions
         self.assertEqual(dimension, 11)  # 4 for num_col, 3 for cat_col, 1 for interval, 2 for timestamp, 1 for cut point
+
+    @patch('pandas.read_csv')
+    def test_interval_data_is_sorted(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame({
+            'interval': [3, 1, 2, 1],
+            'num_col': [3.0, 1.0, 2.0, 1.5],
+            'cat_col': ['x', np.nan, 'y', 'y']
+        })
+
+        dataset = Dataset()
+        dataset.load_data_from_csv('mock_file.csv')
+
+        self.assertEqual(dataset.data['interval'].tolist(), [1, 1, 2, 3])
+        self.assertEqual(dataset.data['num_col'].tolist(), [1.0, 1.5, 2.0, 3.0])
+        # Category vocabularies keep the order of the input rows
+        categories = dataset.get_all_features_with_metadata()['cat_col']['categories']
+        self.assertEqual([categories[0], categories[2]], ['x', 'y'])
+        self.assertTrue(pd.isna(categories[1]))
+        # Interval ranges need one more solution component than single intervals
+        self.assertEqual(dataset.calculate_problem_dimension(interval_range=True), dataset.calculate_problem_dimension() + 1)
+
+        index = dataset.get_window_index(use_interval=True)
+        self.assertEqual(index.rows(1, 1), (0, 2))
+        self.assertEqual(index.rows(2, 3), (2, 4))
+
+    def test_window_index_rows(self):
+        index = WindowIndex(np.array([1, 1, 2, 4, 4, 4, 7]))
+        self.assertEqual((index.min, index.max), (1, 7))
+        self.assertEqual(index.rows(1, 1), (0, 2))
+        self.assertEqual(index.rows(3, 3), (3, 3))
+        self.assertEqual(index.rows(1.5, 4.2), (2, 6))
+        self.assertEqual(index.rows(0, 100), (0, 7))
+        self.assertEqual(index.rows(5, 2), (6, 6))
+
+        timestamps = pd.Series(pd.to_datetime(['2021-01-01', '2021-01-02', '2021-01-02', '2021-01-05']))
+        index = WindowIndex.from_dataframe(pd.DataFrame({'timestamp': timestamps}))
+        self.assertEqual(index.rows(pd.Timestamp('2021-01-02'), pd.Timestamp('2021-01-04')), (1, 3))
+
+        unsorted = pd.DataFrame({'timestamp': timestamps[::-1].reset_index(drop=True)})
+        self.assertIsNone(WindowIndex.from_dataframe(unsorted))
+
+    def test_window_index_timezone(self):
+        timestamps = pd.Series(pd.to_datetime(['2021-01-01', '2021-01-02', '2021-01-02', '2021-01-05'])).dt.tz_localize('Europe/Ljubljana')
+        df = pd.DataFrame({'timestamp': timestamps, 'value': [1.0, 2.0, 3.0, 4.0]})
+        index = WindowIndex.from_dataframe(df)
+        self.assertEqual(index.rows(timestamps[1], timestamps[3] - pd.Timedelta('1D')), (1, 3))
+        self.assertEqual(index.rows(pd.Timestamp('2021-01-02'), pd.Timestamp('2021-01-05')), (1, 4))
+        self.assertEqual(index.rows(pd.Timestamp('2021-01-04 22:30', tz='UTC'), pd.Timestamp('2021-01-06', tz='UTC')), (3, 4))
+        self.assertIsNone(WindowIndex.from_dataframe(pd.DataFrame({'timestamp': ['a', 'b']})))
+
+        dataset = Dataset()
+        dataset.load_data_from_dataframe(df, timestamp_col='timestamp')
+        problem = NiaARMTS(dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                           dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        self.assertIsNotNone(problem.window_index)
+        problem._evaluate(np.full(problem.dimension, 0.5))
+
+    def test_window_index_matches_filter(self):
+        df = pd.read_csv("datasets/intervals.csv")
+        index = WindowIndex.from_dataframe(df, use_interval=True)
+        for start in range(int(df['interval'].min()) - 1, int(df['interval'].max()) + 2, 7):
+            for end in range(start, start + 20, 3):
+                lo, hi = index.rows(start, end)
+                expected = df[(df['interval'] >= start) & (df['interval'] <= end)]
+                self.assertTrue(df.iloc[lo:hi].equals(expected))
+
+    def test_statistics_snapshot(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv("datasets/intervals.csv")
+        statistics = dataset.get_statistics()
+
+        self.assertIs(dataset.get_statistics(), statistics)
+        self.assertEqual(statistics.n_rows, len(dataset.data))
+        self.assertEqual(statistics.get_time_bounds(use_interval=True), (dataset.data['interval'].min(), dataset.data['interval'].max()))
+        with self.assertRaises(KeyError):
+            statistics.get_time_bounds()
+        with self.assertRaises(Exception):
+            statistics.n_rows = 0
+        with self.assertRaises(TypeError):
+            statistics.summary['interval'] = {}
+
+        # Metadata from the snapshot matches a scan of the columns
+        metadata = dataset.get_all_features_with_metadata()
+        for column, meta in metadata.items():
+            col_data = dataset.data[column]
+            if meta['type'] == 'Numerical':
+                self.assertEqual((meta['min'], meta['max']), (col_data.min(), col_data.max()))
+            elif meta['type'] == 'Categorical':
+                self.assertEqual(list(meta['categories']), list(col_data.unique()))
+        self.assertNotIn('interval', metadata)
+
+        # Replacing the data invalidates the snapshot
+        dataset.data = dataset.data.iloc[:3]
+        self.assertEqual(dataset.get_statistics().n_rows, 3)
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from niaarmts import Dataset, SyntheticGenerator
+from niaarmts.entities import mine_entities
+
+class TestEntities(unittest.TestCase):
+
+    def setUp(self):
+        frames = []
+        for i, device in enumerate(['dev-b', 'dev-a', 'dev-c']):
+            frame = SyntheticGenerator(100 + 50 * i, numerical=2, categorical=1, seed=i).generate()
+            frame['num_0'] += 100 * i
+            frame.insert(0, 'device', device)
+            frames.append(frame)
+        self.df = pd.concat(frames).sample(frac=1.0, random_state=0)
+        self.dataset = Dataset()
+        self.dataset.load_data_from_dataframe(self.df, timestamp_col='timestamp', entity_col='device')
+
+    def test_entity_ranges(self):
+        ranges = self.dataset.get_entity_ranges()
+        self.assertEqual(self.dataset.get_entities(), ['dev-a', 'dev-b', 'dev-c'])
+        self.assertEqual(ranges, {'dev-a': (0, 150), 'dev-b': (150, 250), 'dev-c': (250, 450)})
+        for device, (lo, hi) in ranges.items():
+            transactions = self.dataset.get_entity_transactions(device)
+            self.assertEqual(len(transactions), hi - lo)
+            self.assertTrue((transactions['device'] == device).all())
+            self.assertTrue(transactions['timestamp'].is_monotonic_increasing)
+            self.assertEqual(list(transactions.index), list(range(hi - lo)))
+
+        entity = self.dataset.get_entity_dataset('dev-c')
+        self.assertNotIn('device', entity.get_all_transactions().columns)
+        self.assertGreaterEqual(entity.get_all_features_with_metadata()['num_0']['min'], 100 * 2 - 1e-9)
+
+    def test_entity_column_is_not_a_feature(self):
+        self.assertNotIn('device', self.dataset.get_all_features_with_metadata())
+        self.assertEqual(self.dataset.calculate_problem_dimension(), 2 * 4 + 3 + 2 + 1)
+        # The caller's data frame is left unchanged
+        self.assertEqual(self.df['timestamp'].dtype, self.dataset.get_all_transactions()['timestamp'].dtype)
+
+    def test_load_from_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'devices.csv')
+            self.df.to_csv(file_name, index=False)
+            dataset = Dataset()
+            dataset.load_data_from_csv(file_name, timestamp_col='timestamp', entity_col='device')
+        self.assertEqual(dataset.get_entity_ranges(), self.dataset.get_entity_ranges())
+        with self.assertRaises(ValueError):
+            Dataset().get_entity_ranges()
+
+    def test_mine_entities(self):
+        serial = mine_entities(self.dataset, seed=1, max_evals=200, n_workers=1)
+        self.assertEqual(set(serial['entities']), {'dev-a', 'dev-b', 'dev-c'})
+        self.assertEqual(serial['evaluations'], 3 * 200)
+        for device, result in serial['entities'].items():
+            self.assertEqual(result['rows'], len(self.dataset.get_entity_transactions(device)))
+            self.assertEqual(result['archive_size'], len(result['rules']))
+            for rule in result['rules']:
+                self.assertNotIn('device', [condition['feature'] for condition in rule['full_rule']])
+
+        parallel = mine_entities(self.dataset, seed=1, max_evals=200, n_workers=2)
+        for device in serial['entities']:
+            self.assertEqual(parallel['entities'][device]['best_fitness'], serial['entities'][device]['best_fitness'])
+            self.assertEqual(len(parallel['entities'][device]['rules']), len(serial['entities'][device]['rules']))
+
+        subset = mine_entities(self.dataset, entities=['dev-b'], max_evals=100, n_workers=1)
+        self.assertEqual(list(subset['entities']), ['dev-b'])
+        with self.assertRaises(KeyError):
+            mine_entities(self.dataset, entities=['dev-x'])
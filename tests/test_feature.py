@@ -74,3 +74,43 @@ class TestFeature(unittest.TestCase):
         self.assertEqual(stats['unique_classes'], 2)
         # Ensure that the correct categories are returned (sorted)
         self.assertCountEqual(stats['classes'], ['A', 'B'])  # Check if categories match
+
+    def test_summary_matches_column_statistics(self):
+        """Test if the vectorized summary matches per-column pandas statistics."""
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(rng.normal(size=(200, 40)), columns=[f'f{i}' for i in range(40)])
+        data.iloc[rng.integers(0, 200, 50), rng.integers(0, 40, 50)] = np.nan
+        data['ints'] = np.arange(200)
+        data['single'] = np.nan
+        data.loc[0, 'single'] = 1.0
+        data['cat'] = rng.choice(['A', 'B'], 200)
+
+        # A budget of three columns per block
+        summary = Feature(data, block_bytes=3 * len(data) * 8).get_feature_summary()
+        for column in data.columns[:-1]:
+            col_data = data[column]
+            self.assertEqual(summary[column]['min'], col_data.min())
+            self.assertEqual(summary[column]['max'], col_data.max())
+            self.assertAlmostEqual(summary[column]['mean'], col_data.mean(), places=12)
+            if column == 'single':
+                self.assertTrue(np.isnan(summary[column]['std_dev']))
+            else:
+                self.assertAlmostEqual(summary[column]['std_dev'], col_data.std(), places=12)
+        self.assertIsInstance(summary['ints']['min'], np.integer)
+        self.assertEqual(summary['cat']['unique_classes'], 2)
+
+    def test_sampled_summary(self):
+        """Test if the sampled mode computes statistics from a row sample only."""
+        data = pd.DataFrame({'num_col': np.arange(1000, dtype=float), 'cat_col': ['A', 'B'] * 500})
+        feature = Feature(data, sample_size=100, seed=0)
+        stats = feature.get_feature_stats('num_col')
+        self.assertTrue(feature.sampled)
+        sample = data.sample(n=100, random_state=0)['num_col']
+        self.assertEqual(stats['min'], sample.min())
+        self.assertEqual(stats['max'], sample.max())
+        self.assertAlmostEqual(stats['mean'], sample.mean(), places=12)
+        self.assertAlmostEqual(stats['std_dev'], sample.std(), places=12)
+        # The sample misses some of the full-data values
+        self.assertNotEqual((stats['min'], stats['max'], stats['mean']), (0.0, 999.0, 499.5))
+        self.assertEqual(feature.get_numerical_features(), ['num_col'])
+        self.assertFalse(Feature(data, sample_size=5000).sampled)
@@ -0,0 +1,48 @@
+import os
+import unittest
+import numpy as np
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+
+class TestFidelitySchedule(unittest.TestCase):
+
+    def setUp(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        self.args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                     dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        self.solutions = np.random.default_rng(0).random((300, self.args[0]))
+
+    def test_schedule(self):
+        problem = NiaARMTS(*self.args, fidelity_schedule=[(0, 8), (100, 2), (200, 1)])
+        strides = []
+        for solution in self.solutions:
+            strides.append(problem.fidelity())
+            problem._evaluate(solution)
+        self.assertEqual(strides, [8] * 100 + [2] * 100 + [1] * 100)
+        self.assertEqual(problem.coarse_evaluations, 200)
+        self.assertEqual(len(problem.get_view(8)[0]), (len(self.args[4]) + 7) // 8)
+
+    def test_archive_has_full_fidelity_rules(self):
+        exact = NiaARMTS(*self.args)
+        scheduled = NiaARMTS(*self.args, fidelity_schedule=[(0, 4), (150, 1)])
+        promoted = NiaARMTS(*self.args, fidelity_schedule=[(0, 4)], fidelity_threshold=0.5)
+        exact_fitness = set()
+        for solution in self.solutions:
+            fitness = exact._evaluate(solution)
+            exact_fitness.add(fitness)
+            if scheduled.evaluations >= 150:
+                self.assertEqual(scheduled._evaluate(solution), fitness)
+            else:
+                scheduled._evaluate(solution)
+            promoted._evaluate(solution)
+
+        for problem in (scheduled, promoted):
+            self.assertGreater(len(problem.rule_archive), 0)
+            self.assertLess(len(problem.rule_archive), len(exact.rule_archive))
+            self.assertTrue(all(entry['fitness'] in exact_fitness for entry in problem.rule_archive))
+        self.assertGreater(promoted.promoted_evaluations, 0)
+
+    def test_invalid_stride(self):
+        with self.assertRaises(ValueError):
+            NiaARMTS(*self.args, fidelity_schedule=[(0, 0)])
@@ -0,0 +1,129 @@
+import os
+import queue
+import unittest
+import numpy as np
+from niapy.algorithms.basic import ParticleSwarmAlgorithm
+from niapy.callbacks import Callback
+from niapy.task import Task, OptimizationType
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.islands import run_islands, _replace_worst, _run_island, _select_migrants
+from niaarmts.shared import share_dataframe, attach_dataframe, release_shared
+
+class TestIslands(unittest.TestCase):
+
+    def setUp(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        self.problem_kwargs = dict(
+            dimension=dataset.calculate_problem_dimension(),
+            lower=0.0,
+            upper=1.0,
+            features=dataset.get_all_features_with_metadata(),
+            transactions=dataset.get_all_transactions(),
+            interval='false',
+            alpha=1.0,
+            beta=1.0,
+            gamma=1.0,
+            delta=1.0,
+            epsilon=1.0
+        )
+
+    def test_shared_dataframe_roundtrip(self):
+        df = self.problem_kwargs['transactions']
+        spec, blocks = share_dataframe(df)
+        attached, attached_blocks = attach_dataframe(spec)
+        self.assertEqual(list(attached.columns), list(df.columns))
+        self.assertTrue((attached['weather'] == df['weather']).all())
+        self.assertTrue((attached['timestamp'] == df['timestamp']).all())
+        self.assertTrue(np.array_equal(attached['humidity'].to_numpy(), df['humidity'].to_numpy()))
+        del attached
+        release_shared(attached_blocks)
+        release_shared(blocks, unlink=True)
+
+    def test_migrants_replace_worst(self):
+        population = np.array([[0.0], [1.0], [2.0], [3.0]])
+        fitness = np.array([0.5, -0.2, 0.9, 0.1])
+        vectors, migrant_fitness = _select_migrants(population, fitness, 2)
+        self.assertEqual([v[0] for v in vectors], [1.0, 3.0])
+
+        population, fitness = _replace_worst(population, fitness, [np.array([7.0]), np.array([8.0])], [-1.0, 0.7])
+        # The worst individual is replaced, the second migrant is not better than the one it would replace
+        self.assertEqual(population[2][0], 7.0)
+        self.assertEqual(population[0][0], 0.0)
+        self.assertEqual(fitness[2], -1.0)
+
+    def test_migrants_reset_particle_state(self):
+        problem = NiaARMTS(**self.problem_kwargs)
+        task = Task(problem=problem, max_iters=5, optimization_type=OptimizationType.MAXIMIZATION)
+        algorithm = ParticleSwarmAlgorithm(population_size=6, seed=0)
+        population, fitness, params = algorithm.init_population(task)
+        params['v'][:] = 0.5
+        worst = int(np.argmax(fitness))
+
+        migrant = np.full(problem.dimension, 0.25)
+        population, fitness = _replace_worst(population, fitness, [migrant], [-10.0], params)
+        np.testing.assert_array_equal(population[worst], migrant)
+        np.testing.assert_array_equal(params['personal_best'][worst], migrant)
+        self.assertEqual(params['personal_best_fitness'][worst], -10.0)
+        self.assertTrue((params['v'][worst] == 0.0).all())
+        self.assertTrue((np.delete(params['v'], worst, axis=0) == 0.5).all())
+
+    def test_island_migration_updates_swarm(self):
+        class Recorder(Callback):
+            def __init__(self):
+                super().__init__()
+                self.iterations = 0
+                self.personal_best_fitness = []
+
+            def after_iteration(self, population, fitness, best_x, best_fitness, **params):
+                self.iterations += 1
+                self.personal_best_fitness.append(params['personal_best_fitness'].min())
+
+        # Elite of a longer run, sent to the island in both of its migrations
+        elite_task = Task(problem=NiaARMTS(**self.problem_kwargs), max_iters=40, optimization_type=OptimizationType.MAXIMIZATION)
+        elite, elite_fitness = ParticleSwarmAlgorithm(population_size=10, seed=5).run(elite_task)
+
+        def run_island(migrate):
+            recorder = Recorder()
+            inbox, outbox, results = queue.Queue(), queue.Queue(), queue.Queue()
+            if migrate:
+                for _ in range(2):
+                    inbox.put(([elite], [-elite_fitness], []))
+            run = {'algorithm': 'ParticleSwarmAlgorithm', 'seed': 1, 'params': {'population_size': 6, 'callbacks': [recorder]},
+                   'generations': 6, 'migration_interval': 2, 'n_migrants': 1, 'n_rules': 0,
+                   'optimization_type': OptimizationType.MAXIMIZATION, 'timeout': 0.01}
+            problem_kwargs = dict(self.problem_kwargs)
+            spec, blocks = share_dataframe(problem_kwargs.pop('transactions'))
+            try:
+                _run_island(0, spec, problem_kwargs, run, inbox, outbox, results)
+            finally:
+                release_shared(blocks, unlink=True)
+            return recorder, results.get_nowait()
+
+        recorder, result = run_island(migrate=True)
+        baseline, baseline_result = run_island(migrate=False)
+        self.assertEqual(recorder.iterations, 6)
+        self.assertEqual(result['migrations'], 2)
+        self.assertEqual(baseline_result['migrations'], 0)
+        # The migrant becomes the personal best of the particle it replaces
+        self.assertLessEqual(recorder.personal_best_fitness[2], -elite_fitness)
+        self.assertGreater(baseline.personal_best_fitness[2], -elite_fitness)
+        self.assertGreaterEqual(result['best_fitness'], elite_fitness)
+
+    def test_run_islands(self):
+        result = run_islands(
+            self.problem_kwargs, algorithms=['ParticleSwarmAlgorithm', 'DifferentialEvolution'], n_islands=2,
+            generations=6, migration_interval=2, seed=1, algorithm_params={
+                'ParticleSwarmAlgorithm': {'population_size': 10},
+                'DifferentialEvolution': {'population_size': 10}
+            }
+        )
+        self.assertEqual([island['island'] for island in result['islands']], [0, 1])
+        self.assertTrue(all(island['migrations'] == 2 for island in result['islands']))
+        self.assertTrue(all(island['iterations'] == 6 for island in result['islands']))
+
+        keys = [NiaARMTS.rule_representation(entry['full_rule']) for entry in result['rules']]
+        self.assertEqual(len(keys), len(set(keys)))
+        fitness = [entry['fitness'] for entry in result['rules']]
+        self.assertEqual(fitness, sorted(fitness, reverse=True))
@@ -0,0 +1,67 @@
+import os
+import unittest
+import numpy as np
+from niaarmts import Dataset, SyntheticGenerator
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.kernels import RuleKernel, HAS_NUMBA, _fused_kernel_py
+from niaarmts.metrics import calculate_conditions_mask, _amplitude
+
+class TestKernels(unittest.TestCase):
+
+    def setUp(self):
+        self.df = SyntheticGenerator(400, numerical=3, categorical=2, nan_rate=0.05, seed=7).generate()
+        self.features = {'num_0': {'type': 'Numerical'}, 'num_1': {'type': 'Numerical'}, 'num_2': {'type': 'Numerical'},
+                         'cat_0': {'type': 'Categorical'}, 'cat_1': {'type': 'Categorical'}}
+
+    def random_rule(self, rng):
+        conditions = []
+        for feature in rng.permutation(list(self.features))[:rng.integers(2, 5)]:
+            if self.features[feature]['type'] == 'Numerical':
+                border1, border2 = np.round(np.sort(rng.uniform(0.0, 100.0, 2)), 4)
+                conditions.append({'feature': feature, 'type': 'Numerical', 'border1': border1, 'border2': border2, 'category': 'EMPTY'})
+            else:
+                category = rng.choice(['low', 'mid', 'high', 'unknown'])
+                conditions.append({'feature': feature, 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': category})
+        cut = rng.integers(1, len(conditions))
+        return conditions[:cut], conditions[cut:]
+
+    def check_backend(self, kernel):
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            antecedent, consequent = self.random_rule(rng)
+            lo, hi = sorted(rng.integers(0, len(self.df) + 1, 2))
+            window = self.df.iloc[lo:hi]
+            antecedent_mask = calculate_conditions_mask(window, antecedent)
+            result = kernel.evaluate(antecedent, consequent, lo, hi)
+            self.assertEqual(result['antecedent_count'], int(antecedent_mask.sum()))
+            self.assertEqual(result['rule_count'], int(calculate_conditions_mask(window, consequent, antecedent_mask).sum()))
+            np.testing.assert_equal(result['amplitude'], _amplitude(window, antecedent + consequent))
+
+    def test_numpy_backend(self):
+        self.check_backend(RuleKernel(self.df, self.features, backend='numpy'))
+
+    def test_fused_loop(self):
+        # The loop compiled by Numba, run as plain Python
+        kernel = RuleKernel(self.df, self.features, backend='numpy')
+        kernel.kernel = _fused_kernel_py
+        self.check_backend(kernel)
+
+    @unittest.skipUnless(HAS_NUMBA, "Numba is not installed")
+    def test_numba_backend(self):
+        self.check_backend(RuleKernel(self.df, self.features, backend='numba'))
+
+    def test_backend_selection(self):
+        self.assertEqual(RuleKernel(self.df, self.features).backend, 'numba' if HAS_NUMBA else 'numpy')
+        if not HAS_NUMBA:
+            with self.assertRaises(ImportError):
+                RuleKernel(self.df, self.features, backend='numba')
+
+    def test_problem_with_kernel_gives_same_fitness(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        reference = NiaARMTS(*args)
+        fused = NiaARMTS(*args, kernel='auto')
+        for solution in np.random.default_rng(1).random((300, args[0])):
+            self.assertEqual(reference._evaluate(solution), fused._evaluate(solution))
@@ -0,0 +1,72 @@
+import os
+import unittest
+import numpy as np
+from niaarmts import Dataset, SyntheticGenerator
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.bitmap import count_bits, unpack_bits
+from niaarmts.mask_cache import ConditionMaskCache
+from niaarmts.metrics import calculate_conditions_mask
+
+class TestConditionMaskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.df = SyntheticGenerator(1000, numerical=2, categorical=1, nan_rate=0.05, seed=3).generate()
+        self.df['num_0'] = self.df['num_0'].round(0)
+
+    def numerical(self, border1, border2, feature='num_0'):
+        return {'feature': feature, 'type': 'Numerical', 'border1': border1, 'border2': border2, 'category': 'EMPTY'}
+
+    def test_matches_masks(self):
+        cache = ConditionMaskCache(self.df)
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            border1, border2 = np.round(np.sort(rng.uniform(0.0, 100.0, 2)), 4)
+            conditions = [self.numerical(border1, border2, rng.choice(['num_0', 'num_1'])),
+                          {'feature': 'cat_0', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': rng.choice(['low', 'mid', 'high'])}]
+            lo, hi = sorted(rng.integers(0, len(self.df) + 1, 2))
+            expected = calculate_conditions_mask(self.df.iloc[lo:hi], conditions)
+            bits = cache.conditions_bits(conditions, lo, hi)
+            self.assertEqual(count_bits(bits), int(expected.sum()))
+            np.testing.assert_array_equal(unpack_bits(bits, lo, hi), expected)
+            single = cache.condition_bits(conditions[0], lo, hi)
+            np.testing.assert_array_equal(unpack_bits(single, lo, hi), calculate_conditions_mask(self.df.iloc[lo:hi], conditions[:1]))
+
+    def test_snapping_shares_masks(self):
+        cache = ConditionMaskCache(self.df)
+        # Integer-valued column: both conditions select the values 10, ..., 20
+        cache.full_bits(self.numerical(9.5, 20.2))
+        cache.full_bits(self.numerical(9.9, 20.0))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.key(self.numerical(10.2, 10.8)), ('num_0', 'Numerical', 0, 0))
+
+        exact = ConditionMaskCache(self.df, snap=False)
+        exact.full_bits(self.numerical(9.5, 20.2))
+        exact.full_bits(self.numerical(9.9, 20.0))
+        self.assertEqual(exact.stats()['hits'], 0)
+
+    def test_eviction(self):
+        size = (len(self.df) + 7) // 8
+        cache = ConditionMaskCache(self.df, max_bytes=3 * size)
+        for border in range(5):
+            cache.full_bits(self.numerical(border * 10.0, border * 10.0 + 5.0))
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 3)
+        self.assertEqual(stats['evictions'], 2)
+        self.assertEqual(stats['nbytes'], 3 * size)
+        # The most recently used masks are kept
+        cache.full_bits(self.numerical(40.0, 45.0))
+        self.assertEqual(cache.stats()['hits'], 1)
+        with self.assertRaises(ValueError):
+            ConditionMaskCache(self.df, max_bytes=0)
+
+    def test_problem_with_cache_gives_same_fitness(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        reference = NiaARMTS(*args)
+        cached = NiaARMTS(*args, mask_cache=True)
+        for solution in np.random.default_rng(1).random((300, args[0])):
+            self.assertEqual(reference._evaluate(solution), cached._evaluate(solution))
+        self.assertEqual(cached.get_rule_archive(), reference.get_rule_archive())
+        self.assertGreater(cached.mask_cache.stats()['hits'], 0)
@@ -0,0 +1,75 @@
+import os
+import unittest
+import numpy as np
+from niaarmts import Dataset, SyntheticGenerator
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.matcher import RuleMatcher
+from niaarmts.metrics import calculate_conditions_mask
+
+class TestRuleMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.batch = SyntheticGenerator(2000, numerical=2, categorical=1, nan_rate=0.05, seed=5).generate()
+        self.batch['num_0'] = self.batch['num_0'].round(0)
+
+    def condition(self, feature, border1=1.0, border2=1.0, category='EMPTY'):
+        feature_type = 'Categorical' if category != 'EMPTY' else 'Numerical'
+        return {'feature': feature, 'type': feature_type, 'border1': border1, 'border2': border2, 'category': category}
+
+    def assert_matches(self, rules, batch, result):
+        for rule_id, rule in enumerate(rules):
+            antecedent = calculate_conditions_mask(batch, rule['antecedent'])
+            consequent = calculate_conditions_mask(batch, rule['consequent'])
+            selected = result['rule'] == rule_id
+            np.testing.assert_array_equal(result['row'][selected], np.flatnonzero(antecedent))
+            np.testing.assert_array_equal(result['violation'][selected], ~consequent[antecedent])
+            self.assertEqual(result['fire_count'][rule_id], antecedent.sum())
+            self.assertEqual(result['violation_count'][rule_id], (antecedent & ~consequent).sum())
+
+    def test_matches_condition_masks(self):
+        rng = np.random.default_rng(0)
+        rules = []
+        for _ in range(100):
+            # Integer-valued borders put many values exactly on the edges
+            border1, border2 = np.sort(rng.integers(0, 100, 2)).astype(float)
+            rules.append({
+                'antecedent': [self.condition('num_0', border1, border2), self.condition('cat_0', category=rng.choice(['low', 'mid', 'high', 'none']))],
+                'consequent': [self.condition('num_1', *np.round(np.sort(rng.uniform(0.0, 100.0, 2)), 4))]
+            })
+        # Repeated feature on one side
+        rules.append({'antecedent': [self.condition('num_0', 10.0, 60.0), self.condition('num_0', 40.0, 90.0)],
+                      'consequent': [self.condition('cat_0', category='low'), self.condition('cat_0', category='mid')]})
+        matcher = RuleMatcher(rules, max_chunk_bytes=50000)
+        self.assert_matches(rules, self.batch, matcher.match(self.batch))
+
+    def test_missing_categories(self):
+        batch = self.batch.copy()
+        batch['cat_0'] = batch['cat_0'].astype(object).where(batch['cat_0'].notna(), np.nan)
+        self.assertTrue(batch['cat_0'].isna().any())
+        # Distinct NaN objects, as after reading an archive back from a file
+        rules = [{'antecedent': [self.condition('cat_0', category=category)], 'consequent': [self.condition('cat_0', category='low')]}
+                 for category in [np.nan, float('nan'), None, 'low']]
+        result = RuleMatcher(rules).match(batch)
+        self.assert_matches(rules, batch, result)
+        self.assertEqual(result['fire_count'][:3].tolist(), [0, 0, 0])
+        self.assertEqual(RuleMatcher(rules[:1]).match(batch)['fire_count'].tolist(), [0])
+
+    def test_archive_and_missing_features(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        transactions = dataset.get_all_transactions()
+        problem = NiaARMTS(dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                           transactions, 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        for solution in np.random.default_rng(3).random((200, problem.dimension)):
+            problem._evaluate(solution)
+        matcher = problem.get_rule_matcher()
+        self.assertEqual(len(matcher), len(problem.rule_archive))
+        self.assert_matches(problem.rule_archive, transactions, matcher.match(transactions))
+        with self.assertRaises(KeyError):
+            matcher.match(transactions.drop(columns=[matcher.features[0]]))
+
+    def test_empty(self):
+        result = RuleMatcher([]).match(self.batch)
+        self.assertEqual(len(result['row']), 0)
+        result = RuleMatcher([{'antecedent': [self.condition('num_0', 0.0, 50.0)], 'consequent': [self.condition('num_1', 0.0, 50.0)]}]).match(self.batch.iloc[:0])
+        self.assertEqual(result['fire_count'].tolist(), [0])
@@ -0,0 +1,64 @@
+import os
+import unittest
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.portfolio import merge_archives, run_portfolio, spawn_seeds
+
+class TestPortfolio(unittest.TestCase):
+
+    def setUp(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        self.problem_kwargs = dict(
+            dimension=dataset.calculate_problem_dimension(),
+            lower=0.0,
+            upper=1.0,
+            features=dataset.get_all_features_with_metadata(),
+            transactions=dataset.get_all_transactions(),
+            interval='false',
+            alpha=1.0,
+            beta=1.0,
+            gamma=1.0,
+            delta=1.0,
+            epsilon=1.0
+        )
+        self.algorithms = ['ParticleSwarmAlgorithm', 'DifferentialEvolution']
+        self.params = {name: {'population_size': 10} for name in self.algorithms}
+
+    def test_spawn_seeds_reproducible(self):
+        self.assertEqual(spawn_seeds(42, 4), spawn_seeds(42, 4))
+        self.assertEqual(len(set(spawn_seeds(42, 4))), 4)
+
+    def test_merge_archives_keeps_best_duplicate(self):
+        rule = [{'feature': 'light', 'type': 'Numerical', 'border1': 1.0, 'border2': 2.0, 'category': 'EMPTY'},
+                {'feature': 'weather', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'sun'}]
+        other = [{'feature': 'humidity', 'type': 'Numerical', 'border1': 1.0, 'border2': 2.0, 'category': 'EMPTY'},
+                 {'feature': 'weather', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'sun'}]
+        merged = merge_archives([
+            [{'full_rule': rule, 'fitness': 0.4}],
+            [{'full_rule': list(reversed(rule)), 'fitness': 0.6}, {'full_rule': other, 'fitness': 0.5}]
+        ])
+        self.assertEqual([entry['fitness'] for entry in merged], [0.6, 0.5])
+
+    def test_run_portfolio(self):
+        result = run_portfolio(self.problem_kwargs, self.algorithms, n_runs=4, seed=1, max_iters=5,
+                               algorithm_params=self.params, n_workers=2)
+        self.assertEqual(len(result['runs']), 4)
+        self.assertEqual([run['algorithm'] for run in result['runs']], self.algorithms * 2)
+        self.assertEqual(result['evaluations'], sum(run['evaluations'] for run in result['runs']))
+        self.assertGreater(result['evaluations_per_second'], 0.0)
+
+        keys = [NiaARMTS.rule_representation(entry['full_rule']) for entry in result['rules']]
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertLessEqual(len(result['rules']), sum(run['archive_size'] for run in result['runs']))
+
+    def test_run_portfolio_reproducible(self):
+        first = run_portfolio(self.problem_kwargs, self.algorithms, seed=3, max_iters=3, algorithm_params=self.params, n_workers=1)
+        second = run_portfolio(self.problem_kwargs, self.algorithms, seed=3, max_iters=3, algorithm_params=self.params, n_workers=2)
+        self.assertEqual([run['best_fitness'] for run in first['runs']], [run['best_fitness'] for run in second['runs']])
+        self.assertEqual([entry['fitness'] for entry in first['rules']], [entry['fitness'] for entry in second['rules']])
+
+    def test_run_portfolio_requires_runs(self):
+        for kwargs in [{'algorithms': []}, {'algorithms': self.algorithms, 'n_runs': 0}]:
+            with self.assertRaises(ValueError):
+                run_portfolio(self.problem_kwargs, max_iters=1, **kwargs)
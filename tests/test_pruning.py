@@ -0,0 +1,43 @@
+import os
+import unittest
+import numpy as np
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+
+class TestPruning(unittest.TestCase):
+
+    def setUp(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        self.args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                     dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        rng = np.random.default_rng(0)
+        self.solutions = rng.random((500, self.args[0]))
+
+    def test_pruning_keeps_top_rules(self):
+        exact = NiaARMTS(*self.args)
+        pruned = NiaARMTS(*self.args, pruning=True, prune_top_k=5)
+        for solution in self.solutions:
+            exact._evaluate(solution)
+            pruned._evaluate(solution)
+
+        self.assertGreater(pruned.pruned_evaluations, 0)
+        self.assertEqual(pruned.evaluations, len(self.solutions))
+        self.assertLess(len(pruned.rule_archive), len(exact.rule_archive))
+        self.assertEqual([r['fitness'] for r in exact.get_rule_archive()[:5]],
+                         [r['fitness'] for r in pruned.get_rule_archive()[:5]])
+
+    def test_pruned_fitness_is_lower_bound(self):
+        exact = NiaARMTS(*self.args)
+        pruned = NiaARMTS(*self.args, pruning=True, prune_threshold=0.9)
+        for solution in self.solutions[:100]:
+            self.assertLessEqual(pruned._evaluate(solution), exact._evaluate(solution))
+        self.assertTrue(all(r['fitness'] > 0.9 for r in pruned.rule_archive))
+
+    def test_pruning_threshold(self):
+        problem = NiaARMTS(*self.args, pruning=True, prune_threshold=0.1, prune_top_k=2)
+        self.assertEqual(problem.pruning_threshold(), 0.1)
+        for fitness in [0.3, 0.5, 0.4]:
+            rule = [{'feature': 'light', 'type': 'Numerical', 'border1': fitness, 'border2': 1.0, 'category': 'EMPTY'}]
+            problem.add_rule_to_archive(rule, rule, [], fitness, 0, 0, 0.1, 0.1, 0.0, 0.0, 0.0)
+        self.assertEqual(problem.pruning_threshold(), 0.4)
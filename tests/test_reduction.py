@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from niaarmts import Dataset, DatasetStatistics, SyntheticGenerator
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.reduction import reduce_features, calculate_dimension
+
+class TestReduction(unittest.TestCase):
+
+    def setUp(self):
+        df = SyntheticGenerator(300, numerical=3, categorical=2, seed=3).generate()
+        df['constant'] = 5.0
+        df['empty'] = np.nan
+        df['scaled'] = 2.0 * df['num_0'] + 1.0
+        df['label'] = 'same'
+        self.features = DatasetStatistics.from_dataframe(df).feature_metadata()
+        self.transactions = df
+
+    def test_removed_features(self):
+        result = reduce_features(self.transactions, self.features)
+        self.assertEqual(result['removed']['constant'], 'constant')
+        self.assertEqual(result['removed']['empty'], 'missing values')
+        self.assertEqual(result['removed']['scaled'], 'correlated with num_0')
+        self.assertEqual(result['removed']['label'], 'constant')
+        self.assertEqual(set(result['features']), {'num_0', 'num_1', 'num_2', 'cat_0', 'cat_1'})
+        self.assertEqual(result['dimension'], calculate_dimension(result['features'], self.transactions))
+        self.assertEqual(result['dimension'], 3 * 4 + 2 * 3 + 2 + 1)
+        self.assertLess(result['dimension'], calculate_dimension(self.features, self.transactions))
+
+    def test_dimension_matches_dataset(self):
+        df = SyntheticGenerator(100, numerical=2, categorical=1, seed=0).generate()
+        df['interval'] = np.arange(len(df)) // 10
+        df['recorded'] = df['timestamp']
+        for frame in (df, df.drop(columns=['timestamp']), df.drop(columns=['interval'])):
+            dataset = Dataset()
+            dataset.load_data_from_dataframe(frame)
+            for interval_range in (False, True):
+                self.assertEqual(calculate_dimension(dataset.get_all_features_with_metadata(), frame, interval_range),
+                                 dataset.calculate_problem_dimension(interval_range))
+
+    def test_correlation_check_can_be_disabled(self):
+        result = reduce_features(self.transactions, self.features, correlation_threshold=None)
+        self.assertIn('scaled', result['features'])
+
+    def test_whitelists(self):
+        result = reduce_features(self.transactions, self.features, antecedent=['num_0', 'num_1', 'empty'], consequent=['cat_0'])
+        self.assertEqual(set(result['features']), {'num_0', 'num_1', 'cat_0'})
+        self.assertEqual(result['removed']['num_2'], 'not whitelisted')
+        self.assertEqual(result['antecedent_features'], ['num_0', 'num_1'])
+        self.assertEqual(result['consequent_features'], ['cat_0'])
+
+        # A single whitelist restricts only its own side
+        result = reduce_features(self.transactions, self.features, antecedent=['num_0'])
+        self.assertIn('num_2', result['features'])
+        self.assertIsNone(result['consequent_features'])
+
+    def test_problem_respects_whitelists(self):
+        result = reduce_features(self.transactions, self.features, antecedent=['num_0', 'num_1', 'cat_1'], consequent=['num_2', 'cat_0'])
+        problem = NiaARMTS(result['dimension'], 0.0, 1.0, result['features'], self.transactions, 'false', 1.0, 1.0, 1.0, 1.0, 1.0,
+                           antecedent_features=result['antecedent_features'], consequent_features=result['consequent_features'])
+        for solution in np.random.default_rng(0).random((300, result['dimension'])):
+            problem._evaluate(solution)
+
+        self.assertGreater(len(problem.rule_archive), 0)
+        for entry in problem.rule_archive:
+            self.assertTrue(all(condition['feature'] in result['antecedent_features'] for condition in entry['antecedent']))
+            self.assertTrue(all(condition['feature'] in result['consequent_features'] for condition in entry['consequent']))
@@ -0,0 +1,104 @@
+import os
+import unittest
+import numpy as np
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.archive import RuleArchive
+from niaarmts.metrics import calculate_fitness
+from niaarmts.reweight import reweight_fitness, rank_archive, weight_matrix
+
+class TestReweight(unittest.TestCase):
+
+    def setUp(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        self.features = dataset.get_all_features_with_metadata()
+        self.args = (dataset.calculate_problem_dimension(), 0.0, 1.0, self.features,
+                     dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        self.profiles = {
+            'mining': {},
+            'confident': {'alpha': 0.0, 'beta': 3.0, 'gamma': 0.5, 'delta': 0.0, 'epsilon': 0.0},
+            'long': [0.2, 0.5, 0.0, 0.0, 2.0]
+        }
+
+    def mine(self, **kwargs):
+        problem = NiaARMTS(*self.args, **kwargs)
+        for solution in np.random.default_rng(4).random((300, self.args[0])):
+            problem._evaluate(solution)
+        return problem
+
+    def test_matches_calculate_fitness(self):
+        archive = self.mine().get_rule_archive()
+        self.assertGreater(len(archive), 0)
+        result = reweight_fitness(archive, self.profiles)
+        names, weights = weight_matrix(self.profiles)
+        self.assertEqual(result['profiles'], ['mining', 'confident', 'long'])
+        for k in range(len(names)):
+            expected = [calculate_fitness(rule['support'], rule['confidence'], rule['inclusion'], rule['amplitude'], rule['tsm'], *weights[k])
+                        for rule in archive]
+            self.assertEqual(result['fitness'][k].tolist(), expected)
+        # The mining profile reproduces the stored fitness
+        self.assertEqual(result['fitness'][0].tolist(), [rule['fitness'] for rule in archive])
+
+    def test_structured_archive(self):
+        archive = self.mine().get_rule_archive()
+        structured = RuleArchive.from_rules(self.features, archive)
+        np.testing.assert_array_equal(reweight_fitness(structured, self.profiles)['fitness'], reweight_fitness(archive, self.profiles)['fitness'])
+
+    def test_rankings(self):
+        problem = self.mine(weight_profiles=self.profiles)
+        rankings = problem.get_profile_rankings(top_k=5)
+        self.assertEqual(list(rankings), ['mining', 'confident', 'long'])
+        for ranking in rankings.values():
+            self.assertEqual(len(ranking), 5)
+            fitness = [rule['fitness'] for rule in ranking]
+            self.assertEqual(fitness, sorted(fitness, reverse=True))
+        self.assertEqual(rankings['confident'][0]['confidence'], max(rule['confidence'] for rule in problem.rule_archive))
+        self.assertEqual(rankings, rank_archive(problem.rule_archive, self.profiles, top_k=5))
+        # The archive keeps the mining fitness
+        self.assertEqual(rankings['mining'][0]['fitness'], max(rule['fitness'] for rule in problem.rule_archive))
+
+    def test_profiles_weighting_unmined_metrics(self):
+        args = self.args[:6] + (1.0, 1.0, 0.0, 0.0, 1.0)
+        profiles = {'amp': {'delta': 5.0, 'gamma': 1.0}}
+        reference = NiaARMTS(*self.args[:6], 1.0, 1.0, 1.0, 1.0, 1.0)
+        problem = NiaARMTS(*args, weight_profiles=profiles)
+        plain = NiaARMTS(*args)
+        for solution in np.random.default_rng(4).random((300, self.args[0])):
+            reference._evaluate(solution)
+            # The search still uses the mining weights
+            self.assertEqual(problem._evaluate(solution), plain._evaluate(solution))
+        self.assertGreater(len(problem.rule_archive), 0)
+        self.assertTrue(all(rule['inclusion'] == 0.0 and rule['amplitude'] == 0.0 for rule in plain.rule_archive))
+        # Inclusion and amplitude are computed for the profile, as with positive mining weights
+        expected = {reference.rule_representation(rule['full_rule']): rule for rule in reference.rule_archive}
+        self.assertTrue(any(rule['amplitude'] > 0.0 for rule in problem.rule_archive))
+        for rule in problem.rule_archive:
+            self.assertEqual(rule['inclusion'], expected[reference.rule_representation(rule['full_rule'])]['inclusion'])
+            self.assertEqual(rule['amplitude'], expected[reference.rule_representation(rule['full_rule'])]['amplitude'])
+        ranking = problem.get_profile_rankings()['amp']
+        self.assertEqual(ranking[0]['fitness'], max(reweight_fitness(problem.rule_archive, profiles)['fitness'][0]))
+
+    def test_profile_admits_rules(self):
+        # Full-range conditions on temperature and humidity: amplitude 0, support and confidence 1
+        solution = np.array([1.0, 0.0, 0.5] * 2 + [0.0, 1.0, 0.5] * 2 + [0.0, 0.5] + [0.5] * 5 + [0.0, 1.0, 0.5])
+        args = self.args[:6] + (0.0, 0.0, 0.0, 1.0, 0.0)
+        plain = NiaARMTS(*args)
+        problem = NiaARMTS(*args, weight_profiles={'support': {'alpha': 1.0, 'beta': 0.0, 'gamma': 0.0, 'delta': 0.0, 'epsilon': 0.0}})
+        self.assertEqual(plain._evaluate(solution), 0.0)
+        self.assertEqual(problem._evaluate(solution), 0.0)
+        self.assertEqual(len(plain.rule_archive), 0)
+        self.assertEqual(len(problem.rule_archive), 1)
+        self.assertEqual(problem.get_profile_rankings()['support'][0]['fitness'], problem.rule_archive[0]['support'])
+
+    def test_invalid_profiles(self):
+        with self.assertRaises(ValueError):
+            weight_matrix({'unknown': {'zeta': 1.0}})
+        with self.assertRaises(ValueError):
+            weight_matrix([[1.0, 1.0]])
+        with self.assertRaises(ValueError):
+            weight_matrix({'zero': [0.0] * 5})
+        with self.assertRaises(ValueError):
+            NiaARMTS(*self.args, pruning=True, weight_profiles=self.profiles)
+        with self.assertRaises(ValueError):
+            NiaARMTS(*self.args).get_profile_rankings()
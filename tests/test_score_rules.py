@@ -0,0 +1,69 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts import Dataset, SyntheticGenerator
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.metrics import score_rules, calculate_support, calculate_confidence, calculate_amplitude_metric, calculate_coverage_metric
+
+class TestScoreRules(unittest.TestCase):
+
+    def check(self, df, rules, use_interval=False, windows=None):
+        scores = score_rules(df, rules, windows=windows, use_interval=use_interval)
+        for k, window in enumerate(windows or [None]):
+            for i, rule in enumerate(rules):
+                start, end = window if window is not None else (rule['start'], rule['end'])
+                at = (k, i) if windows is not None else i
+                antecedent, consequent = rule['antecedent'], rule['consequent']
+                self.assertEqual(scores['support'][at], calculate_support(df, antecedent, consequent, start, end, use_interval))
+                self.assertEqual(scores['confidence'][at], calculate_confidence(df, antecedent, consequent, start, end, use_interval))
+                np.testing.assert_equal(scores['amplitude'][at], calculate_amplitude_metric(df, None, antecedent, consequent, start, end, use_interval))
+                self.assertEqual(scores['antecedent_coverage'][at], calculate_coverage_metric(df, antecedent, start, end, use_interval))
+                self.assertEqual(scores['consequent_coverage'][at], calculate_coverage_metric(df, consequent, start, end, use_interval))
+        return scores
+
+    def mine(self, file_name, interval):
+        dataset = Dataset()
+        dataset.load_data_from_csv(file_name, timestamp_col=None if interval == 'true' else 'timestamp')
+        problem = NiaARMTS(dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                           dataset.get_all_transactions(), interval, 1.0, 1.0, 1.0, 1.0, 1.0)
+        for solution in np.random.default_rng(0).random((300, problem.dimension)):
+            problem._evaluate(solution)
+        return problem
+
+    def test_archived_rules(self):
+        problem = self.mine(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), 'false')
+        rules = problem.get_rule_archive()
+        scores = self.check(problem.transactions, rules)
+        self.assertEqual(scores['support'].shape, (len(rules),))
+        np.testing.assert_array_equal(scores['support'], [rule['support'] for rule in rules])
+
+        times = problem.transactions['timestamp']
+        scores = self.check(problem.transactions, rules, windows=[(times.iloc[0], times.iloc[-1]), (times.iloc[3], times.iloc[7])])
+        self.assertEqual(scores['confidence'].shape, (2, len(rules)))
+
+    def test_intervals(self):
+        problem = self.mine("datasets/intervals.csv", 'true')
+        self.check(problem.transactions, problem.get_rule_archive(), use_interval=True)
+
+    def test_missing_values_and_unsorted_rows(self):
+        df = SyntheticGenerator(500, numerical=2, categorical=1, nan_rate=0.1, seed=2).generate()
+        df = df.sample(frac=1.0, random_state=0)
+        rng = np.random.default_rng(1)
+        rules = []
+        for _ in range(50):
+            border1, border2 = np.sort(rng.uniform(0.0, 100.0, 2))
+            start = df['timestamp'].iloc[rng.integers(0, 400)]
+            rules.append({
+                'antecedent': [{'feature': 'num_0', 'type': 'Numerical', 'border1': border1, 'border2': border2, 'category': 'EMPTY'},
+                               {'feature': 'cat_0', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'low'}],
+                'consequent': [{'feature': 'num_1', 'type': 'Numerical', 'border1': 0.0, 'border2': border2, 'category': 'EMPTY'}],
+                'start': start,
+                'end': start + pd.Timedelta(minutes=10)
+            })
+        self.check(df, rules)
+
+    def test_empty_input(self):
+        df = SyntheticGenerator(20, numerical=1, categorical=0, seed=0).generate()
+        self.assertEqual(score_rules(df, [])['support'].shape, (0,))
+        self.assertEqual(score_rules(df, [], windows=[(df['timestamp'].iloc[0], df['timestamp'].iloc[5])])['support'].shape, (1, 0))
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from niaarmts import SyntheticGenerator
+from niaarmts.metrics import calculate_support, calculate_confidence
+from niaarmts.rule_stability import calculate_stability_score
+from niaarmts.service import RuleScorer, ScoringService
+
+class TestService(unittest.TestCase):
+
+    def setUp(self):
+        self.df = SyntheticGenerator(2000, numerical=2, categorical=1, nan_rate=0.05, seed=5).generate()
+        self.scorer = RuleScorer(self.df)
+        rng = np.random.default_rng(2)
+        self.rules = []
+        for _ in range(30):
+            border1, border2 = np.round(np.sort(rng.uniform(0.0, 100.0, 2)), 3)
+            start = self.df['timestamp'].iloc[rng.integers(200, 1500)]
+            self.rules.append({
+                'antecedent': [{'feature': 'num_0', 'type': 'Numerical', 'border1': float(border1), 'border2': float(border2), 'category': 'EMPTY'}],
+                'consequent': [{'feature': 'cat_0', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': str(rng.choice(['low', 'mid', 'high']))}],
+                'start': str(start),
+                'end': str(start + pd.Timedelta(minutes=30)),
+                'delta': '10min'
+            })
+
+    def check_results(self, rules, results):
+        self.assertEqual(len(rules), len(results))
+        for rule, result in zip(rules, results):
+            start, end = pd.Timestamp(rule['start']), pd.Timestamp(rule['end'])
+            self.assertEqual(result['support'], calculate_support(self.df, rule['antecedent'], rule['consequent'], start, end))
+            self.assertEqual(result['confidence'], calculate_confidence(self.df, rule['antecedent'], rule['consequent'], start, end))
+            self.assertEqual(result['stability'], calculate_stability_score(self.df, rule['antecedent'], rule['consequent'], start, end, pd.Timedelta('10min')))
+
+    def test_scorer_matches_metrics(self):
+        self.check_results(self.rules, self.scorer.score([self.scorer.parse_rule(rule) for rule in self.rules]))
+
+    def test_invalid_rules(self):
+        with self.assertRaises(ValueError):
+            self.scorer.parse_rule({'antecedent': [], 'consequent': []})
+        rule = dict(self.rules[0], antecedent=[{'feature': 'missing', 'type': 'Numerical', 'border1': 0.0, 'border2': 1.0}])
+        with self.assertRaises(ValueError):
+            self.scorer.parse_rule(rule)
+        condition = self.rules[0]['antecedent'][0]
+        for antecedent in [[dict(condition, border1='x')], [{'feature': 'cat_0', 'type': 'Categorical'}], [1], condition]:
+            with self.assertRaises(ValueError):
+                self.scorer.parse_rule(dict(self.rules[0], antecedent=antecedent))
+
+    def test_failing_request_is_isolated(self):
+        score = RuleScorer.score
+
+        def failing_score(scorer, rules):
+            if any(rule['start'] == pd.Timestamp(self.rules[1]['start']) for rule in rules):
+                raise RuntimeError("Scoring failed.")
+            return score(scorer, rules)
+
+        async def run():
+            service = ScoringService(self.scorer, batch_delay=0.05)
+            await service.start()
+            try:
+                return await asyncio.gather(service.score([self.rules[0]]), service.score([self.rules[1]]), return_exceptions=True)
+            finally:
+                await service.stop()
+
+        with patch.object(RuleScorer, 'score', failing_score):
+            good, bad = asyncio.run(run())
+        self.check_results(self.rules[:1], good)
+        self.assertIsInstance(bad, RuntimeError)
+
+    def test_concurrent_requests_are_coalesced(self):
+        async def run():
+            service = ScoringService(self.scorer, batch_delay=0.05)
+            await service.start()
+            try:
+                results = await asyncio.gather(*(service.score([rule]) for rule in self.rules))
+            finally:
+                await service.stop()
+            return service, results
+
+        service, results = asyncio.run(run())
+        self.check_results(self.rules, [result[0] for result in results])
+        self.assertEqual(service.requests, len(self.rules))
+        self.assertLess(service.batches, len(self.rules))
+        self.assertIsNotNone(service.latency_stats()['p99_ms'])
+
+    def test_http(self):
+        async def request(port, method, path, payload=None):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            body = json.dumps(payload).encode() if payload is not None else b''
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            head, _, data = response.partition(b'\r\n\r\n')
+            return int(head.split()[1]), json.loads(data)
+
+        async def run():
+            service = ScoringService(self.scorer)
+            await service.start()
+            try:
+                scored = await request(service.port, 'POST', '/score', {'rules': self.rules})
+                invalid = await request(service.port, 'POST', '/score', {'rules': [{}]})
+                malformed = await request(service.port, 'POST', '/score', {'rules': [dict(self.rules[0], antecedent=[1])]})
+                stats = await request(service.port, 'GET', '/stats')
+                missing = await request(service.port, 'GET', '/nothing')
+            finally:
+                await service.stop()
+            return scored, invalid, malformed, stats, missing
+
+        scored, invalid, malformed, stats, missing = asyncio.run(run())
+        self.assertEqual(scored[0], 200)
+        self.check_results(self.rules, scored[1]['results'])
+        self.assertGreaterEqual(scored[1]['latency_ms'], 0.0)
+        self.assertEqual(invalid[0], 400)
+        self.assertEqual(malformed[0], 400)
+        self.assertEqual(stats[0], 200)
+        self.assertEqual(stats[1]['requests'], 1)
+        self.assertEqual(missing[0], 404)
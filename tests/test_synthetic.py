@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts import Dataset
+from niaarmts.metrics import calculate_support, calculate_confidence
+from niaarmts.synthetic import SyntheticGenerator
+
+class TestSyntheticGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.rule = {
+            'antecedent': [{'feature': 'num_0', 'type': 'Numerical', 'border1': 10.0, 'border2': 12.0, 'category': 'EMPTY'}],
+            'consequent': [{'feature': 'cat_0', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'high'}],
+            'start': 0.5,
+            'end': 0.7,
+            'coverage': 0.5
+        }
+
+    def test_layout_matches_dataset(self):
+        generator = SyntheticGenerator(1000, numerical=2, categorical=1, seed=1)
+        df = generator.generate()
+        self.assertEqual(list(df.columns), ['num_0', 'num_1', 'cat_0', 'timestamp'])
+        self.assertEqual(len(df), 1000)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'synthetic.csv')
+            generator.to_csv(path)
+            dataset = Dataset()
+            dataset.load_data_from_csv(path, timestamp_col='timestamp')
+            # 4 + 4 for numerical, 3 for categorical, 2 for timestamp, 1 for cut point
+            self.assertEqual(dataset.calculate_problem_dimension(), 14)
+
+    def test_interval_layout(self):
+        df = SyntheticGenerator(120, interval=True, rows_per_interval=10, seed=1).generate()
+        self.assertEqual(df.columns[0], 'interval')
+        self.assertEqual(df['interval'].min(), 1)
+        self.assertEqual(df['interval'].max(), 12)
+
+    def test_streaming_matches_in_memory(self):
+        generator = SyntheticGenerator(2500, nan_rate=0.1, planted_rules=[self.rule], seed=7)
+        in_memory = generator.generate(chunk_size=1000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'synthetic.csv')
+            generator.to_csv(path, chunk_size=1000)
+            streamed = pd.read_csv(path, parse_dates=['timestamp'])
+        # The CSV file does not keep the index of the chunks
+        pd.testing.assert_frame_equal(in_memory.reset_index(drop=True), streamed)
+
+    def test_nan_rate(self):
+        df = SyntheticGenerator(20000, numerical=1, categorical=0, nan_rate=0.2, seed=3).generate()
+        self.assertAlmostEqual(df['num_0'].isna().mean(), 0.2, delta=0.02)
+
+    def test_planted_rule_is_recoverable(self):
+        generator = SyntheticGenerator(5000, nan_rate=0.05, planted_rules=[self.rule], seed=11)
+        df = generator.generate()
+        planted = generator.planted_rule_windows()[0]
+
+        confidence = calculate_confidence(df, planted['antecedent'], planted['consequent'], planted['start'], planted['end'])
+        support = calculate_support(df, planted['antecedent'], planted['consequent'], planted['start'], planted['end'])
+        self.assertGreater(confidence, 0.9)
+        self.assertGreater(support, 0.4)
+
+    def test_invalid_planted_rule(self):
+        rule = dict(self.rule, antecedent=[{'feature': 'missing', 'type': 'Numerical', 'border1': 0.0, 'border2': 1.0, 'category': 'EMPTY'}])
+        with self.assertRaises(ValueError):
+            SyntheticGenerator(100, planted_rules=[rule])
@@ -49,3 +49,13 @@ def test_custom_start_end_tsm():
 
     tsm = calculate_timestamp_metric(df, start, end, use_interval=False)
     assert tsm == pytest.approx(0.998638, abs=1e-4)
+
+def test_tsm_with_statistics_snapshot():
+    dataset = Dataset()
+    dataset.load_data_from_csv("tests/test_data/ts.csv", timestamp_col="timestamp")
+    df = dataset.get_all_transactions()
+    statistics = dataset.get_statistics()
+
+    for lower, upper in [(0, 10), (5, 60), (0, len(df) - 1)]:
+        start, end = df["timestamp"].iloc[lower], df["timestamp"].iloc[upper]
+        assert calculate_timestamp_metric(df, start, end, statistics=statistics) == calculate_timestamp_metric(df, start, end)
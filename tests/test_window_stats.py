@@ -0,0 +1,84 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts import Dataset, SyntheticGenerator
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.metrics import _amplitude
+from niaarmts.rule import build_rule
+from niaarmts.window_stats import WindowStatsCache
+
+class TestWindowStatsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.df = SyntheticGenerator(1000, numerical=2, categorical=1, nan_rate=0.05, seed=3).generate()
+        self.df['count'] = np.arange(len(self.df)) % 7
+
+    def test_matches_pandas(self):
+        cache = WindowStatsCache(self.df)
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            lo, hi = sorted(rng.integers(0, len(self.df) + 1, 2))
+            window = self.df.iloc[lo:hi]
+            stats = cache.get(lo, hi)
+            self.assertEqual(stats.rows, len(window))
+            for feature in ('num_0', 'num_1', 'count'):
+                feature_min, feature_max, present = stats.min_max(feature)
+                self.assertEqual(present, window[feature].count())
+                if present > 0:
+                    self.assertEqual(feature_min, window[feature].min())
+                    self.assertEqual(feature_max, window[feature].max())
+                else:
+                    self.assertTrue(np.isnan(feature_min))
+            frequencies = window['cat_0'].value_counts(normalize=True)
+            for category in ('low', 'mid', 'high', 'unknown'):
+                self.assertEqual(stats.frequency('cat_0', category), frequencies.get(category, 0.0))
+
+    def test_window_lookup_and_eviction(self):
+        cache = WindowStatsCache(self.df, max_entries=2)
+        timestamps = self.df['timestamp']
+        first = cache.window(timestamps.iloc[10], timestamps.iloc[20])
+        self.assertEqual((first.lo, first.hi), (10, 21))
+        # Different bounds inside the same rows share the entry
+        self.assertIs(cache.window(timestamps.iloc[10] - pd.Timedelta('1s'), timestamps.iloc[20] + pd.Timedelta('1s')), first)
+        cache.get(0, 5)
+        cache.get(5, 10)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'], stats['entries']), (1, 3, 1, 2))
+        self.assertAlmostEqual(stats['hit_rate'], 0.25)
+        with self.assertRaises(ValueError):
+            WindowStatsCache(self.df, max_entries=0)
+        with self.assertRaises(ValueError):
+            WindowStatsCache(self.df.drop(columns=['timestamp']))
+
+    def test_decoding_and_amplitude(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        transactions = dataset.get_all_transactions()
+        features = dataset.get_all_features_with_metadata()
+        cache = WindowStatsCache(transactions)
+        rng = np.random.default_rng(2)
+        for _ in range(50):
+            lo, hi = sorted(rng.integers(0, len(transactions), 2))
+            start, end = transactions['timestamp'].iloc[lo], transactions['timestamp'].iloc[hi]
+            window = transactions.iloc[lo:hi + 1]
+            solution = rng.random(dataset.calculate_problem_dimension() - 3)
+            expected = build_rule(solution, features, is_time_series=True, start=start, end=end, window=window)
+            rule = build_rule(solution, features, is_time_series=True, start=start, end=end, window_stats=cache.window(start, end))
+            self.assertEqual(rule, expected)
+            self.assertEqual(_amplitude(window, rule, cache.window(start, end)), _amplitude(window, rule))
+
+    def test_problem_with_cache_gives_same_fitness(self):
+        dataset = Dataset()
+        dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+        args = (dataset.calculate_problem_dimension(), 0.0, 1.0, dataset.get_all_features_with_metadata(),
+                dataset.get_all_transactions(), 'false', 1.0, 1.0, 1.0, 1.0, 1.0)
+        reference = NiaARMTS(*args)
+        cached = NiaARMTS(*args, window_stats=True)
+        solutions = np.random.default_rng(1).random((300, args[0]))
+        # Individuals landing on the same windows
+        solutions[:, -3:-1] = np.repeat(solutions[:30, -3:-1], 10, axis=0)
+        for solution in solutions:
+            self.assertEqual(reference._evaluate(solution), cached._evaluate(solution))
+        self.assertEqual(cached.get_rule_archive(), reference.get_rule_archive())
+        self.assertGreater(cached.window_stats.stats()['hit_rate'], 0.5)
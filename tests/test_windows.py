@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.metrics import filter_window
+
+class TestWindows(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = Dataset()
+        self.dataset.load_data_from_csv("datasets/intervals.csv")
+
+    def make_problem(self, interval_range=False, **kwargs):
+        return NiaARMTS(self.dataset.calculate_problem_dimension(interval_range=interval_range), 0.0, 1.0,
+                        self.dataset.get_all_features_with_metadata(), self.dataset.get_all_transactions(), 'true',
+                        1.0, 1.0, 1.0, 1.0, 1.0, interval_range=interval_range, **kwargs)
+
+    def test_index_is_used_for_sorted_intervals(self):
+        problem = self.make_problem()
+        self.assertIsNotNone(problem.window_index)
+        transactions = self.dataset.get_all_transactions()
+        for start, end in [(1, 1), (3, 9), (0, 2), (50, 40)]:
+            self.assertTrue(problem.get_window(start, end).equals(filter_window(transactions, start, end, use_interval=True)))
+
+    def test_index_and_filter_give_same_fitness(self):
+        indexed = self.make_problem()
+        filtered = self.make_problem()
+        filtered.window_index = None
+        rng = np.random.default_rng(1)
+        for _ in range(100):
+            solution = rng.random(indexed.dimension)
+            self.assertEqual(indexed._evaluate(solution), filtered._evaluate(solution))
+
+    def test_interval_ranges(self):
+        problem = self.make_problem(interval_range=True)
+        rng = np.random.default_rng(2)
+        for _ in range(200):
+            problem._evaluate(rng.random(problem.dimension))
+        self.assertGreater(len(problem.rule_archive), 0)
+        self.assertTrue(any(entry['start'] < entry['end'] for entry in problem.rule_archive))
+        self.assertTrue(all(entry['start'] <= entry['end'] for entry in problem.rule_archive))